@@ -18,12 +18,20 @@ call .venv\Scripts\activate.bat
 pip install pyinstaller >nul 2>&1
 
 :: 클린 빌드
-echo [1/5] 이전 빌드 정리 중...
+:: CLI 시작 비용 검사 (실패하면 빌드 중단)
+echo [1/6] CLI 시작 비용 검사 중...
+python scripts\dev\check-import-budget.py
+if errorlevel 1 (
+    echo CLI 시작 비용 검사 실패 - 빌드를 중단합니다.
+    exit /b 1
+)
+
+echo [2/6] 이전 빌드 정리 중...
 if exist "dist" rmdir /s /q dist
 if exist "build" rmdir /s /q build
 if exist "releases" mkdir releases
 
-echo [2/5] EXE 빌드 중 (5-10분 소요)...
+echo [3/6] EXE 빌드 중 (5-10분 소요)...
 pyinstaller --noconfirm ^
     --name upscaler ^
     --console ^
@@ -40,11 +48,11 @@ pyinstaller --noconfirm ^
     --collect-all torchvision ^
     __main__.py
 
-echo [3/5] 릴리즈 폴더 준비 중...
+echo [4/6] 릴리즈 폴더 준비 중...
 mkdir "releases\%RELEASE_NAME%"
 xcopy /E /I /Y "dist\upscaler" "releases\%RELEASE_NAME%\"
 
-echo [4/5] 문서 추가 중...
+echo [5/6] 문서 추가 중...
 :: README 생성
 echo AI Video/Image Upscaler v%VERSION% > "releases\%RELEASE_NAME%\README.txt"
 echo ======================================== >> "releases\%RELEASE_NAME%\README.txt"
@@ -60,7 +68,7 @@ echo 모델: 첫 실행 시 자동으로 다운로드됩니다. >> "releases\%RE
 echo @echo off > "releases\%RELEASE_NAME%\upscale-image.bat"
 echo upscaler.exe image %%1 "%%~n1_4x%%~x1" --scale 4 >> "releases\%RELEASE_NAME%\upscale-image.bat"
 
-echo [5/5] ZIP 압축 중...
+echo [6/6] ZIP 압축 중...
 powershell -Command "Compress-Archive -Path 'releases\%RELEASE_NAME%' -DestinationPath 'releases\%RELEASE_NAME%.zip' -Force"
 
 :: 파일 크기 확인
@@ -0,0 +1,114 @@
+#!/usr/bin/env python3
+"""
+Guard the CLI start-up cost: metadata commands must not import heavy
+dependencies and must finish within a time budget.
+
+Each command runs in a fresh interpreter, with HOME pointed at an empty
+temporary folder so commands that read the model cache see a clean one.
+Exits with status 1 on any violation or failing command, so it can gate
+CI; scripts/dev/build-release.bat runs it before building, and the test
+suite runs it with a looser time budget.
+
+Usage:
+    python scripts/dev/check-import-budget.py [--budget 1.0]
+"""
+
+import argparse
+import json
+import os
+import subprocess
+import sys
+import tempfile
+from pathlib import Path
+
+REPO_ROOT = Path(__file__).resolve().parents[2]
+
+# Modules that only the selected backend may import
+HEAVY_MODULES = ('torch', 'torchvision', 'basicsr', 'realesrgan', 'gfpgan', 'facexlib',
+                 'onnxruntime', 'onnx', 'cv2', 'gdown', 'tqdm')
+
+# CLI invocations that must stay cheap
+COMMANDS = (
+    ['--help'],
+    ['image', '--help'],
+    ['video', '--help'],
+    ['all', '--help'],
+    ['serve', '--help'],
+    ['jobs', 'submit', '--help'],
+    ['models', '--help'],
+    ['models', '--list'],
+    ['benchmark', '--help'],
+    ['doctor', '--help'],
+)
+
+_PROBE = '''
+import json, sys, time
+start = time.perf_counter()
+from upscaler.cli import cli
+code = 0
+try:
+    cli.main(args=sys.argv[1:], prog_name='upscale', standalone_mode=False)
+except SystemExit as e:
+    code = e.code
+elapsed = time.perf_counter() - start
+heavy = sorted({name.split('.')[0] for name in sys.modules} & set(json.loads(HEAVY)))
+print(json.dumps({'seconds': elapsed, 'heavy': heavy, 'exit': code}), file=sys.stderr)
+'''
+
+
+def measure(args, heavy_modules, home):
+    """Run one CLI invocation in a new interpreter and return its report."""
+    probe = _PROBE.replace('HEAVY', repr(json.dumps(list(heavy_modules))))
+    # Keep the user's model cache out of reach: listing models verifies
+    # (and removes) corrupt files
+    env = dict(os.environ, HOME=home, USERPROFILE=home)
+    env.pop('UPSCALER_MODEL_PATH', None)
+    result = subprocess.run(
+        [sys.executable, '-c', probe, *args],
+        cwd=REPO_ROOT, env=env, capture_output=True, text=True
+    )
+    report_line = result.stderr.strip().splitlines()[-1] if result.stderr.strip() else ''
+    try:
+        return json.loads(report_line)
+    except json.JSONDecodeError:
+        raise RuntimeError(f"'{' '.join(args)}' failed:\n{result.stderr}")
+
+
+def main() -> int:
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument('--budget', type=float, default=1.0,
+                        help='maximum seconds per command (importing the CLI plus running it)')
+    options = parser.parse_args()
+
+    failures = 0
+    with tempfile.TemporaryDirectory(prefix='upscaler-budget-') as home:
+        for args in COMMANDS:
+            failures += not check(args, options.budget, home)
+
+    return 1 if failures else 0
+
+
+def check(args, budget, home) -> bool:
+    """Measure one command and print its result line; True if it passed."""
+    try:
+        report = measure(args, HEAVY_MODULES, home)
+    except RuntimeError as e:
+        print(f"FAIL  {'-':>6}  upscale {' '.join(args)}  - {e}")
+        return False
+
+    problems = []
+    if report['exit'] not in (0, None):
+        problems.append(f"exit status {report['exit']}")
+    if report['heavy']:
+        problems.append(f"imports {', '.join(report['heavy'])}")
+    if report['seconds'] > budget:
+        problems.append(f"over budget ({budget:.2f}s)")
+
+    status = 'FAIL' if problems else 'ok'
+    print(f"{status:4}  {report['seconds']:.3f}s  upscale {' '.join(args)}"
+          + (f"  - {'; '.join(problems)}" if problems else ''))
+    return not problems
+
+
+if __name__ == '__main__':
+    sys.exit(main())
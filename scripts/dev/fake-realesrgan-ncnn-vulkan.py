@@ -0,0 +1,68 @@
+#!/usr/bin/env python3
+"""
+Stand-in for realesrgan-ncnn-vulkan with the same command line, for testing
+the NCNN backend without a Vulkan GPU. Images are resized with bicubic
+interpolation instead of being upscaled by a model.
+
+Usage:
+    UPSCALER_NCNN_BINARY=scripts/dev/fake-realesrgan-ncnn-vulkan.py upscale video in.mp4 out.mp4 --backend ncnn
+"""
+
+import argparse
+import sys
+from pathlib import Path
+
+import cv2
+
+# Extensions the real binary reads (webp through libwebp, the rest through stb_image)
+INPUT_EXTENSIONS = {'.png', '.jpg', '.jpeg', '.webp', '.bmp', '.tga', '.pgm', '.ppm'}
+
+
+def upscale_file(input_path: Path, output_path: Path, scale: int) -> None:
+    image = cv2.imread(str(input_path), cv2.IMREAD_COLOR)
+    if image is None:
+        raise RuntimeError(f"decode image {input_path} failed")
+    h, w = image.shape[:2]
+    output = cv2.resize(image, (w * scale, h * scale), interpolation=cv2.INTER_CUBIC)
+    if not cv2.imwrite(str(output_path), output):
+        raise RuntimeError(f"encode image {output_path} failed")
+
+
+def main() -> int:
+    parser = argparse.ArgumentParser(add_help=False)
+    parser.add_argument('-i', dest='input', required=True)
+    parser.add_argument('-o', dest='output', required=True)
+    parser.add_argument('-s', dest='scale', type=int, default=4)
+    parser.add_argument('-t', dest='tile', default='0')
+    parser.add_argument('-m', dest='model_path', default='models')
+    parser.add_argument('-n', dest='model_name', default='realesr-animevideov3')
+    parser.add_argument('-g', dest='gpu_id', default='auto')
+    parser.add_argument('-j', dest='threads', default='1:2:2')
+    parser.add_argument('-f', dest='format', default='png')
+    parser.add_argument('-x', dest='tta', action='store_true')
+    parser.add_argument('-v', dest='verbose', action='store_true')
+    args = parser.parse_args()
+
+    input_path, output_path = Path(args.input), Path(args.output)
+
+    try:
+        if input_path.is_dir():
+            # Folder mode: every image in the folder, named <stem>.<format> in the output folder
+            output_path.mkdir(parents=True, exist_ok=True)
+            files = sorted(p for p in input_path.iterdir() if p.suffix.lower() in INPUT_EXTENSIONS)
+            for index, path in enumerate(files):
+                upscale_file(path, output_path / f'{path.stem}.{args.format}', args.scale)
+                if args.verbose:
+                    print(f'{path} -> {output_path / path.stem}.{args.format} done', file=sys.stderr)
+                print(f'{100.0 * (index + 1) / len(files):.2f}%', file=sys.stderr)
+        else:
+            upscale_file(input_path, output_path, args.scale)
+    except RuntimeError as e:
+        print(e, file=sys.stderr)
+        return 1
+
+    return 0
+
+
+if __name__ == '__main__':
+    sys.exit(main())
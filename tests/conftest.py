@@ -0,0 +1,56 @@
+"""Shared fixtures: a backend whose model is nearest-neighbour upscaling.
+
+Nearest-neighbour output depends on each input pixel alone, so tiled,
+batched and whole-image results must match exactly.
+"""
+
+from typing import Dict, List
+
+import numpy as np
+import pytest
+
+from upscaler.backends.base import BaseBackend
+
+
+class NearestBackend(BaseBackend):
+    """Backend that upscales by repeating pixels, counting its batches."""
+
+    def __init__(self, **kwargs):
+        kwargs.setdefault('model', 'nearest')
+        kwargs.setdefault('scale', 2)
+        super().__init__(**kwargs)
+        self.batches = []
+        self.released = 0
+
+    @classmethod
+    def is_available(cls) -> bool:
+        return True
+
+    def initialize(self) -> None:
+        pass
+
+    def cleanup(self) -> None:
+        pass
+
+    def get_memory_info(self) -> Dict[str, int]:
+        return {'available_mb': 4000}
+
+    def _heuristic_tile_size(self) -> int:
+        return 0
+
+    def _release_memory(self) -> None:
+        self.released += 1
+
+    def _run_batch(self, images: List[np.ndarray]) -> List[np.ndarray]:
+        self.batches.append(len(images))
+        return [image.repeat(self.scale, axis=0).repeat(self.scale, axis=1) for image in images]
+
+
+@pytest.fixture
+def nearest():
+    return NearestBackend
+
+
+@pytest.fixture
+def image():
+    return np.random.default_rng(0).integers(0, 256, (123, 201, 3), dtype=np.uint8)
@@ -0,0 +1,71 @@
+import numpy as np
+import pytest
+
+
+def _frames(count, shape=(40, 56, 3), seed=0):
+    rng = np.random.default_rng(seed)
+    return [rng.integers(0, 256, shape, dtype=np.uint8) for _ in range(count)]
+
+
+@pytest.mark.parametrize('batch_size', [1, 3, 8])
+@pytest.mark.parametrize('tile', [0, 32])
+def test_batch_matches_single_frames(nearest, batch_size, tile):
+    frames = _frames(5)
+    with nearest(batch_size=batch_size, tile=tile) as backend:
+        batched = backend.upscale_batch(frames)
+        single = [backend.upscale(frame) for frame in frames]
+
+    assert len(batched) == len(frames)
+    for a, b in zip(batched, single):
+        np.testing.assert_array_equal(a, b)
+
+
+def test_batch_runs_frames_together(nearest):
+    with nearest(batch_size=4) as backend:
+        backend.upscale_batch(_frames(6))
+    assert backend.batches == [4, 2]
+
+
+def test_batch_keeps_order_with_mixed_shapes(nearest):
+    frames = _frames(2) + _frames(1, shape=(24, 24, 3), seed=1) + _frames(2, seed=2)
+    with nearest(batch_size=4) as backend:
+        outputs = backend.upscale_batch(frames)
+
+    for frame, output in zip(frames, outputs):
+        np.testing.assert_array_equal(output, frame.repeat(2, axis=0).repeat(2, axis=1))
+
+
+def test_empty_batch(nearest):
+    with nearest(batch_size=4) as backend:
+        assert backend.upscale_batch([]) == []
+
+
+def test_batch_out_of_memory_falls_back_to_single_frames(nearest):
+    backend = nearest(batch_size=4)
+    run_batch = backend._run_batch
+
+    def limited(images):
+        if len(images) > 1:
+            raise MemoryError("out of memory")
+        return run_batch(images)
+
+    backend._run_batch = limited
+    frames = _frames(4)
+    with backend:
+        outputs = backend.upscale_batch(frames)
+
+    for frame, output in zip(frames, outputs):
+        np.testing.assert_array_equal(output, frame.repeat(2, axis=0).repeat(2, axis=1))
+    assert backend.fallbacks == ["batch of 4 -> single tiles (out of memory)"]
+    assert backend.released == 1
+
+
+def test_other_errors_are_raised(nearest):
+    backend = nearest(batch_size=4)
+
+    def broken(images):
+        raise ValueError("bad input")
+
+    backend._run_batch = broken
+    with backend, pytest.raises(ValueError):
+        backend.upscale_batch(_frames(2))
@@ -0,0 +1,149 @@
+import hashlib
+import json
+import os
+import threading
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+
+import pytest
+
+from upscaler.models import download
+from upscaler.models.download import _plan_ranges, _RangeDownload, download_file, state_path
+
+
+DATA = os.urandom(300_000)
+SHA256 = hashlib.sha256(DATA).hexdigest()
+
+
+@pytest.fixture(autouse=True)
+def small_ranges(monkeypatch):
+    monkeypatch.setattr(download, '_MIN_RANGE_SIZE', 50_000)
+
+
+@pytest.fixture
+def server():
+    """HTTP server for DATA; supports_ranges=False answers every request with the whole file."""
+    class Handler(BaseHTTPRequestHandler):
+        supports_ranges = True
+        served = 0
+
+        def do_GET(self):
+            start, end = 0, len(DATA) - 1
+            header = self.headers.get('Range')
+            probe = header == 'bytes=0-0'
+            if header and (Handler.supports_ranges or probe):
+                start, end = (int(x) for x in header[len('bytes='):].split('-'))
+                self.send_response(206)
+                self.send_header('Content-Range', f'bytes {start}-{end}/{len(DATA)}')
+            else:
+                self.send_response(200)
+            body = DATA[start:end + 1]
+            self.send_header('Content-Length', str(len(body)))
+            self.end_headers()
+            self.wfile.write(body)
+            if not probe:
+                Handler.served += len(body)
+
+        def log_message(self, *args):
+            pass
+
+    httpd = ThreadingHTTPServer(('127.0.0.1', 0), Handler)
+    threading.Thread(target=httpd.serve_forever, daemon=True).start()
+    httpd.handler = Handler
+    httpd.url = f'http://127.0.0.1:{httpd.server_address[1]}/model.pth'
+    yield httpd
+    httpd.shutdown()
+    httpd.server_close()
+
+
+class _NoProgress:
+    def update(self, n):
+        pass
+
+
+def _covers(ranges, size):
+    assert ranges[0]['start'] == 0
+    assert ranges[-1]['end'] == size
+    assert all(a['end'] == b['start'] for a, b in zip(ranges, ranges[1:]))
+
+
+def test_plan_ranges_splits_for_connections(tmp_path):
+    ranges = _plan_ranges(tmp_path / 'f.part', 300_000, 4)
+
+    assert len(ranges) == 4
+    _covers(ranges, 300_000)
+    assert all(r['done'] == 0 for r in ranges)
+
+
+def test_plan_ranges_keeps_at_least_min_range_size(tmp_path):
+    assert len(_plan_ranges(tmp_path / 'f.part', 120_000, 8)) == 2
+    assert len(_plan_ranges(tmp_path / 'f.part', 10_000, 8)) == 1
+
+
+def test_plan_ranges_keeps_prefix_of_partial_file(tmp_path):
+    dest = tmp_path / 'f.part'
+    dest.write_bytes(DATA[:100_000])
+    ranges = _plan_ranges(dest, len(DATA), 2)
+
+    assert ranges[0] == {'start': 0, 'end': 100_000, 'done': 100_000}
+    _covers(ranges, len(DATA))
+
+
+def test_plan_ranges_restarts_oversized_partial_file(tmp_path):
+    dest = tmp_path / 'f.part'
+    dest.write_bytes(DATA + b'extra')
+
+    assert all(r['done'] == 0 for r in _plan_ranges(dest, len(DATA), 2))
+
+
+def test_catch_up_hashes_out_of_order_writes_in_file_order(tmp_path):
+    dest = tmp_path / 'f.part'
+    dest.write_bytes(bytes(len(DATA)))
+    ranges = _plan_ranges(dest, len(DATA), 3)
+    job = _RangeDownload('unused', 'unused', dest, len(DATA), ranges, progress=False)
+    job._pbar = _NoProgress()
+
+    # Later ranges finish first; the hash may only advance once the gap is filled
+    chunks = [(r, offset) for r in reversed(ranges) for offset in range(r['start'], r['end'], 30_000)]
+    with open(dest, 'r+b') as f, open(dest, 'rb', buffering=0) as job._reader:
+        for r, offset in chunks:
+            chunk = DATA[offset:min(offset + 30_000, r['end'])]
+            f.seek(offset)
+            f.write(chunk)
+            f.flush()
+            job._advance(r, memoryview(chunk))
+            if r is not ranges[0]:
+                assert job._hashed == 0
+
+    assert job._hashed == len(DATA)
+    assert job._sha256.hexdigest() == SHA256
+
+
+def test_download_in_parallel_ranges(tmp_path, server):
+    dest = tmp_path / 'model.pth.part'
+
+    assert download_file(server.url, dest, connections=4, progress=False) == SHA256
+    assert dest.read_bytes() == DATA
+    assert not state_path(dest).exists()
+
+
+def test_download_resumes_saved_ranges(tmp_path, server):
+    dest = tmp_path / 'model.pth.part'
+    ranges = _plan_ranges(dest, len(DATA), 2)
+    # The first range stopped half way; the second never started
+    half = ranges[0]['end'] // 2
+    ranges[0]['done'] = half
+    dest.write_bytes(DATA[:half] + bytes(len(DATA) - half))
+    state_path(dest).write_text(json.dumps({'url': server.url, 'size': len(DATA), 'ranges': ranges}))
+
+    assert download_file(server.url, dest, connections=2, progress=False) == SHA256
+    assert dest.read_bytes() == DATA
+    assert server.handler.served == len(DATA) - half
+
+
+def test_download_falls_back_when_ranges_are_ignored(tmp_path, server):
+    server.handler.supports_ranges = False
+    dest = tmp_path / 'model.pth.part'
+
+    assert download_file(server.url, dest, connections=4, progress=False) == SHA256
+    assert dest.read_bytes() == DATA
+    assert not state_path(dest).exists()
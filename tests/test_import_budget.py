@@ -0,0 +1,12 @@
+import subprocess
+import sys
+from pathlib import Path
+
+SCRIPT = Path(__file__).resolve().parents[1] / 'scripts' / 'dev' / 'check-import-budget.py'
+
+
+def test_metadata_commands_stay_light():
+    # Generous budget: this guards heavy imports, timing is checked by the script's default
+    result = subprocess.run([sys.executable, str(SCRIPT), '--budget', '5'],
+                            capture_output=True, text=True)
+    assert result.returncode == 0, result.stdout + result.stderr
@@ -0,0 +1,121 @@
+import socket
+import subprocess
+import sys
+
+import pytest
+
+from upscaler.jobqueue import JobQueue, file_sha256, partial_path
+
+
+@pytest.fixture
+def queue(tmp_path):
+    with JobQueue(tmp_path / 'jobs.db') as queue:
+        yield queue
+
+
+def _dead_pid() -> int:
+    process = subprocess.Popen([sys.executable, '-c', 'pass'])
+    process.wait()
+    return process.pid
+
+
+def _submit(queue, tmp_path, count):
+    for i in range(count):
+        queue.submit('image', str(tmp_path / f'in{i}.png'), str(tmp_path / 'out' / f'out{i}.png'), {'scale': 4})
+
+
+def test_submit_ignores_duplicate_outputs(queue, tmp_path):
+    assert queue.submit('image', str(tmp_path / 'a.png'), str(tmp_path / 'out.png'), {})
+    assert not queue.submit('image', str(tmp_path / 'b.png'), str(tmp_path / 'out.png'), {})
+    assert queue.counts()['pending'] == 1
+
+
+def test_claim_takes_oldest_pending_job(queue, tmp_path):
+    _submit(queue, tmp_path, 3)
+
+    job = queue.claim()
+    assert job['input'].endswith('in0.png')
+    assert job['status'] == 'running'
+    assert job['worker'] == queue.worker
+    assert job['attempts'] == 1
+    assert job['options'] == {'scale': 4}
+    assert queue.claim()['input'].endswith('in1.png')
+
+
+def test_claim_returns_none_when_empty(queue):
+    assert queue.claim() is None
+
+
+def test_runners_never_claim_the_same_job(tmp_path):
+    with JobQueue(tmp_path / 'jobs.db') as first, JobQueue(tmp_path / 'jobs.db') as second:
+        _submit(first, tmp_path, 4)
+        claimed = [runner.claim()['id'] for runner in (first, second, first, second)]
+        assert sorted(claimed) == [1, 2, 3, 4]
+        assert first.claim() is None and second.claim() is None
+
+
+def test_release_does_not_count_an_attempt(queue, tmp_path):
+    _submit(queue, tmp_path, 1)
+    job = queue.claim()
+    queue.release(job['id'])
+
+    assert queue.get(job['id'])['status'] == 'pending'
+    assert queue.claim()['attempts'] == 1
+
+
+def test_recover_requeues_jobs_of_dead_processes(queue, tmp_path):
+    _submit(queue, tmp_path, 3)
+    dead, live, remote = (queue.claim() for _ in range(3))
+    host = socket.gethostname()
+    queue._conn.execute("UPDATE jobs SET worker = ? WHERE id = ?", (f"{host}:{_dead_pid()}", dead['id']))
+    queue._conn.execute("UPDATE jobs SET worker = ? WHERE id = ?", (f"other-{host}:1", remote['id']))
+
+    assert queue.recover() == 1
+    assert queue.get(dead['id'])['status'] == 'pending'
+    assert queue.get(dead['id'])['worker'] is None
+    # Still running here, or on a host whose processes cannot be checked
+    assert queue.get(live['id'])['status'] == 'running'
+    assert queue.get(remote['id'])['status'] == 'running'
+
+
+def test_recover_removes_partial_outputs_of_dead_processes(queue, tmp_path):
+    _submit(queue, tmp_path, 1)
+    job = queue.claim()
+    pid = _dead_pid()
+    queue._conn.execute("UPDATE jobs SET worker = ? WHERE id = ?", (f"{socket.gethostname()}:{pid}", job['id']))
+
+    output = tmp_path / 'out' / 'out0.png'
+    output.parent.mkdir()
+    stale = partial_path(output, pid)
+    ours = partial_path(output)
+    stale.write_bytes(b'partial')
+    ours.write_bytes(b'partial')
+
+    queue.recover()
+    assert not stale.exists()
+    assert ours.exists()
+
+
+def test_retry_requeues_failed_jobs(queue, tmp_path):
+    _submit(queue, tmp_path, 2)
+    failed = queue.claim()
+    queue.fail(failed['id'], 'boom')
+
+    assert queue.retry() == 1
+    job = queue.get(failed['id'])
+    assert job['status'] == 'pending'
+    assert job['error'] is None
+
+
+def test_verify_requeues_changed_outputs(queue, tmp_path):
+    _submit(queue, tmp_path, 1)
+    job = queue.claim()
+    output = tmp_path / 'out' / 'out0.png'
+    output.parent.mkdir()
+    output.write_bytes(b'result')
+    queue.complete(job['id'], output.stat().st_size, file_sha256(output))
+    assert queue.verify() == []
+
+    output.write_bytes(b'other!')
+    assert [broken['id'] for broken in queue.verify()] == [job['id']]
+    assert queue.get(job['id'])['status'] == 'pending'
@@ -0,0 +1,97 @@
+import os
+import time
+
+import pytest
+
+from upscaler.leases import LeaseDir
+
+
+@pytest.fixture
+def make_worker(tmp_path):
+    def make(name, **kwargs):
+        return LeaseDir(tmp_path / 'shared', worker_id=name, ttl=10.0, **kwargs)
+    return make
+
+
+def _age_lease(worker, name, seconds):
+    path = worker._lease_path(worker.key(name))
+    past = time.time() - seconds
+    os.utime(path, (past, past))
+
+
+def test_claim_is_exclusive(make_worker):
+    first, second = make_worker('a'), make_worker('b')
+
+    assert first.claim('clip.mp4')
+    assert not second.claim('clip.mp4')
+    assert second.state('clip.mp4') == 'leased'
+
+
+def test_completed_files_are_not_claimed_again(make_worker):
+    first, second = make_worker('a'), make_worker('b')
+    first.claim('clip.mp4')
+    first.complete('clip.mp4', frames=10, seconds=1.0)
+
+    assert first.state('clip.mp4') == 'done'
+    assert not second.claim('clip.mp4')
+    assert first.stats['files'] == 1 and first.stats['frames'] == 10
+
+
+def test_failed_files_are_not_claimed_again(make_worker):
+    first, second = make_worker('a'), make_worker('b')
+    first.claim('clip.mp4')
+    first.fail('clip.mp4', 'boom')
+
+    assert not second.claim('clip.mp4')
+
+
+def test_fresh_lease_is_not_reclaimed(make_worker):
+    first, second = make_worker('a'), make_worker('b')
+    first.claim('clip.mp4')
+    _age_lease(first, 'clip.mp4', 5)
+
+    assert not second.claim('clip.mp4')
+
+
+def test_stale_lease_is_reclaimed(make_worker):
+    reclaimed = []
+    first = make_worker('a')
+    second = make_worker('b', on_reclaim=lambda name, lease: reclaimed.append((name, lease['worker'])))
+    first.claim('clip.mp4')
+    _age_lease(first, 'clip.mp4', 60)
+
+    assert second.claim('clip.mp4')
+    assert reclaimed == [('clip.mp4', 'a')]
+    assert second.stats['reclaimed'] == 1
+    assert second._owns(second.key('clip.mp4'))
+    # The dead worker giving its lease back later must not drop the new owner's lease
+    first.release('clip.mp4')
+    assert second.state('clip.mp4') == 'leased'
+
+
+def test_reclaim_waits_for_another_reclaimer(make_worker):
+    first, second = make_worker('a'), make_worker('b')
+    first.claim('clip.mp4')
+    _age_lease(first, 'clip.mp4', 60)
+    guard = first._lease_path(first.key('clip.mp4')).with_suffix('.reclaim')
+    guard.touch()
+
+    assert not second.claim('clip.mp4')
+
+
+def test_claim_each_skips_files_finished_elsewhere(make_worker):
+    first, second = make_worker('a'), make_worker('b')
+    first.claim('done.mp4')
+    first.complete('done.mp4', frames=1, seconds=0.1)
+    skipped = []
+
+    claimed = list(second.claim_each(['done.mp4', 'new.mp4'], str, on_skip=skipped.append))
+    assert claimed == ['new.mp4']
+    assert skipped == ['done.mp4']
+
+
+def test_stop_releases_held_leases(make_worker):
+    worker = make_worker('a')
+    with worker:
+        worker.claim('clip.mp4')
+    assert worker.state('clip.mp4') == 'free'
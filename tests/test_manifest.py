@@ -0,0 +1,99 @@
+import hashlib
+import json
+import os
+
+import pytest
+
+from upscaler.models.manager import MANIFEST_NAME, ModelManager
+
+
+@pytest.fixture
+def manager(tmp_path):
+    return ModelManager(tmp_path)
+
+
+def _write(path, data):
+    path.write_bytes(data)
+    return hashlib.sha256(data).hexdigest()
+
+
+def test_checksum_is_remembered(manager, tmp_path, monkeypatch):
+    path = tmp_path / 'model.pth'
+    expected = _write(path, b'weights')
+    assert manager.verified_sha256(path) == expected
+
+    hashed = []
+    monkeypatch.setattr(ModelManager, '_calculate_sha256', lambda self, p: hashed.append(p))
+    assert ModelManager(tmp_path).verified_sha256(path) == expected
+    assert hashed == []
+
+
+def test_changed_file_is_hashed_again(manager, tmp_path):
+    path = tmp_path / 'model.pth'
+    _write(path, b'weights')
+    manager.verified_sha256(path)
+
+    expected = _write(path, b'other weights')
+    assert manager.verified_sha256(path) == expected
+
+
+def test_same_size_rewrite_is_detected(manager, tmp_path):
+    path = tmp_path / 'model.pth'
+    _write(path, b'aaaa')
+    manager.verified_sha256(path)
+    stat = path.stat()
+
+    expected = _write(path, b'bbbb')
+    os.utime(path, ns=(stat.st_atime_ns, stat.st_mtime_ns + 1_000_000))
+    assert manager.verified_sha256(path) == expected
+
+
+def test_replaced_file_is_hashed_again(manager, tmp_path):
+    path = tmp_path / 'model.pth'
+    _write(path, b'aaaa')
+    manager.verified_sha256(path)
+    stat = path.stat()
+
+    # Same size and mtime, but a new inode
+    replacement = tmp_path / 'new.pth'
+    expected = _write(replacement, b'bbbb')
+    os.utime(replacement, ns=(stat.st_atime_ns, stat.st_mtime_ns))
+    os.replace(replacement, path)
+    assert manager.verified_sha256(path) == expected
+
+
+def test_managers_keep_each_others_entries(tmp_path):
+    first, second = ModelManager(tmp_path), ModelManager(tmp_path)
+    a, b = tmp_path / 'a.pth', tmp_path / 'b.pth'
+    _write(a, b'a')
+    _write(b, b'b')
+
+    # Both load the manifest before either records anything
+    first._load_manifest()
+    second._load_manifest()
+    first.verified_sha256(a)
+    second.verified_sha256(b)
+
+    manifest = json.loads((tmp_path / MANIFEST_NAME).read_text())
+    assert set(manifest) == {str(a.absolute()), str(b.absolute())}
+
+
+def test_entries_of_deleted_files_are_dropped(manager, tmp_path):
+    a, b = tmp_path / 'a.pth', tmp_path / 'b.pth'
+    _write(a, b'a')
+    _write(b, b'b')
+    manager.verified_sha256(a)
+    a.unlink()
+    manager.verified_sha256(b)
+
+    manifest = json.loads((tmp_path / MANIFEST_NAME).read_text())
+    assert set(manifest) == {str(b.absolute())}
+
+
+def test_corrupt_manifest_is_rebuilt(tmp_path):
+    (tmp_path / MANIFEST_NAME).write_text('{not json')
+    path = tmp_path / 'model.pth'
+    expected = _write(path, b'weights')
+
+    assert ModelManager(tmp_path).verified_sha256(path) == expected
+    assert json.loads((tmp_path / MANIFEST_NAME).read_text())[str(path.absolute())]['sha256'] == expected
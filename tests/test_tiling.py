@@ -0,0 +1,66 @@
+import numpy as np
+import pytest
+
+from upscaler.backends.base import BaseBackend
+
+
+@pytest.mark.parametrize('length, tile_size, overlap', [
+    (500, 256, 16), (512, 256, 16), (496, 256, 16), (257, 256, 0),
+    (1000, 128, 10), (1920, 400, 32), (123, 64, 31),
+])
+def test_tile_starts_cover_evenly(length, tile_size, overlap):
+    starts = BaseBackend._tile_starts(length, tile_size, overlap)
+
+    assert starts[0] == 0
+    assert starts[-1] == length - tile_size
+    steps = np.diff(starts)
+    # At least the requested overlap between neighbours, and evenly spread
+    assert steps.max() <= tile_size - overlap
+    assert steps.max() - steps.min() <= 1
+    # No fewer tiles would give that overlap
+    fewer = len(starts) - 1
+    assert fewer == 1 or (length - tile_size) / (fewer - 1) > tile_size - overlap
+
+
+def test_tile_starts_do_not_squeeze_the_last_tile():
+    assert BaseBackend._tile_starts(500, 256, 16) == [0, 122, 244]
+
+
+def test_tile_starts_single_tile():
+    assert BaseBackend._tile_starts(200, 256, 16) == [0]
+    assert BaseBackend._tile_starts(256, 256, 16) == [0]
+
+
+@pytest.mark.parametrize('tile_size', [32, 64, 100])
+@pytest.mark.parametrize('overlap', [0, 8, 31])
+@pytest.mark.parametrize('blend', ['cosine', 'linear'])
+@pytest.mark.parametrize('batch_size', [1, 4])
+def test_tiled_output_matches_whole_image(nearest, image, tile_size, overlap, blend, batch_size):
+    backend = nearest(blend=blend, batch_size=batch_size)
+    whole = backend._tile_image(image, 0, 0)
+    tiled = backend._tile_image(image, tile_size, overlap)
+
+    assert tiled.dtype == np.uint8
+    np.testing.assert_array_equal(tiled, whole)
+
+
+def test_upscale_tiles_larger_images(nearest, image):
+    backend = nearest(tile=64, batch_size=4)
+    with backend:
+        output = backend.upscale(image)
+
+    np.testing.assert_array_equal(output, image.repeat(2, axis=0).repeat(2, axis=1))
+    rows = len(backend._tile_starts(image.shape[0], 64, backend.tile_overlap))
+    columns = len(backend._tile_starts(image.shape[1], 64, backend.tile_overlap))
+    # Every tile upscaled once, same-shaped tiles batched in chunks of 4
+    assert sum(backend.batches) == rows * columns
+    assert max(backend.batches) == 4
+
+
+def test_blend_weights_feather_only_shared_edges(nearest):
+    backend = nearest()
+    weights = backend._blend_weights((16, 16), 4, (False, True, False, False))[:, :, 0]
+
+    assert np.all(weights[:12] == 1)
+    assert np.all(np.diff(weights[12:, 0]) < 0)
+    assert weights.min() > 0
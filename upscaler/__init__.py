@@ -11,4 +11,16 @@ logging.getLogger('basicsr').setLevel(logging.WARNING)
 logging.getLogger('realesrgan').setLevel(logging.WARNING)
 
 __version__ = "0.1.0"
-__author__ = "AI Assistant"
\ No newline at end of file
+__author__ = "AI Assistant"
+
+
+def __getattr__(name):
+    # The library API pulls in numpy, OpenCV and the backends, which the CLI
+    # only imports when a command needs them
+    if name == 'Upscaler':
+        from .api import Upscaler
+        return Upscaler
+    raise AttributeError(f"module {__name__!r} has no attribute {name!r}")
+
+
+__all__ = ['Upscaler']
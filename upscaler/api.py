@@ -0,0 +1,197 @@
+"""
+Library API: an upscaling session without console output.
+
+    from upscaler import Upscaler
+
+    with Upscaler(model='realesr-general-x4v3', scale=4) as upscaler:
+        output = upscaler.upscale(image)              # RGB array in, RGB array out
+        upscaler.upscale_file('in.png', 'out.png')
+        upscaler.upscale_file('in.mp4', 'out.mp4', progress=on_progress)
+        for frame in upscaler.video_frames('in.mp4'):
+            ...                                       # upscaled RGB frames, in order
+
+The backend is loaded once, by open() or on first use, and stays loaded
+until close(). Keyword options are the CLI options (tile, fp16, fuse,
+cpu_profile, preserve_tone, ...). Progress is reported through
+progress(done, total) callbacks; total is 0 when unknown.
+"""
+
+import logging
+import subprocess
+import tempfile
+from pathlib import Path
+from typing import Any, Callable, Iterable, Iterator, Optional
+
+import numpy as np
+
+from .backends.session import BackendSession
+
+
+logger = logging.getLogger(__name__)
+
+ProgressCallback = Callable[[int, int], None]
+
+VIDEO_EXTENSIONS = {'.mp4', '.avi', '.mov', '.mkv', '.webm', '.flv', '.wmv'}
+
+
+class Upscaler:
+    """Upscaling session that keeps one backend loaded between calls.
+
+    Not thread-safe; use one session per thread.
+    """
+
+    def __init__(self, model: str = 'realesr-general-x4v3', scale: int = 4,
+                 backend: str = 'auto', **options: Any):
+        self.options = dict(options, backend=backend, model=model, scale=scale, progress='none')
+        self._session = None
+        self._backend = None
+
+    @property
+    def is_open(self) -> bool:
+        return self._session is not None
+
+    @property
+    def backend(self):
+        """The loaded backend, or None before open()."""
+        return self._backend
+
+    def open(self) -> 'Upscaler':
+        """Load the backend now (otherwise the first call loads it)."""
+        if self._session is None:
+            session = BackendSession()
+            self._backend = session.acquire(**self.options)
+            self._session = session
+        return self
+
+    def close(self) -> None:
+        """Free the backend; a later call loads it again."""
+        if self._session is not None:
+            self._session.close()
+            self._session = None
+            self._backend = None
+
+    def __enter__(self) -> 'Upscaler':
+        return self.open()
+
+    def __exit__(self, exc_type, exc_val, exc_tb):
+        self.close()
+
+    def upscale(self, image: np.ndarray) -> np.ndarray:
+        """Upscale an RGB uint8 image of shape (H, W, 3) and return the RGB result."""
+        if image.ndim != 3 or image.shape[2] != 3 or image.dtype != np.uint8:
+            raise ValueError(f"Expected an RGB uint8 image (H, W, 3), got {image.dtype} {image.shape}")
+        return self._image_processor().enhance(np.ascontiguousarray(image))
+
+    def upscale_file(self, input_path: str, output_path: str,
+                     progress: Optional[ProgressCallback] = None) -> None:
+        """Upscale an image or video file (chosen by extension) into output_path."""
+        if not Path(input_path).is_file():
+            raise FileNotFoundError(f"Input file not found: {input_path}")
+
+        if Path(input_path).suffix.lower() in VIDEO_EXTENSIONS:
+            from .processors import VideoProcessor
+            processor = VideoProcessor(progress_callback=progress, **self.options)
+            processor.backend = self._acquire()
+            processor.upscale_file(input_path, output_path)
+            return
+
+        import cv2
+        image_bgr = cv2.imread(input_path, cv2.IMREAD_COLOR)
+        if image_bgr is None:
+            raise ValueError(f"Could not load image: {input_path}")
+
+        processor = self._image_processor()
+        processor.save_image(output_path, processor.enhance(cv2.cvtColor(image_bgr, cv2.COLOR_BGR2RGB)))
+        if progress is not None:
+            progress(1, 1)
+
+    def upscale_frames(self, frames: Iterable[np.ndarray],
+                       progress: Optional[ProgressCallback] = None) -> Iterator[np.ndarray]:
+        """Upscale a sequence of RGB frames lazily and yield the results in order.
+
+        Frames are sent to the backend batch_size at a time, and tiles that did
+        not change since the previous frame are reused as in video processing.
+        """
+        backend = self._acquire()
+        tolerance = self.options.get('tile_reuse_tolerance', 0)
+        backend.enable_temporal_reuse(tolerance if tolerance is not None and tolerance >= 0 else None)
+        batch_size = self.options.get('batch_size') or backend.batch_size
+        total = len(frames) if hasattr(frames, '__len__') else 0
+
+        done = 0
+        batch = []
+        for frame in frames:
+            batch.append(frame)
+            if len(batch) < batch_size:
+                continue
+            for upscaled in backend.upscale_batch(batch):
+                done += 1
+                if progress is not None:
+                    progress(done, total)
+                yield upscaled
+            batch = []
+
+        for upscaled in backend.upscale_batch(batch) if batch else []:
+            done += 1
+            if progress is not None:
+                progress(done, total)
+            yield upscaled
+
+    def video_frames(self, input_path: str,
+                     progress: Optional[ProgressCallback] = None) -> Iterator[np.ndarray]:
+        """Decode a video with ffmpeg and yield its upscaled RGB frames in order."""
+        from .processors import VideoProcessor
+        from .utils.video import Y4MReader, get_video_info
+
+        if not Path(input_path).is_file():
+            raise FileNotFoundError(f"Input file not found: {input_path}")
+
+        processor = VideoProcessor(**self.options)
+        try:
+            total = get_video_info(input_path).get('nb_frames', 0) or 0
+        except Exception:
+            total = 0
+
+        decoder_log = tempfile.TemporaryFile()
+        decoder = subprocess.Popen(processor._build_decode_cmd(input_path, '-'),
+                                   stdout=subprocess.PIPE, stderr=decoder_log)
+        try:
+            reader = Y4MReader(decoder.stdout)
+            try:
+                header = reader.read_header()
+            except ValueError:
+                decoder.wait()
+                raise RuntimeError(f"Video decoding failed: {processor._read_log(decoder_log)}")
+
+            def decoded() -> Iterator[np.ndarray]:
+                while True:
+                    frame_data = reader.read_frame()
+                    if frame_data is None:
+                        return
+                    yield processor._yuv420p_to_rgb(frame_data, header['width'], header['height'])
+
+            for index, frame in enumerate(self.upscale_frames(decoded()), 1):
+                if progress is not None:
+                    progress(index, total)
+                yield frame
+
+            if decoder.wait() != 0:
+                raise RuntimeError(f"Video decoding failed: {processor._read_log(decoder_log)}")
+        finally:
+            # The caller may stop iterating early
+            if decoder.poll() is None:
+                decoder.kill()
+                decoder.wait()
+            decoder_log.close()
+
+    def _acquire(self):
+        """The session backend, reset for a new job."""
+        self.open()
+        self._backend.reset_job_state()
+        return self._backend
+
+    def _image_processor(self):
+        from .processors import ImageProcessor
+        processor = ImageProcessor(**self.options)
+        processor.backend = self._acquire()
+        return processor
@@ -1,48 +1,115 @@
+"""
+Upscaling backends.
+
+Backend modules import heavy dependencies (torch, basicsr, realesrgan,
+onnxruntime), so they are only imported when a backend is selected.
+``from upscaler.backends import TorchBackend`` still works through the
+module-level __getattr__.
+"""
+
+import importlib
 import logging
-from typing import Optional
+import os
 
-from .torch_backend import TorchBackend
-from .torch_backend_simple import SimpleTorchBackend
-from .torch_backend_official import TorchBackendOfficial
-from .ncnn_backend import NcnnBackend
-# from .official_backend import OfficialBackend  # 파일이 없어서 주석처리
+from .cpu_profile import PROFILE_ENV
 
 
 logger = logging.getLogger(__name__)
 
+# Backend class name -> module that defines it
+_BACKEND_MODULES = {
+    'TorchBackend': '.torch_backend',
+    'SimpleTorchBackend': '.torch_backend_simple',
+    'TorchBackendOfficial': '.torch_backend_official',
+    'NcnnBackend': '.ncnn_backend',
+    'OnnxBackend': '.onnx_backend',
+}
+
+# --backend choice -> (backend class name, error when it is unavailable)
+BACKENDS = {
+    'torch': ('TorchBackend', "PyTorch backend not available"),
+    'ncnn': ('NcnnBackend', "NCNN backend not available"),
+    'onnx': ('OnnxBackend', "ONNX Runtime backend not available (pip install onnxruntime)"),
+}
+
+# Options only TorchBackend implements (option name -> CLI flag); 'auto' must
+# not pick a backend that would silently ignore them
+TORCH_ONLY_OPTIONS = {
+    'int8': '--int8',
+    'calibration_dir': '--calibration-dir',
+    'cpu_profile': '--cpu-profile',
+    'threads': '--threads',
+    'interop_threads': '--interop-threads',
+    'channels_last': '--channels-last',
+    'compile_mode': '--compile',
+    'fuse': '--fuse',
+}
+
+
+def torch_only_flags(kwargs) -> list:
+    """CLI flags of the TorchBackend-only options set in kwargs."""
+    flags = [flag for name, flag in TORCH_ONLY_OPTIONS.items() if kwargs.get(name) not in (None, False)]
+    if not kwargs.get('cpu_profile') and os.environ.get(PROFILE_ENV):
+        flags.append(PROFILE_ENV)
+    return flags
+
+
+def accepts_threads(kwargs) -> bool:
+    """True if adding a threads option to kwargs cannot change which backend 'auto' picks."""
+    return kwargs.get('backend') not in (None, 'auto') or bool(torch_only_flags(kwargs))
+
+
+def load_backend_class(class_name: str):
+    """Import and return a backend class by name."""
+    module = importlib.import_module(_BACKEND_MODULES[class_name], __name__)
+    return getattr(module, class_name)
+
+
+def __getattr__(name: str):
+    if name in _BACKEND_MODULES:
+        return load_backend_class(name)
+    raise AttributeError(f"module {__name__!r} has no attribute {name!r}")
+
 
 def get_backend(backend_name: str = 'auto', **kwargs):
     """Get the appropriate backend for upscaling."""
+    # Processors pass their options through unchanged, including the backend choice
+    backend_name = kwargs.pop('backend', None) or backend_name
     
     if backend_name == 'auto':
+        requested = torch_only_flags(kwargs)
+        if requested:
+            TorchBackend = load_backend_class('TorchBackend')
+            if TorchBackend.is_available():
+                logger.info(f"Using PyTorch backend for {', '.join(requested)}")
+                return TorchBackend(**kwargs)
+        
         # Try backends in order of preference
         # First try official implementation (Gemini DeepThink solution)
+        TorchBackendOfficial = load_backend_class('TorchBackendOfficial')
         if TorchBackendOfficial.is_available():
             logger.info("Using Official PyTorch backend (RealESRGANer)")
             return TorchBackendOfficial(**kwargs)
         # Then try improved TorchBackend with architecture detection
-        elif TorchBackend.is_available():
+        TorchBackend = load_backend_class('TorchBackend')
+        if TorchBackend.is_available():
             logger.info("Using PyTorch backend with architecture detection")
             return TorchBackend(**kwargs)
-        elif NcnnBackend.is_available():
+        NcnnBackend = load_backend_class('NcnnBackend')
+        if NcnnBackend.is_available():
             logger.info("Using NCNN backend (Vulkan available)")
             return NcnnBackend(**kwargs)
-        else:
-            logger.warning("No AI backends available, using basic interpolation")
-            return SimpleTorchBackend(device='cpu', **kwargs)
-    
-    elif backend_name == 'torch':
-        if not TorchBackend.is_available():
-            raise RuntimeError("PyTorch backend not available")
-        return TorchBackend(**kwargs)
+        logger.warning("No AI backends available, using basic interpolation")
+        return load_backend_class('SimpleTorchBackend')(device='cpu', **kwargs)
     
-    elif backend_name == 'ncnn':
-        if not NcnnBackend.is_available():
-            raise RuntimeError("NCNN backend not available")
-        return NcnnBackend(**kwargs)
-    
-    else:
+    if backend_name not in BACKENDS:
         raise ValueError(f"Unknown backend: {backend_name}")
+    
+    class_name, unavailable = BACKENDS[backend_name]
+    backend_class = load_backend_class(class_name)
+    if not backend_class.is_available():
+        raise RuntimeError(unavailable)
+    return backend_class(**kwargs)
 
 
-__all__ = ['get_backend', 'TorchBackend', 'NcnnBackend']
\ No newline at end of file
+__all__ = ['get_backend', 'load_backend_class', 'torch_only_flags', 'accepts_threads', 'BACKENDS', 'TORCH_ONLY_OPTIONS', 'TorchBackend', 'NcnnBackend', 'OnnxBackend']
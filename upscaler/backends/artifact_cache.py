@@ -0,0 +1,122 @@
+"""
+Cache of traced TorchScript models for fast cold starts.
+
+Loading a checkpoint means detecting the architecture, building the module,
+reading and remapping the state dict and moving it to the device. A traced
+module saved with torch.jit skips all of that. Artifacts live in the
+``compiled`` folder of the model cache, keyed by model checksum,
+architecture parameters, device, dtype and torch version.
+"""
+
+import hashlib
+import json
+import logging
+import os
+import warnings
+from pathlib import Path
+from typing import Any, Dict, Optional
+
+import torch
+
+from .model_detector import detect_architecture
+from ..models import ModelManager
+
+
+logger = logging.getLogger(__name__)
+
+ARTIFACT_DIR = 'compiled'
+SCHEMA_VERSION = '1.0'
+
+# Largest output difference (on the 0-1 scale) accepted from a traced model
+_VERIFY_TOLERANCE = {'fp32': 1e-4, 'fp16': 1e-2}
+
+# Checksum index of earlier versions, superseded by the model manifest
+_LEGACY_INDEX = 'checksums.json'
+
+# One model manager per model folder, so its manifest is read once
+_managers: Dict[Path, ModelManager] = {}
+
+
+def file_checksum(path: Path) -> str:
+    """SHA-256 of a file, shared with the model manager's verified checksums."""
+    manager = _managers.get(path.parent)
+    if manager is None:
+        manager = _managers[path.parent] = ModelManager(path.parent)
+    return manager.verified_sha256(path)
+
+
+def artifact_key(model_path: Path, device: str, dtype: str, variant: str = 'eager') -> Dict[str, Any]:
+    """Everything a traced model depends on; variant names graph rewrites such as fusion."""
+    arch_name, arch_params, _ = detect_architecture(str(model_path))
+    return {
+        'checksum': file_checksum(model_path),
+        'arch_name': arch_name,
+        'arch_params': arch_params,
+        'device': device,
+        'dtype': dtype,
+        'variant': variant,
+        'torch': torch.__version__,
+        'schema_version': SCHEMA_VERSION,
+    }
+
+
+def artifact_path(model_path: Path, key: Dict[str, Any]) -> Path:
+    """File of the artifact for key in the model cache."""
+    digest = hashlib.sha1(json.dumps(key, sort_keys=True).encode()).hexdigest()[:16]
+    return model_path.parent / ARTIFACT_DIR / f"{model_path.stem}-{digest}.pt"
+
+
+def load_artifact(model_path: Path, device: str, dtype: str,
+                  variant: str = 'eager') -> Optional[torch.nn.Module]:
+    """Load the traced model for this checkpoint, device, dtype and variant, if cached."""
+    try:
+        path = artifact_path(model_path, artifact_key(model_path, device, dtype, variant))
+        if not path.exists():
+            return None
+
+        with warnings.catch_warnings():
+            warnings.simplefilter('ignore', FutureWarning)
+            model = torch.jit.load(str(path), map_location=device)
+        logger.info(f"Loaded cached model artifact {path.name}")
+        return model.eval()
+
+    except Exception as e:
+        logger.warning(f"Failed to load model artifact, loading checkpoint: {e}")
+        return None
+
+
+def save_artifact(model: torch.nn.Module, model_path: Path, device: str, dtype: str,
+                  variant: str = 'eager') -> Optional[Path]:
+    """Trace model and store it; skipped if the trace does not match the eager model."""
+    try:
+        path = artifact_path(model_path, artifact_key(model_path, device, dtype, variant))
+        torch_dtype = torch.float16 if dtype == 'fp16' else torch.float32
+        sample = torch.rand(1, 3, 64, 64, device=device, dtype=torch_dtype)
+        # A different shape than the trace input catches sizes baked into the graph
+        check = torch.rand(1, 3, 48, 80, device=device, dtype=torch_dtype)
+
+        # TorchScript is deprecated in recent torch releases but loads without
+        # the Python model code, which is the point of the cache
+        with torch.no_grad(), warnings.catch_warnings():
+            warnings.simplefilter('ignore', FutureWarning)
+            traced = torch.jit.trace(model, sample, check_trace=False)
+            difference = (traced(check).float() - model(check).float()).abs().max().item()
+
+        if difference > _VERIFY_TOLERANCE[dtype]:
+            logger.warning(f"Traced model differs from the eager model by {difference:.4f}, not caching")
+            return None
+
+        path.parent.mkdir(exist_ok=True)
+        (path.parent / _LEGACY_INDEX).unlink(missing_ok=True)
+        # Write then rename, so a concurrent reader never sees a partial file
+        temp_path = path.with_suffix(f'.{os.getpid()}.tmp')
+        with warnings.catch_warnings():
+            warnings.simplefilter('ignore', FutureWarning)
+            torch.jit.save(traced, str(temp_path))
+        temp_path.replace(path)
+        logger.info(f"Saved model artifact {path.name}")
+        return path
+
+    except Exception as e:
+        logger.warning(f"Failed to save model artifact: {e}")
+        return None
@@ -0,0 +1,201 @@
+"""
+Benchmark-driven tile size selection with a persistent per-model cache.
+"""
+
+import hashlib
+import json
+import logging
+import os
+import platform
+import time
+from datetime import datetime
+from pathlib import Path
+from typing import Any, Callable, Dict, Optional, Tuple
+
+import numpy as np
+
+
+logger = logging.getLogger(__name__)
+
+# Tile sizes (input pixels) and overlaps tried by the tuner
+CANDIDATE_TILES = (128, 192, 256, 384, 512)
+CANDIDATE_OVERLAPS = (4, 8, 16, 32)
+
+# Largest per-pixel difference from the untiled result an overlap may leave at seams
+SEAM_TOLERANCE = 2
+
+# Stop trying larger tiles once one candidate takes longer than this (seconds)
+CANDIDATE_TIME_LIMIT = 10.0
+
+# Side of the tiles used for the seam test; small so the test stays cheap
+_SEAM_PROBE_TILE = 64
+
+
+def hardware_signature(device: str, dtype: str, runtime: str = 'torch') -> Dict[str, Any]:
+    """Describe everything the fastest tile size depends on besides the model.
+
+    Runtime-specific details (threads, versions) are added for torch only;
+    other runtimes add their own.
+    """
+    signature = {
+        'device': device,
+        'dtype': dtype,
+        'machine': platform.machine(),
+        'processor': platform.processor(),
+        'cpu_count': os.cpu_count(),
+    }
+    if runtime != 'torch':
+        return signature
+
+    import torch
+    signature['threads'] = torch.get_num_threads()
+    signature['torch'] = torch.__version__
+
+    if device == 'cuda' and torch.cuda.is_available():
+        properties = torch.cuda.get_device_properties(0)
+        signature['gpu'] = properties.name
+        signature['gpu_memory'] = properties.total_memory
+
+    return signature
+
+
+def synthetic_image(height: int, width: int, seed: int = 0) -> np.ndarray:
+    """Smooth structure plus fine noise, roughly like a natural frame."""
+    import cv2
+
+    rng = np.random.default_rng(seed)
+    coarse = rng.integers(0, 256, (max(2, height // 16), max(2, width // 16), 3), dtype=np.uint8)
+    image = cv2.resize(coarse, (width, height), interpolation=cv2.INTER_CUBIC).astype(np.int16)
+    image += rng.integers(-8, 9, image.shape, dtype=np.int16)
+    return np.clip(image, 0, 255).astype(np.uint8)
+
+
+def tune_tile(run_whole: Callable[[np.ndarray], np.ndarray],
+              run_tiled: Callable[[np.ndarray, int, int], np.ndarray],
+              candidates: Tuple[int, ...] = CANDIDATE_TILES,
+              overlaps: Tuple[int, ...] = CANDIDATE_OVERLAPS) -> Dict[str, Any]:
+    """Pick the overlap that hides seams, then the tile size with the best throughput.
+
+    Args:
+        run_whole: Upscales an image in one pass; must raise on failure (e.g. OOM)
+        run_tiled: Upscales an image with the given tile size and overlap
+
+    Returns:
+        Dict with the chosen 'tile' and 'overlap' and the measured 'timings'
+    """
+    # Overlap: the smallest one whose tiled output matches the untiled one at the seams
+    probe = synthetic_image(_SEAM_PROBE_TILE * 2, _SEAM_PROBE_TILE * 2, seed=1)
+    reference = run_whole(probe).astype(np.int16)
+    overlap = overlaps[-1]
+    for candidate in overlaps:
+        error = int(np.abs(run_tiled(probe, _SEAM_PROBE_TILE, candidate).astype(np.int16) - reference).max())
+        logger.debug(f"Tile overlap {candidate}: max seam error {error}")
+        if error <= SEAM_TOLERANCE:
+            overlap = candidate
+            break
+
+    # Tile size: seconds per useful (non-overlap) input pixel of a single tile
+    timings = {}
+    best_tile, best_cost = None, None
+    for tile in candidates:
+        image = synthetic_image(tile, tile, seed=tile)
+        try:
+            run_whole(image)  # warm-up (kernel selection, allocator)
+            start = time.perf_counter()
+            run_whole(image)
+            elapsed = time.perf_counter() - start
+        except Exception as e:
+            logger.info(f"Tile {tile} failed during tuning, stopping: {e}")
+            break
+
+        cost = elapsed / ((tile - overlap) ** 2)
+        timings[str(tile)] = round(elapsed, 4)
+        logger.debug(f"Tile {tile}: {elapsed:.3f}s ({cost * 1e6:.3f}us per pixel)")
+
+        if best_cost is None or cost < best_cost:
+            best_tile, best_cost = tile, cost
+        if elapsed > CANDIDATE_TIME_LIMIT:
+            break
+
+    if best_tile is None:
+        raise RuntimeError("No tile size could be benchmarked")
+
+    return {'tile': best_tile, 'overlap': overlap, 'timings': timings}
+
+
+def _cache_key(model_path: Path, signature: Dict[str, Any]) -> str:
+    digest = hashlib.sha1(json.dumps(signature, sort_keys=True).encode()).hexdigest()[:16]
+    return f"{model_path.absolute()}|{digest}"
+
+
+def load_tuned_tile(model_path: Path, signature: Dict[str, Any]) -> Optional[Tuple[int, int]]:
+    """Return the cached (tile, overlap) for this model and hardware, if still valid."""
+    cache_file = model_path.parent / '.tile_cache.json'
+
+    if not cache_file.exists():
+        return None
+
+    try:
+        with open(cache_file, 'r') as f:
+            cache = json.load(f)
+
+        entry = cache.get(_cache_key(model_path, signature))
+        if entry is None:
+            return None
+
+        # A replaced model file needs a new measurement
+        if model_path.exists() and entry.get('mtime') != model_path.stat().st_mtime:
+            logger.info("Model file modified, tile cache invalidated")
+            return None
+
+        return entry['tile'], entry['overlap']
+
+    except Exception as e:
+        logger.warning(f"Failed to load tile cache: {e}")
+        return None
+
+
+def save_tuned_tile(model_path: Path, signature: Dict[str, Any], result: Dict[str, Any]) -> None:
+    """Store a tuning result in .tile_cache.json next to the model."""
+    cache_file = model_path.parent / '.tile_cache.json'
+
+    cache = {}
+    if cache_file.exists():
+        try:
+            with open(cache_file, 'r') as f:
+                cache = json.load(f)
+        except Exception:
+            cache = {}
+
+    cache[_cache_key(model_path, signature)] = {
+        'tile': result['tile'],
+        'overlap': result['overlap'],
+        'timings': result['timings'],
+        'signature': signature,
+        'mtime': model_path.stat().st_mtime if model_path.exists() else None,
+        'timestamp': datetime.now().isoformat(),
+        'schema_version': '1.0'
+    }
+
+    try:
+        with open(cache_file, 'w') as f:
+            json.dump(cache, f, indent=2)
+    except Exception as e:
+        logger.warning(f"Failed to save tile cache: {e}")
+
+
+def autotune_tile(model_path: Path, signature: Dict[str, Any],
+                  run_whole: Callable[[np.ndarray], np.ndarray],
+                  run_tiled: Callable[[np.ndarray, int, int], np.ndarray]) -> Tuple[int, int]:
+    """Return (tile, overlap) from the cache, tuning and caching it on a miss."""
+    cached = load_tuned_tile(model_path, signature)
+    if cached is not None:
+        logger.debug(f"Using cached tile size {cached[0]} (overlap {cached[1]})")
+        return cached
+
+    logger.info("Benchmarking tile sizes for this model and hardware (first run only)...")
+    result = tune_tile(run_whole, run_tiled)
+    logger.info(f"Selected tile size {result['tile']} with overlap {result['overlap']}")
+
+    save_tuned_tile(model_path, signature, result)
+    return result['tile'], result['overlap']
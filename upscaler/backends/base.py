@@ -1,37 +1,142 @@
 from abc import ABC, abstractmethod
+import logging
 import numpy as np
-from typing import Dict, Any, Optional, Tuple
+from pathlib import Path
+from typing import Callable, Dict, Any, List, Optional, Tuple
+
+from .autotune import autotune_tile
+
+
+logger = logging.getLogger(__name__)
+
+# Substrings of allocator errors raised when a device runs out of memory
+_OOM_MESSAGES = (
+    'out of memory',
+    "can't allocate memory",
+    'not enough memory',
+    'failed to allocate',
+)
+
+
+def is_oom_error(error: BaseException) -> bool:
+    """True if error means the device ran out of memory (and a smaller tile may fit)."""
+    if isinstance(error, MemoryError) or type(error).__name__ == 'OutOfMemoryError':
+        return True
+    message = str(error).lower()
+    return any(text in message for text in _OOM_MESSAGES)
 
 
 class BaseBackend(ABC):
     """Base class for upscaling backends."""
     
+    # Smallest tile size the out-of-memory backoff will go down to
+    min_tile_size = 64
+    
     def __init__(self, model: str, scale: int = 4, tile: int = 0, 
-                 tile_overlap: int = 32, fp16: bool = False, **kwargs):
+                 tile_overlap: int = 16, fp16: bool = False, batch_size: Optional[int] = 1,
+                 blend: str = 'cosine', **kwargs):
         self.model = model
         self.scale = scale
         self.tile = tile
         self.tile_overlap = tile_overlap
+        self.blend = blend
         self.fp16 = fp16
+        self.batch_size = max(1, batch_size or 1)
         self.kwargs = kwargs
         self._initialized = False
+        
+        # Tile size picked by auto_tile_size() for --tile 0
+        self._tuned_tile = None
+        
+        # Temporal tile reuse between consecutive video frames (disabled by default)
+        self.temporal_tolerance = None
+        self.tiles_reused = 0
+        self.tiles_total = 0
+        self._tile_history = {}
+        
+        # Feather masks for tile blending, keyed by tile shape and feathered sides
+        self._blend_cache = {}
+        
+        # Out-of-memory recoveries during this job, for the summary
+        self.fallbacks = []
+        
+        # Owned by a BackendSession: stays initialized when a `with` block ends
+        self.shared = False
+    
+    def fork_shareable(self) -> bool:
+        """True if forked worker processes can keep using this initialized backend.
+        
+        Workers then share the loaded weights copy-on-write instead of each
+        loading the model; backends holding device contexts, runtime thread
+        pools or temporary folders load their own.
+        """
+        return False
     
     @abstractmethod
     def initialize(self) -> None:
         """Initialize the backend and load models."""
         pass
     
-    @abstractmethod
     def upscale(self, image: np.ndarray) -> np.ndarray:
         """Upscale an image.
         
+        The image is tiled when it is larger than auto_tile_size(), with
+        smaller tiles after out-of-memory errors.
+        
         Args:
             image: Input image in RGB format (H, W, 3)
             
         Returns:
             Upscaled image in RGB format
         """
-        pass
+        if not self._initialized:
+            self.initialize()
+            self._initialized = True
+        
+        return self._run_with_backoff(image, self.auto_tile_size(), self._upscale_with_tile_size)
+    
+    def _upscale_with_tile_size(self, image: np.ndarray, tile_size: int) -> np.ndarray:
+        """Upscale image whole if it fits in one tile, otherwise tiled."""
+        if tile_size > 0 and (image.shape[0] > tile_size or image.shape[1] > tile_size):
+            return self._tile_image(image, tile_size, self.tile_overlap)
+        else:
+            return self._upscale_tile(image)
+    
+    def upscale_batch(self, frames: List[np.ndarray]) -> List[np.ndarray]:
+        """Upscale several images, running same-shaped frames as one batch.
+        
+        Frames larger than the tile size, or of differing shapes, are
+        upscaled one by one (their tiles are batched instead).
+        
+        Args:
+            frames: Input images in RGB format (H, W, 3)
+            
+        Returns:
+            Upscaled images in RGB format, in input order
+        """
+        if not frames:
+            return []
+        
+        if not self._initialized:
+            self.initialize()
+            self._initialized = True
+        
+        tile_size = self.auto_tile_size()
+        h, w = frames[0].shape[:2]
+        needs_tiling = tile_size > 0 and (h > tile_size or w > tile_size)
+        
+        if needs_tiling or any(frame.shape != frames[0].shape for frame in frames):
+            # Large frames are tiled; their tiles are batched inside _tile_image
+            return [self.upscale(frame) for frame in frames]
+        
+        try:
+            return self._upscale_tiles(frames)
+        except Exception as e:
+            if not is_oom_error(e):
+                raise
+            # Even a single whole frame does not fit; let upscale() tile it
+            self._release_memory()
+            return [self.upscale(frame) for frame in frames]
     
     @abstractmethod
     def cleanup(self) -> None:
@@ -50,11 +155,41 @@ class BaseBackend(ABC):
         pass
     
     def auto_tile_size(self) -> int:
-        """Calculate optimal tile size based on available memory."""
+        """Return the tile size benchmarked for this model and hardware (--tile 0)."""
         if self.tile > 0:
             return self.tile
         
-        # Default heuristics - can be overridden by backends
+        if self._tuned_tile is None:
+            self._tuned_tile = self._autotune_tile()
+        return self._tuned_tile
+    
+    def _autotune_key(self) -> Optional[Tuple[Path, Dict[str, Any]]]:
+        """Model file and hardware signature the tuned tile size is cached under.
+        
+        None skips autotuning in favour of _heuristic_tile_size().
+        """
+        return None
+    
+    def _autotune_tile(self) -> int:
+        """Look up or measure the fastest tile size; also adopts the tuned overlap."""
+        # Tuning must not touch the temporal tile history of the current video
+        temporal_tolerance = self.temporal_tolerance
+        self.temporal_tolerance = None
+        try:
+            key = self._autotune_key()
+            if key is None:
+                return self._heuristic_tile_size()
+            tile, overlap = autotune_tile(key[0], key[1], self._upscale_tile, self._tile_image)
+            self.tile_overlap = overlap
+            return tile
+        except Exception as e:
+            logger.warning(f"Tile autotuning failed, using memory heuristics: {e}")
+            return self._heuristic_tile_size()
+        finally:
+            self.temporal_tolerance = temporal_tolerance
+    
+    def _heuristic_tile_size(self) -> int:
+        """Calculate a tile size based on available memory."""
         memory_info = self.get_memory_info()
         available_mb = memory_info.get('available', 4000)  # Default 4GB
         
@@ -67,55 +202,238 @@ class BaseBackend(ABC):
         else:
             return 64
     
+    def _run_with_backoff(self, image: np.ndarray, tile_size: int,
+                          run: Callable[[np.ndarray, int], np.ndarray]) -> np.ndarray:
+        """Call run(image, tile_size), halving the tile size after out-of-memory errors.
+        
+        The reduced size is kept in self.tile for the rest of the job. Errors
+        other than out-of-memory, and running out of memory at the smallest
+        tile size, are raised.
+        """
+        while True:
+            try:
+                return run(image, tile_size)
+            except Exception as e:
+                if not is_oom_error(e):
+                    raise
+                self._release_memory()
+                
+                current = tile_size if tile_size > 0 else max(image.shape[:2])
+                reduced = current // 2
+                if reduced < self.min_tile_size:
+                    raise RuntimeError(
+                        f"Out of memory even at tile size {current}: {e}"
+                    ) from e
+                
+                self._record_fallback(f"tile {current} -> {reduced} (out of memory)")
+                self.tile = reduced
+                tile_size = reduced
+    
+    def _record_fallback(self, description: str) -> None:
+        """Note a recovery from a failure so it shows up in the job summary."""
+        logger.warning(f"Recovered from inference failure: {description}")
+        self.fallbacks.append(description)
+    
+    def _release_memory(self) -> None:
+        """Free cached device memory after an out-of-memory error."""
+        pass
+    
+    def enable_temporal_reuse(self, tolerance: Optional[int]) -> None:
+        """Reuse upscaled tiles whose input barely changed since the previous frame.
+        
+        Args:
+            tolerance: Maximum per-pixel absolute difference (0-255) for a tile to
+                count as unchanged; 0 reuses only exact matches, None disables reuse
+        """
+        self.temporal_tolerance = tolerance
+        self.reset_temporal_state()
+    
+    def reset_temporal_state(self) -> None:
+        """Forget the previous frame, e.g. at the start of a new video."""
+        self._tile_history = {}
+        self.tiles_reused = 0
+        self.tiles_total = 0
+    
+    def reset_job_state(self) -> None:
+        """Forget everything tied to the previous file before a backend is reused."""
+        self.temporal_tolerance = None
+        self.reset_temporal_state()
+        self.fallbacks = []
+    
+    def _upscale_tiles_with_reuse(self, regions: List[Tuple[int, int, int, int]],
+                                  tiles: List[np.ndarray]) -> List[np.ndarray]:
+        """Upscale tiles, reusing the previous frame's output for unchanged regions."""
+        if self.temporal_tolerance is None:
+            return self._upscale_tiles(tiles)
+        
+        outputs = [None] * len(tiles)
+        pending = []
+        for index, (region, tile) in enumerate(zip(regions, tiles)):
+            previous = self._tile_history.get(region)
+            if previous is not None and previous[0].shape == tile.shape:
+                diff = np.abs(tile.astype(np.int16) - previous[0]).max()
+                if diff <= self.temporal_tolerance:
+                    outputs[index] = previous[1]
+                    continue
+            pending.append(index)
+        
+        if pending:
+            upscaled = self._upscale_tiles([tiles[i] for i in pending])
+            for index, upscaled_tile in zip(pending, upscaled):
+                outputs[index] = upscaled_tile
+                # Keep the input the output was computed from, so small
+                # changes cannot accumulate across frames beyond the tolerance
+                self._tile_history[regions[index]] = (tiles[index].copy(), upscaled_tile)
+        
+        self.tiles_total += len(tiles)
+        self.tiles_reused += len(tiles) - len(pending)
+        return outputs
+    
     def _tile_image(self, image: np.ndarray, tile_size: int, overlap: int) -> np.ndarray:
-        """Generic tiling implementation."""
+        """Upscale image in overlapping tiles and feather-blend the seams.
+        
+        Tiles of tile_size x tile_size are spread evenly over the image, as
+        few as overlap allows, with the first and last row and column flush
+        with the image edges so every full tile has the same shape. Each upscaled tile is
+        weighted by a feather mask that ramps down across its interior edges
+        and accumulated into one float buffer, which is normalized and
+        converted back to uint8 once at the end.
+        """
         if tile_size == 0:
             # Process entire image
             return self._upscale_tile(image)
         
         h, w = image.shape[:2]
         scale = self.scale
+        # Keep the feather ramps at the two ends of a tile apart
+        overlap = max(0, min(overlap, tile_size // 2 - 1))
+        
+        ys = self._tile_starts(h, tile_size, overlap)
+        xs = self._tile_starts(w, tile_size, overlap)
+        tile_h, tile_w = min(tile_size, h), min(tile_size, w)
+        
+        regions = []
+        tiles = []
+        for y1 in ys:
+            for x1 in xs:
+                y2, x2 = y1 + tile_h, x1 + tile_w
+                regions.append((y1, y2, x1, x2))
+                tiles.append(image[y1:y2, x1:x2])
+        
+        # Upscale tiles (batched where the backend supports it)
+        upscaled_tiles = self._upscale_tiles_with_reuse(regions, tiles)
         
-        # Calculate output dimensions
         out_h, out_w = h * scale, w * scale
-        output = np.zeros((out_h, out_w, 3), dtype=image.dtype)
-        
-        # Calculate tiles
-        tiles_h = (h + tile_size - 1) // tile_size
-        tiles_w = (w + tile_size - 1) // tile_size
-        
-        for i in range(tiles_h):
-            for j in range(tiles_w):
-                # Calculate tile boundaries with overlap
-                y1 = max(0, i * tile_size - overlap)
-                y2 = min(h, (i + 1) * tile_size + overlap)
-                x1 = max(0, j * tile_size - overlap)
-                x2 = min(w, (j + 1) * tile_size + overlap)
-                
-                # Extract tile
-                tile = image[y1:y2, x1:x2]
-                
-                # Upscale tile
-                upscaled_tile = self._upscale_tile(tile)
+        output = np.zeros((out_h, out_w, 3), dtype=np.float32)
+        weight_sum = np.zeros((out_h, out_w, 1), dtype=np.float32)
+        
+        for (y1, y2, x1, x2), upscaled_tile in zip(regions, upscaled_tiles):
+            # Only edges shared with a neighbouring tile are feathered
+            sides = (y1 > 0, y2 < h, x1 > 0, x2 < w)
+            weight = self._blend_weights(upscaled_tile.shape[:2], overlap * scale, sides)
+            
+            oy1, oy2, ox1, ox2 = y1 * scale, y2 * scale, x1 * scale, x2 * scale
+            output[oy1:oy2, ox1:ox2] += upscaled_tile * weight
+            weight_sum[oy1:oy2, ox1:ox2] += weight
+        
+        output /= weight_sum
+        return np.clip(output + 0.5, 0, 255).astype(np.uint8)
+    
+    @staticmethod
+    def _tile_starts(length: int, tile_size: int, overlap: int) -> List[int]:
+        """Start offsets of the tiles along one axis, the last one flush with the edge.
+        
+        Uses the fewest tiles that overlap by at least overlap pixels and
+        spaces them evenly, so the last tile never starts just a few pixels
+        after the one before it.
+        """
+        if length <= tile_size:
+            return [0]
+        
+        stride = tile_size - overlap
+        count = -(-(length - overlap) // stride)
+        span = length - tile_size
+        return [i * span // (count - 1) for i in range(count)]
+    
+    def _blend_weights(self, shape: Tuple[int, int], ramp: int,
+                       sides: Tuple[bool, bool, bool, bool]) -> np.ndarray:
+        """Feather mask (H, W, 1) for a tile, cached per shape and feathered sides."""
+        key = (shape, ramp, sides)
+        weights = self._blend_cache.get(key)
+        if weights is None:
+            top, bottom, left, right = sides
+            wy = self._blend_ramp(shape[0], ramp, top, bottom)
+            wx = self._blend_ramp(shape[1], ramp, left, right)
+            weights = np.outer(wy, wx)[:, :, None].astype(np.float32)
+            self._blend_cache[key] = weights
+        return weights
+    
+    def _blend_ramp(self, length: int, ramp: int, start: bool, end: bool) -> np.ndarray:
+        """1-D weights rising over ramp pixels at feathered ends and 1 elsewhere."""
+        weights = np.ones(length, dtype=np.float64)
+        ramp = min(ramp, length // 2)
+        if ramp <= 0:
+            return weights
+        
+        # Sample at pixel centres so the weights never reach zero
+        t = (np.arange(ramp) + 0.5) / ramp
+        if self.blend == 'cosine':
+            rise = 0.5 - 0.5 * np.cos(np.pi * t)
+        else:
+            rise = t
+        
+        if start:
+            weights[:ramp] = rise
+        if end:
+            weights[-ramp:] = rise[::-1]
+        return weights
+    
+    def _upscale_tiles(self, tiles: List[np.ndarray]) -> List[np.ndarray]:
+        """Upscale tiles in batches of up to batch_size same-shaped inputs."""
+        if self.batch_size <= 1:
+            return [self._upscale_tile(tile) for tile in tiles]
+        
+        # Group tiles by shape (edge tiles are usually smaller) and keep input order
+        groups = {}
+        for index, tile in enumerate(tiles):
+            groups.setdefault(tile.shape, []).append(index)
+        
+        outputs = [None] * len(tiles)
+        for indices in groups.values():
+            for start in range(0, len(indices), self.batch_size):
+                chunk = indices[start:start + self.batch_size]
                 
-                # Calculate output position
-                out_y1 = y1 * scale
-                out_y2 = y2 * scale
-                out_x1 = x1 * scale
-                out_x2 = x2 * scale
+                if len(chunk) == 1:
+                    # Out-of-memory errors go to the tile size backoff
+                    outputs[chunk[0]] = self._upscale_tile(tiles[chunk[0]])
+                    continue
                 
-                # Blend with existing output (simple averaging for overlaps)
-                if overlap > 0:
-                    # TODO: Implement proper blending
-                    pass
+                try:
+                    results = self._run_batch([tiles[i] for i in chunk])
+                except Exception as e:
+                    if not is_oom_error(e):
+                        raise
+                    # Fall back to per-tile inference for this chunk
+                    self._release_memory()
+                    self._record_fallback(f"batch of {len(chunk)} -> single tiles (out of memory)")
+                    results = [self._upscale_tile(tiles[i]) for i in chunk]
                 
-                output[out_y1:out_y2, out_x1:out_x2] = upscaled_tile
+                for i, result in zip(chunk, results):
+                    outputs[i] = result
         
-        return output
+        return outputs
     
-    @abstractmethod
     def _upscale_tile(self, tile: np.ndarray) -> np.ndarray:
-        """Upscale a single tile. Must be implemented by backends."""
+        """Upscale a single tile."""
+        return self._run_batch([tile])[0]
+    
+    @abstractmethod
+    def _run_batch(self, images: List[np.ndarray]) -> List[np.ndarray]:
+        """Run N same-shaped RGB uint8 images through the model as one batch.
+        
+        Failures propagate: out-of-memory errors are retried with smaller
+        batches or tiles, anything else must not turn into a black frame.
+        """
         pass
     
     def __enter__(self):
@@ -125,4 +443,6 @@ class BaseBackend(ABC):
         return self
     
     def __exit__(self, exc_type, exc_val, exc_tb):
-        self.cleanup()
\ No newline at end of file
+        # A session backend is cleaned up when its session closes
+        if not self.shared:
+            self.cleanup()
\ No newline at end of file
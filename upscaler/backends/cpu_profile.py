@@ -0,0 +1,191 @@
+"""
+CPU execution profiles: thread layout, memory format and compiled inference.
+
+torch is imported inside the functions, so the CLI can read the profile
+names without paying for it.
+"""
+
+import logging
+import multiprocessing
+import os
+import sys
+import time
+import warnings
+from typing import Any, Dict, List, Optional
+
+
+logger = logging.getLogger(__name__)
+
+# Thread count meaning "one intra-op thread per logical core"
+ALL_CORES = -1
+
+# Named presets; 0 threads leaves the torch default in place
+PROFILES = {
+    'default': {'threads': 0, 'interop_threads': 0, 'channels_last': False, 'compile': 'none'},
+    'balanced': {'threads': ALL_CORES, 'interop_threads': 2, 'channels_last': True, 'compile': 'none'},
+    'throughput': {'threads': ALL_CORES, 'interop_threads': 1, 'channels_last': True, 'compile': 'freeze'},
+    'compiled': {'threads': ALL_CORES, 'interop_threads': 1, 'channels_last': True, 'compile': 'compile'},
+}
+
+COMPILE_MODES = ('none', 'freeze', 'compile')
+
+# Environment variable selecting the profile when --cpu-profile is not given
+PROFILE_ENV = 'UPSCALER_CPU_PROFILE'
+
+# Largest output difference (on the 0-1 scale) accepted from a compiled model
+_VERIFY_TOLERANCE = 5e-3
+
+
+def resolve_cpu_profile(name: Optional[str] = None, threads: Optional[int] = None,
+                        interop_threads: Optional[int] = None,
+                        channels_last: Optional[bool] = None,
+                        compile_mode: Optional[str] = None) -> Dict[str, Any]:
+    """Build the effective profile: preset (argument, then environment) plus explicit overrides."""
+    name = name or os.environ.get(PROFILE_ENV) or 'default'
+    if name not in PROFILES:
+        raise ValueError(f"Unknown CPU profile '{name}'. Available: {', '.join(PROFILES)}")
+
+    profile = dict(PROFILES[name], name=name)
+    if threads is not None:
+        profile['threads'] = threads
+    if interop_threads is not None:
+        profile['interop_threads'] = interop_threads
+    if channels_last is not None:
+        profile['channels_last'] = channels_last
+    if compile_mode is not None:
+        if compile_mode not in COMPILE_MODES:
+            raise ValueError(f"Unknown compile mode '{compile_mode}'. Available: {', '.join(COMPILE_MODES)}")
+        profile['compile'] = compile_mode
+
+    if profile['threads'] == ALL_CORES:
+        profile['threads'] = os.cpu_count() or 1
+    return profile
+
+
+def apply_cpu_threads(profile: Dict[str, Any]) -> None:
+    """Set the process-wide intra-op and inter-op thread counts of a profile."""
+    import torch
+
+    if profile['threads'] > 0:
+        torch.set_num_threads(profile['threads'])
+
+    if profile['interop_threads'] > 0 and torch.get_num_interop_threads() != profile['interop_threads']:
+        try:
+            torch.set_num_interop_threads(profile['interop_threads'])
+        except RuntimeError as e:
+            # Only possible before the first inter-op parallel work in the process
+            logger.warning(f"Could not set inter-op threads, keeping {torch.get_num_interop_threads()}: {e}")
+
+    logger.info(f"CPU profile '{profile['name']}': {torch.get_num_threads()} intra-op / "
+                f"{torch.get_num_interop_threads()} inter-op threads, "
+                f"channels_last={profile['channels_last']}, compile={profile['compile']}")
+
+
+def limit_worker_threads(threads: int) -> None:
+    """Size a worker process's OpenCV and torch thread pools to its share of the cores.
+
+    torch is only resized if it is already imported; OMP_NUM_THREADS sets
+    the pool size of a torch the worker imports later.
+    """
+    import cv2
+
+    os.environ['OMP_NUM_THREADS'] = str(threads)
+    cv2.setNumThreads(threads)
+    if 'torch' in sys.modules:
+        import torch
+        torch.set_num_threads(threads)
+
+
+def prepare_model(model: 'torch.nn.Module', profile: Dict[str, Any]) -> 'torch.nn.Module':
+    """Convert the model to the profile's memory format and compile or freeze it.
+
+    A compiled model is checked against the eager model on an input of a
+    different shape than it was traced with; on any failure or mismatch the
+    eager model is returned.
+    """
+    import torch
+
+    memory_format = torch.channels_last if profile['channels_last'] else torch.contiguous_format
+    model = model.to(memory_format=memory_format)
+
+    mode = profile['compile']
+    if mode == 'none':
+        return model
+
+    sample = torch.rand(1, 3, 64, 64).contiguous(memory_format=memory_format)
+    check = torch.rand(1, 3, 48, 80).contiguous(memory_format=memory_format)
+
+    try:
+        # TorchScript is deprecated in recent torch releases but still the
+        # cheapest way to freeze a model for CPU inference
+        with torch.no_grad(), warnings.catch_warnings():
+            warnings.simplefilter('ignore', FutureWarning)
+            if mode == 'freeze':
+                # A model loaded from the artifact cache is already traced
+                if isinstance(model, torch.jit.ScriptModule):
+                    traced = model
+                else:
+                    traced = torch.jit.trace(model, sample, check_trace=False)
+                compiled = torch.jit.optimize_for_inference(torch.jit.freeze(traced.eval()))
+            else:
+                compiled = torch.compile(model, dynamic=True)
+
+            compiled(sample)  # compile/optimize now rather than on the first frame
+            difference = (compiled(check).float() - model(check).float()).abs().max().item()
+
+        if difference > _VERIFY_TOLERANCE:
+            raise RuntimeError(f"output differs from the eager model by {difference:.4f}")
+
+        logger.info(f"Model prepared with compile mode '{mode}'")
+        return compiled
+
+    except Exception as e:
+        logger.warning(f"Compile mode '{mode}' unavailable, using the eager model: {e}")
+        return model
+
+
+def benchmark_profiles(model: str, profiles: List[str], size: int, frames: int,
+                       scale: int = 4) -> List[Dict[str, Any]]:
+    """Measure upscaling throughput of each profile on a synthetic size x size input.
+
+    Every profile runs in a fresh process, since thread layout can only be
+    chosen once per process.
+    """
+    ctx = multiprocessing.get_context('spawn')
+    results = []
+    for name in profiles:
+        with ctx.Pool(1) as pool:
+            results.append(pool.apply(_benchmark_worker, (model, name, size, frames, scale)))
+    return results
+
+
+def _benchmark_worker(model: str, name: str, size: int, frames: int, scale: int) -> Dict[str, Any]:
+    """Process entry point for benchmark_profiles."""
+    try:
+        import torch
+        from .autotune import synthetic_image
+        from .torch_backend import TorchBackend
+
+        image = synthetic_image(size, size)
+        # A tile as large as the input keeps the measurement free of tiling
+        backend = TorchBackend(device='cpu', model=model, scale=scale, tile=size, cpu_profile=name)
+        with backend:
+            start = time.perf_counter()
+            backend.upscale(image)
+            warmup = time.perf_counter() - start
+
+            start = time.perf_counter()
+            for _ in range(frames):
+                backend.upscale(image)
+            elapsed = time.perf_counter() - start
+
+        return {
+            'profile': name,
+            'fps': frames / elapsed,
+            'warmup': warmup,
+            'threads': torch.get_num_threads(),
+            'interop_threads': torch.get_num_interop_threads(),
+            'compile': backend.cpu_profile['compile'],
+        }
+    except Exception as e:
+        return {'profile': name, 'error': f"{type(e).__name__}: {e}"}
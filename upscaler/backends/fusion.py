@@ -0,0 +1,184 @@
+"""
+Inference-only graph optimization for SRVGGNetCompact.
+
+The loaded module is rewritten into a flat conv/activation chain:
+
+- every conv runs through F.conv2d on its weights directly, without the
+  per-layer module dispatch of the ModuleList
+- activations run in place where PyTorch allows it; a PReLU whose slopes
+  are all equal becomes an in-place leaky ReLU
+- the nearest-neighbour base of the basicsr layout is added before the
+  pixel shuffle as the input repeated per sub-pixel channel, which equals
+  adding the upsampled image afterwards without computing it at full size
+
+The rewritten module is checked against the original on random inputs and
+only used if it matches.
+"""
+
+import logging
+from typing import List, Optional, Tuple
+
+import torch
+import torch.nn as nn
+import torch.nn.functional as F
+
+
+logger = logging.getLogger(__name__)
+
+# Largest output difference (on the 0-1 scale) accepted from the fused module
+FUSION_TOLERANCE = 1e-4
+
+# Input shapes the fused module is verified on (odd sizes catch padding mistakes)
+_VERIFY_SHAPES = ((1, 3, 32, 48), (2, 3, 27, 35))
+
+
+class _ConvChain(nn.Module):
+    """Sequence of convs, each optionally followed by an activation."""
+
+    def __init__(self, convs: List[nn.Conv2d], activations: List[Optional[nn.Module]]):
+        super().__init__()
+        self.weights = nn.ParameterList()
+        self.biases = nn.ParameterList()
+        self.paddings = []
+        self.acts = []
+        self.slopes = nn.ParameterList()
+
+        for conv, activation in zip(convs, activations):
+            self.weights.append(nn.Parameter(conv.weight.detach().clone(), requires_grad=False))
+            bias = conv.bias if conv.bias is not None else torch.zeros(conv.out_channels)
+            self.biases.append(nn.Parameter(bias.detach().clone(), requires_grad=False))
+            self.paddings.append(conv.padding)
+            self.acts.append(self._fold_activation(activation))
+
+    def _fold_activation(self, activation: Optional[nn.Module]) -> Tuple[str, object]:
+        if activation is None or isinstance(activation, nn.Identity):
+            return ('none', None)
+        if isinstance(activation, nn.ReLU):
+            return ('relu', None)
+        if isinstance(activation, nn.LeakyReLU):
+            return ('leaky', activation.negative_slope)
+        if isinstance(activation, nn.PReLU):
+            slopes = activation.weight.detach()
+            if torch.all(slopes == slopes.flatten()[0]):
+                # One shared slope: an in-place leaky ReLU computes the same
+                return ('leaky', float(slopes.flatten()[0]))
+            self.slopes.append(nn.Parameter(slopes.clone(), requires_grad=False))
+            return ('prelu', len(self.slopes) - 1)
+        raise ValueError(f"Unsupported activation: {type(activation).__name__}")
+
+    def forward(self, x: torch.Tensor) -> torch.Tensor:
+        for weight, bias, padding, (kind, arg) in zip(self.weights, self.biases, self.paddings, self.acts):
+            x = F.conv2d(x, weight, bias, padding=padding)
+            if kind == 'relu':
+                x = F.relu_(x)
+            elif kind == 'leaky':
+                x = F.leaky_relu_(x, arg)
+            elif kind == 'prelu':
+                x = F.prelu(x, self.slopes[arg])
+        return x
+
+
+class FusedSRVGGNetCompact(nn.Module):
+    """Fused form of basicsr's SRVGGNetCompact (body list, pixel shuffle, nearest base)."""
+
+    def __init__(self, model: nn.Module):
+        super().__init__()
+        layers = list(model.body)
+        convs, activations = [], []
+        for layer in layers:
+            if isinstance(layer, nn.Conv2d):
+                convs.append(layer)
+                activations.append(None)
+            else:
+                activations[-1] = layer
+
+        self.chain = _ConvChain(convs, activations)
+        self.upscale = model.upscale
+        self.num_in_ch = model.num_in_ch
+        self.num_out_ch = model.num_out_ch
+
+    def forward(self, x: torch.Tensor) -> torch.Tensor:
+        out = self.chain(x)
+        # pixel_shuffle(repeat_interleave(x, r*r)) == nearest upsample of x
+        out += x.repeat_interleave(self.upscale * self.upscale, dim=1)
+        return F.pixel_shuffle(out, self.upscale)
+
+
+class FusedSRVGGNetCompactFixed(nn.Module):
+    """Fused form of archs/srvgg_arch_fixed.SRVGGNetCompact (feature skip, conv upsampler)."""
+
+    def __init__(self, model: nn.Module):
+        super().__init__()
+        body = list(model.body)
+        convs = [layer for layer in body if isinstance(layer, nn.Conv2d)]
+        activations = [None] * len(convs)
+        index = -1
+        for layer in body:
+            if isinstance(layer, nn.Conv2d):
+                index += 1
+            else:
+                activations[index] = layer
+
+        self.conv_first = _ConvChain([model.conv_first], [None])
+        self.body = _ConvChain(convs + [model.conv_body], activations + [None])
+
+        upsampler = list(model.upsampler)
+        self.shuffles = [layer.upscale_factor for layer in upsampler if isinstance(layer, nn.PixelShuffle)]
+        self.upconvs = nn.ModuleList(
+            _ConvChain([layer], [None]) for layer in upsampler if isinstance(layer, nn.Conv2d)
+        )
+        self.tail = _ConvChain([model.conv_hr, model.conv_last], [model.act, None])
+
+    def forward(self, x: torch.Tensor) -> torch.Tensor:
+        feat = self.conv_first(x)
+        feat = feat + self.body(feat)
+        for upconv, factor in zip(self.upconvs, self.shuffles):
+            feat = F.pixel_shuffle(upconv(feat), factor)
+        return self.tail(feat)
+
+
+def fuse_model(model: nn.Module) -> Optional[nn.Module]:
+    """Build the fused module for a supported architecture, None otherwise."""
+    if type(model).__name__ != 'SRVGGNetCompact':
+        return None
+
+    if hasattr(model, 'conv_first'):
+        return FusedSRVGGNetCompactFixed(model)
+    if getattr(model, 'num_in_ch', None) == getattr(model, 'num_out_ch', None):
+        return FusedSRVGGNetCompact(model)
+    return None
+
+
+def verify_fused(original: nn.Module, fused: nn.Module, tolerance: float = FUSION_TOLERANCE) -> float:
+    """Largest output difference between the two modules on random inputs."""
+    parameter = next(original.parameters())
+    difference = 0.0
+    generator = torch.Generator().manual_seed(0)
+    with torch.no_grad():
+        for shape in _VERIFY_SHAPES:
+            x = torch.rand(shape, generator=generator).to(parameter.device, parameter.dtype)
+            expected = original(x.clone()).float()
+            actual = fused(x.clone()).float()
+            difference = max(difference, (expected - actual).abs().max().item())
+    return difference
+
+
+def optimize_model(model: nn.Module) -> nn.Module:
+    """Return the fused, verified form of model, or model itself if it cannot be fused."""
+    try:
+        fused = fuse_model(model)
+        if fused is None:
+            return model
+
+        fused = fused.to(next(model.parameters()).device).eval()
+        difference = verify_fused(model, fused)
+        if difference > FUSION_TOLERANCE:
+            logger.warning(f"Fused model differs from the original by {difference:.2e}, not using it")
+            return model
+
+        logger.info(f"Fused {type(model).__name__} layers for inference (max difference {difference:.1e})")
+        return fused
+
+    except Exception as e:
+        logger.warning(f"Layer fusion failed, using the original model: {e}")
+        return model
@@ -134,6 +134,23 @@ def infer_arch_params(arch_name: str, state_dict: Dict) -> Dict[str, Any]:
         
         params['num_out_ch'] = params.get('num_in_ch', 3)
     
+    elif arch_name == 'SRVGGNetCompact' and 'conv_first.weight' not in state_dict:
+        # basicsr layout (official checkpoints): body.0 is the first conv,
+        # PReLU slopes sit between the convs and the last conv feeds the pixel shuffle
+        conv_keys = sorted(
+            (int(match.group(1)), key) for key in state_dict
+            for match in [re.match(r'^body\.(\d+)\.weight$', key)]
+            if match and state_dict[key].dim() == 4
+        )
+        first = state_dict[conv_keys[0][1]].shape
+        last = state_dict[conv_keys[-1][1]].shape
+        params['num_in_ch'] = first[1]
+        params['num_feat'] = first[0]
+        params['num_out_ch'] = first[1]
+        params['num_conv'] = len(conv_keys) - 2
+        params['act_type'] = 'prelu' if 'body.1.weight' in state_dict else 'leakyrelu'
+        params['upscale'] = int(round((last[0] / params['num_out_ch']) ** 0.5))
+    
     elif arch_name == 'SRVGGNetCompact':
         # Get input/output channels and features
         if 'conv_first.weight' in state_dict:
@@ -155,7 +172,7 @@ def infer_arch_params(arch_name: str, state_dict: Dict) -> Dict[str, Any]:
         
         # Detect activation type (prelu or lrelu)
         has_prelu = any('prelu' in k.lower() for k in state_dict)
-        params['act_type'] = 'prelu' if has_prelu else 'lrelu'
+        params['act_type'] = 'prelu' if has_prelu else 'leakyrelu'
         
         # Detect scale from upsampler
         if 'upsampler.0.weight' in state_dict:
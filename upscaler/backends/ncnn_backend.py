@@ -1,112 +1,169 @@
+import os
 import subprocess
+import sys
 import tempfile
 import numpy as np
 import cv2
 import logging
+from concurrent.futures import ThreadPoolExecutor
 from pathlib import Path
-from typing import Dict, Any
+from typing import Dict, Any, List, Optional
 import shutil
 
 from .base import BaseBackend
-from ..models import ModelManager
 
 
 logger = logging.getLogger(__name__)
 
+# Binary used instead of realesrgan-ncnn-vulkan from PATH (e.g. a local build or a test stand-in)
+BINARY_ENV = 'UPSCALER_NCNN_BINARY'
+
+# Folder with the NCNN .param/.bin files, passed to the binary as -m
+MODELS_ENV = 'UPSCALER_NCNN_MODELS'
+
+# Frame files are written uncompressed (the binary reads BMP through stb_image);
+# PNG is the only lossless format the binary writes
+INPUT_FORMAT = 'bmp'
+OUTPUT_FORMAT = 'png'
+
+# Frames per binary invocation when --batch-size is not given
+DEFAULT_BATCH_SIZE = 16
+
 
 class NcnnBackend(BaseBackend):
-    """NCNN backend using realesrgan-ncnn-vulkan binary."""
+    """NCNN backend using realesrgan-ncnn-vulkan binary.
+    
+    Frames are upscaled in batches: each batch is written to a folder and the
+    binary runs once on the whole folder, so process start-up and model
+    loading are paid once per batch instead of once per frame.
+    """
     
     def __init__(self, **kwargs):
         super().__init__(**kwargs)
         self.binary_path = None
-        self.model_manager = ModelManager()
         self.temp_dir = None
+        if not kwargs.get('batch_size'):
+            self.batch_size = DEFAULT_BATCH_SIZE
+        self._batch_index = 0
+    
+    @staticmethod
+    def find_binary() -> Optional[str]:
+        """Path of the NCNN binary: $UPSCALER_NCNN_BINARY, else realesrgan-ncnn-vulkan from PATH."""
+        override = os.environ.get(BINARY_ENV)
+        if override:
+            return override if Path(override).is_file() else shutil.which(override)
+        return shutil.which('realesrgan-ncnn-vulkan')
     
     @classmethod
     def is_available(cls) -> bool:
         """Check if NCNN binary is available."""
-        # Check if realesrgan-ncnn-vulkan is in PATH
-        return shutil.which('realesrgan-ncnn-vulkan') is not None
+        return cls.find_binary() is not None
     
     def initialize(self) -> None:
         """Initialize the NCNN backend."""
         logger.info("Initializing NCNN backend")
         
         # Find binary
-        self.binary_path = shutil.which('realesrgan-ncnn-vulkan')
+        self.binary_path = self.find_binary()
         if not self.binary_path:
-            raise RuntimeError("realesrgan-ncnn-vulkan binary not found in PATH")
+            raise RuntimeError(f"realesrgan-ncnn-vulkan binary not found in PATH (or set {BINARY_ENV})")
         
         # Create temporary directory for processing
         self.temp_dir = tempfile.mkdtemp(prefix='upscaler_ncnn_')
-        
-        # Ensure model is available
-        model_path = self.model_manager.get_ncnn_model_path(self.model)
-        if not model_path.exists():
-            logger.info(f"Downloading NCNN model: {self.model}")
-            self.model_manager.download_ncnn_model(self.model)
     
     def upscale(self, image: np.ndarray) -> np.ndarray:
         """Upscale an image using NCNN."""
+        return self.upscale_batch([image])[0]
+    
+    def upscale_batch(self, frames: List[np.ndarray]) -> List[np.ndarray]:
+        """Upscale frames with one binary run per batch_size frames, in input order."""
         if not self._initialized:
             self.initialize()
             self._initialized = True
         
-        return self._upscale_tile(image)
+        outputs = []
+        for start in range(0, len(frames), self.batch_size):
+            outputs.extend(self._run_folder(frames[start:start + self.batch_size]))
+        return outputs
     
-    def _upscale_tile(self, tile: np.ndarray) -> np.ndarray:
-        """Upscale a single tile using NCNN binary."""
-        import tempfile
-        import os
-        
-        # Create temporary files
-        input_file = os.path.join(self.temp_dir, 'input.png')
-        output_file = os.path.join(self.temp_dir, 'output.png')
+    def _run_batch(self, images: List[np.ndarray]) -> List[np.ndarray]:
+        """Upscale tiles with one NCNN binary run."""
+        return self._run_folder(images)
+    
+    def _run_folder(self, frames: List[np.ndarray]) -> List[np.ndarray]:
+        """Write frames to a folder, run the binary in folder mode and read the results back."""
+        if not frames:
+            return []
         
-        # Save input image
-        cv2.imwrite(input_file, cv2.cvtColor(tile, cv2.COLOR_RGB2BGR))
+        self._batch_index += 1
+        input_dir = Path(self.temp_dir) / f'in_{self._batch_index}'
+        output_dir = Path(self.temp_dir) / f'out_{self._batch_index}'
+        input_dir.mkdir()
+        output_dir.mkdir()
+        names = [f'{i:06d}' for i in range(len(frames))]
         
-        # Prepare command
-        cmd = [
-            self.binary_path,
-            '-i', input_file,
-            '-o', output_file,
+        try:
+            # Encoding and decoding release the GIL, so a few threads overlap them
+            with ThreadPoolExecutor(max_workers=min(4, len(frames))) as pool:
+                list(pool.map(
+                    lambda item: self._write_frame(input_dir / f'{item[0]}.{INPUT_FORMAT}', item[1]),
+                    zip(names, frames)
+                ))
+                
+                self._run_binary(input_dir, output_dir)
+                
+                return list(pool.map(
+                    lambda name: self._read_frame(output_dir / f'{name}.{OUTPUT_FORMAT}'),
+                    names
+                ))
+        finally:
+            shutil.rmtree(input_dir, ignore_errors=True)
+            shutil.rmtree(output_dir, ignore_errors=True)
+    
+    @staticmethod
+    def _write_frame(path: Path, frame: np.ndarray) -> None:
+        if not cv2.imwrite(str(path), cv2.cvtColor(frame, cv2.COLOR_RGB2BGR)):
+            raise RuntimeError(f"Failed to write NCNN input frame {path.name}")
+    
+    @staticmethod
+    def _read_frame(path: Path) -> np.ndarray:
+        output_bgr = cv2.imread(str(path), cv2.IMREAD_COLOR)
+        if output_bgr is None:
+            raise RuntimeError(f"NCNN did not produce output file {path.name}")
+        return cv2.cvtColor(output_bgr, cv2.COLOR_BGR2RGB)
+    
+    def _run_binary(self, input_dir: Path, output_dir: Path) -> None:
+        """Run the binary once over input_dir."""
+        # A Python stand-in script is run with the current interpreter
+        cmd = [sys.executable, self.binary_path] if self.binary_path.endswith('.py') else [self.binary_path]
+        cmd += [
+            '-i', str(input_dir),
+            '-o', str(output_dir),
             '-n', self._get_ncnn_model_name(),
-            '-s', str(self.scale)
+            '-s', str(self.scale),
+            '-f', OUTPUT_FORMAT,
         ]
         
+        models_dir = os.environ.get(MODELS_ENV)
+        if models_dir:
+            cmd.extend(['-m', models_dir])
+        
         # Add tiling options if specified
         if self.tile > 0:
             cmd.extend(['-t', str(self.tile)])
         
-        # Run upscaling
         try:
             result = subprocess.run(
-                cmd, 
-                capture_output=True, 
-                text=True, 
-                timeout=300  # 5 minute timeout
+                cmd,
+                capture_output=True,
+                text=True,
+                timeout=300 + 30 * len(os.listdir(input_dir))  # 5 minutes plus time per frame
             )
-            
-            if result.returncode != 0:
-                raise RuntimeError(f"NCNN upscaling failed: {result.stderr}")
-            
-            # Load result
-            if not os.path.exists(output_file):
-                raise RuntimeError("NCNN did not produce output file")
-            
-            output_bgr = cv2.imread(output_file)
-            output_rgb = cv2.cvtColor(output_bgr, cv2.COLOR_BGR2RGB)
-            
-            # Clean up temp files
-            os.remove(input_file)
-            os.remove(output_file)
-            
-            return output_rgb
-            
         except subprocess.TimeoutExpired:
             raise RuntimeError("NCNN upscaling timed out")
+        
+        if result.returncode != 0:
+            raise RuntimeError(f"NCNN upscaling failed: {result.stderr}")
     
     def _get_ncnn_model_name(self) -> str:
         """Map model name to NCNN model name."""
@@ -139,4 +196,4 @@ class NcnnBackend(BaseBackend):
         """Clean up resources."""
         if self.temp_dir and Path(self.temp_dir).exists():
             shutil.rmtree(self.temp_dir)
-            self.temp_dir = None
\ No newline at end of file
+            self.temp_dir = None
@@ -0,0 +1,136 @@
+"""
+ONNX export of Real-ESRGAN models and an ONNX Runtime CPU backend.
+"""
+
+import logging
+from pathlib import Path
+from typing import Dict, Any, List, Optional, Tuple
+
+import numpy as np
+
+from .base import BaseBackend
+from .autotune import hardware_signature
+from ..models import ModelManager
+
+
+logger = logging.getLogger(__name__)
+
+DEFAULT_OPSET = 17
+
+_INPUT_NAME = 'input'
+_OUTPUT_NAME = 'output'
+
+
+def onnx_model_path(model_path: Path) -> Path:
+    """Location of the exported graph for a model in the model cache."""
+    return model_path.with_suffix('.onnx')
+
+
+def export_onnx(model_path: Path, output_path: Optional[Path] = None, scale: int = 4,
+                opset: int = DEFAULT_OPSET) -> Path:
+    """Export a RRDBNet or SRVGGNetCompact checkpoint to ONNX.
+
+    The architecture is detected from the checkpoint like for the PyTorch
+    backend. Batch, height and width are dynamic axes, so one graph serves
+    every tile and frame size.
+    """
+    import warnings
+    import torch
+    from .realesrgan_wrapper_improved import load_realesrgan_model
+
+    output_path = Path(output_path) if output_path else onnx_model_path(model_path)
+    model = load_realesrgan_model(str(model_path), device='cpu', scale=scale).float()
+
+    dynamic_axes = {0: 'batch', 2: 'height', 3: 'width'}
+    with torch.no_grad(), warnings.catch_warnings():
+        # The TorchScript-based exporter is deprecated but needs no extra packages
+        warnings.simplefilter('ignore', DeprecationWarning)
+        torch.onnx.export(
+            model, torch.rand(1, 3, 64, 64), str(output_path),
+            input_names=[_INPUT_NAME], output_names=[_OUTPUT_NAME],
+            dynamic_axes={_INPUT_NAME: dynamic_axes, _OUTPUT_NAME: dynamic_axes},
+            opset_version=opset, dynamo=False
+        )
+
+    logger.info(f"Exported {model_path.name} to {output_path}")
+    return output_path
+
+
+class OnnxBackend(BaseBackend):
+    """ONNX Runtime backend (CPU execution provider)."""
+
+    def __init__(self, **kwargs):
+        super().__init__(**kwargs)
+        self.device = 'cpu'
+        self.cuda_available = False
+        self.session = None
+        self.model_manager = ModelManager()
+
+    @classmethod
+    def is_available(cls) -> bool:
+        """Check if ONNX Runtime with the CPU execution provider is installed."""
+        try:
+            import onnxruntime
+            return 'CPUExecutionProvider' in onnxruntime.get_available_providers()
+        except ImportError:
+            return False
+
+    def initialize(self) -> None:
+        """Export the model if needed and create the inference session."""
+        import onnxruntime as ort
+
+        logger.info("Initializing ONNX Runtime backend (CPU)")
+
+        model_path = self.model_manager.get_model_path(self.model)
+        graph_path = onnx_model_path(model_path)
+        if not model_path.exists() and not graph_path.exists():
+            logger.info(f"Downloading model: {self.model}")
+            self.model_manager.download_model(self.model)
+
+        # Re-export when the checkpoint was replaced after the last export
+        if not graph_path.exists() or (model_path.exists() and
+                                       graph_path.stat().st_mtime < model_path.stat().st_mtime):
+            model_info = self.model_manager.models.get(self.model, {})
+            export_onnx(model_path, graph_path, scale=model_info.get('scale', self.scale))
+
+        options = ort.SessionOptions()
+        options.graph_optimization_level = ort.GraphOptimizationLevel.ORT_ENABLE_ALL
+        if self.kwargs.get('threads'):
+            options.intra_op_num_threads = self.kwargs['threads']
+        if self.kwargs.get('interop_threads'):
+            options.inter_op_num_threads = self.kwargs['interop_threads']
+
+        self.session = ort.InferenceSession(str(graph_path), options,
+                                            providers=['CPUExecutionProvider'])
+        logger.info(f"Loaded ONNX graph {graph_path.name}")
+
+    def _run_batch(self, images: List[np.ndarray]) -> List[np.ndarray]:
+        """Run N same-shaped RGB uint8 images through the session as one NCHW batch."""
+        batch = np.ascontiguousarray(np.stack(images).transpose(0, 3, 1, 2), dtype=np.float32)
+        batch /= 255.0
+
+        output = self.session.run([_OUTPUT_NAME], {_INPUT_NAME: batch})[0]
+
+        # Same conversion as the PyTorch wrapper, so both backends match
+        output = np.clip(output, 0, 1).transpose(0, 2, 3, 1)
+        return list(np.ascontiguousarray((output * 255).astype(np.uint8)))
+
+    def _autotune_key(self) -> Tuple[Path, Dict[str, Any]]:
+        """Tuned tile sizes depend on the runtime version and its thread count."""
+        import onnxruntime as ort
+
+        signature = dict(hardware_signature('cpu', 'fp32', runtime='onnxruntime'),
+                         backend='onnx', onnxruntime=ort.__version__,
+                         threads=self.session.get_session_options().intra_op_num_threads)
+        return onnx_model_path(self.model_manager.get_model_path(self.model)), signature
+
+    def _heuristic_tile_size(self) -> int:
+        return 256
+
+    def get_memory_info(self) -> Dict[str, Any]:
+        """Get memory usage information."""
+        return {'device': 'cpu', 'available_mb': 4000}  # Conservative estimate
+
+    def cleanup(self) -> None:
+        """Release the inference session."""
+        self.session = None
@@ -0,0 +1,250 @@
+"""
+Post-training INT8 quantization of Real-ESRGAN models for CPU inference.
+"""
+
+import copy
+import hashlib
+import logging
+import time
+import warnings
+from pathlib import Path
+from typing import Any, Dict, List, Optional, Tuple, Union
+
+import numpy as np
+import torch
+import torch.nn as nn
+
+
+logger = logging.getLogger(__name__)
+
+SCHEMA_VERSION = '1.0'
+
+# Calibration defaults: a few crops are enough for per-tensor activation ranges
+CALIBRATION_COUNT = 8
+CALIBRATION_SIZE = 128
+
+_IMAGE_EXTENSIONS = {'.jpg', '.jpeg', '.png', '.bmp', '.webp', '.tiff', '.tif'}
+
+
+def quantization_engine() -> str:
+    """Best quantized kernel backend available in this torch build."""
+    supported = torch.backends.quantized.supported_engines
+    for engine in ('x86', 'fbgemm', 'onednn', 'qnnpack'):
+        if engine in supported:
+            return engine
+    raise RuntimeError("This PyTorch build has no quantized CPU engine")
+
+
+def quantized_model_path(model_path: Path) -> Path:
+    """Location of the INT8 artifact for a model in the model cache."""
+    return model_path.with_name(f"{model_path.stem}.int8.pt")
+
+
+def _calibration_files(directory: Union[str, Path]) -> List[Path]:
+    return [path for path in sorted(Path(directory).iterdir())
+            if path.suffix.lower() in _IMAGE_EXTENSIONS]
+
+
+def calibration_digest(directory: Optional[Union[str, Path]] = None) -> str:
+    """'synthetic', or a hash of the calibration images' names, sizes and mtimes."""
+    if directory is None:
+        return 'synthetic'
+
+    digest = hashlib.sha256(f"{CALIBRATION_COUNT}:{CALIBRATION_SIZE}".encode())
+    for path in _calibration_files(directory):
+        stat = path.stat()
+        digest.update(f"\0{path.name}:{stat.st_size}:{stat.st_mtime_ns}".encode())
+    return digest.hexdigest()
+
+
+def load_calibration_images(directory: Optional[Union[str, Path]] = None,
+                            count: int = CALIBRATION_COUNT,
+                            size: int = CALIBRATION_SIZE, seed: int = 0) -> List[np.ndarray]:
+    """RGB calibration crops from directory, or synthetic images when none is given."""
+    if directory is None:
+        from .autotune import synthetic_image
+        return [synthetic_image(size, size, seed=seed + i) for i in range(count)]
+
+    import cv2
+
+    images = []
+    for path in _calibration_files(directory):
+        image = cv2.imread(str(path), cv2.IMREAD_COLOR)
+        if image is None:
+            continue
+        # Centre crop so calibration stays cheap on large photos
+        h, w = image.shape[:2]
+        y, x = max(0, (h - size) // 2), max(0, (w - size) // 2)
+        images.append(cv2.cvtColor(image[y:y + size, x:x + size], cv2.COLOR_BGR2RGB))
+        if len(images) >= count:
+            break
+
+    if not images:
+        raise ValueError(f"No calibration images found in {directory}")
+    return images
+
+
+def _to_tensor(image: np.ndarray) -> torch.Tensor:
+    return torch.from_numpy(np.ascontiguousarray(image.transpose(2, 0, 1))).float().unsqueeze(0) / 255.0
+
+
+def _prepare(model: nn.Module, engine: str) -> nn.Module:
+    """Insert observers into a float copy of the model (FX graph mode)."""
+    from torch.ao.quantization import get_default_qconfig_mapping
+    from torch.ao.quantization.quantize_fx import prepare_fx
+
+    torch.backends.quantized.engine = engine
+    model = copy.deepcopy(model).float().eval()
+    for module in model.modules():
+        # Quantized leaky_relu has no in-place variant
+        if isinstance(module, nn.LeakyReLU):
+            module.inplace = False
+
+    example_inputs = (torch.rand(1, 3, 64, 64),)
+    return prepare_fx(model, get_default_qconfig_mapping(engine), example_inputs)
+
+
+def _convert(prepared: nn.Module) -> nn.Module:
+    from torch.ao.quantization.quantize_fx import convert_fx
+    return convert_fx(prepared)
+
+
+def quantize_model(model: nn.Module, images: List[np.ndarray], engine: Optional[str] = None) -> nn.Module:
+    """Static INT8 quantization, calibrating activation ranges on images."""
+    with warnings.catch_warnings():
+        # torch.ao emits deprecation notices for its own default qconfigs
+        warnings.simplefilter('ignore', UserWarning)
+        prepared = _prepare(model, engine or quantization_engine())
+        with torch.no_grad():
+            for image in images:
+                prepared(_to_tensor(image))
+        return _convert(prepared)
+
+
+def evaluate_quantized(fp32_model: nn.Module, int8_model: nn.Module,
+                       images: List[np.ndarray]) -> Dict[str, float]:
+    """PSNR of the INT8 output against fp32 (8-bit scale) and the CPU speedup."""
+    squared_errors = []
+    fp32_time = int8_time = 0.0
+
+    with torch.no_grad():
+        # Warm up both models so one-time setup is not timed
+        fp32_model.float()(_to_tensor(images[0]))
+        int8_model(_to_tensor(images[0]))
+
+        for image in images:
+            tensor = _to_tensor(image)
+
+            start = time.perf_counter()
+            reference = fp32_model.float()(tensor)
+            fp32_time += time.perf_counter() - start
+
+            start = time.perf_counter()
+            output = int8_model(tensor)
+            int8_time += time.perf_counter() - start
+
+            reference = (reference.clamp(0, 1) * 255).round()
+            output = (output.clamp(0, 1) * 255).round()
+            squared_errors.append(((reference - output) ** 2).mean().item())
+
+    mse = float(np.mean(squared_errors))
+    psnr = float('inf') if mse == 0 else float(10 * np.log10(255.0 ** 2 / mse))
+    return {
+        'psnr_db': round(psnr, 2),
+        'fp32_seconds': round(fp32_time, 4),
+        'int8_seconds': round(int8_time, 4),
+        'speedup': round(fp32_time / int8_time, 2) if int8_time > 0 else 0.0,
+    }
+
+
+def _unserialized_state(model: nn.Module) -> Dict[str, Dict[str, Any]]:
+    """Quantized PReLU keeps its scale, zero point and weight outside state_dict."""
+    from torch.ao.nn.quantized import PReLU
+
+    return {
+        name: {'scale': module.scale, 'zero_point': module.zero_point, 'weight': module.weight}
+        for name, module in model.named_modules() if isinstance(module, PReLU)
+    }
+
+
+def save_quantized(int8_model: nn.Module, model_path: Path, engine: str, report: Dict[str, float],
+                   calibration: str = 'synthetic') -> Path:
+    """Store the quantized weights next to the float model in the model cache.
+
+    calibration is the calibration_digest() of the images it was calibrated on.
+    """
+    path = quantized_model_path(model_path)
+    stat = model_path.stat()
+    torch.save({
+        'state_dict': int8_model.state_dict(),
+        'extra_state': _unserialized_state(int8_model),
+        'engine': engine,
+        'calibration': calibration,
+        'source': {'size': stat.st_size, 'mtime': stat.st_mtime},
+        'torch': torch.__version__,
+        'report': report,
+        'schema_version': SCHEMA_VERSION,
+    }, path)
+    return path
+
+
+def load_quantized(fp32_model: nn.Module, model_path: Path,
+                   calibration: str = 'synthetic') -> Optional[Tuple[nn.Module, Dict[str, float]]]:
+    """Rebuild the INT8 model from the cache; None if missing, stale or calibrated on other images."""
+    path = quantized_model_path(model_path)
+    if not path.exists():
+        return None
+
+    try:
+        with warnings.catch_warnings():
+            warnings.simplefilter('ignore', UserWarning)
+            artifact = torch.load(path, map_location='cpu', weights_only=False)
+        stat = model_path.stat()
+        if (artifact.get('schema_version') != SCHEMA_VERSION
+                or artifact['source'] != {'size': stat.st_size, 'mtime': stat.st_mtime}
+                or artifact['torch'] != torch.__version__
+                or artifact['engine'] not in torch.backends.quantized.supported_engines):
+            logger.info("Quantized model is stale, re-quantizing")
+            return None
+        if artifact.get('calibration') != calibration:
+            logger.info("Quantized model was calibrated on other images, re-quantizing")
+            return None
+
+        # Same graph as at quantization time; observers are replaced by the stored qparams
+        with warnings.catch_warnings():
+            warnings.simplefilter('ignore', UserWarning)
+            int8_model = _convert(_prepare(fp32_model, artifact['engine']))
+        int8_model.load_state_dict(artifact['state_dict'])
+        modules = dict(int8_model.named_modules())
+        for name, state in artifact['extra_state'].items():
+            for key, value in state.items():
+                setattr(modules[name], key, value)
+
+        return int8_model, artifact['report']
+
+    except Exception as e:
+        logger.warning(f"Failed to load quantized model, re-quantizing: {e}")
+        return None
+
+
+def get_quantized_model(fp32_model: nn.Module, model_path: Path,
+                        calibration_dir: Optional[Union[str, Path]] = None,
+                        force: bool = False) -> Tuple[nn.Module, Dict[str, float]]:
+    """Return the cached INT8 model, quantizing, evaluating and caching it on a miss."""
+    calibration = calibration_digest(calibration_dir)
+    if not force:
+        cached = load_quantized(fp32_model, model_path, calibration)
+        if cached is not None:
+            return cached
+
+    engine = quantization_engine()
+    logger.info(f"Quantizing {model_path.name} to INT8 ({engine})...")
+    int8_model = quantize_model(fp32_model, load_calibration_images(calibration_dir), engine)
+
+    # Evaluate on images not used for calibration
+    held_out = load_calibration_images(None, count=2, seed=1000)
+    report = evaluate_quantized(fp32_model, int8_model, held_out)
+
+    path = save_quantized(int8_model, model_path, engine, report, calibration)
+    logger.info(f"Saved quantized model to {path}")
+    return int8_model, report
@@ -83,38 +83,48 @@ def load_realesrgan_model(model_path, device='cuda', scale=4):
     return model
 
 
-def upscale_image(model, img, device='cuda', scale=4, gamma=1.0):
+def upscale_image(model, img, device='cuda', scale=4, gamma=1.0, channels_last=False):
     """Upscale image with FIXED memory contiguity (Gemini DeepThink solution)"""
+    return upscale_images(model, [img], device=device, scale=scale, gamma=gamma,
+                          channels_last=channels_last)[0]
+
+
+def upscale_images(model, imgs, device='cuda', scale=4, gamma=1.0, channels_last=False):
+    """Upscale N same-shaped images as a single NCHW batch"""
     
     # Ensure input is BGR uint8
-    if img.dtype != np.uint8:
-        img = np.clip(img * 255, 0, 255).astype(np.uint8)
+    imgs = [np.clip(img * 255, 0, 255).astype(np.uint8) if img.dtype != np.uint8 else img
+            for img in imgs]
     
     # CRITICAL FIX: Ensure memory contiguity after transpose
-    # (H, W, C) -> (C, H, W)
-    img_chw = img.transpose(2, 0, 1)
+    # (N, H, W, C) -> (N, C, H, W)
+    batch_nchw = np.stack(imgs).transpose(0, 3, 1, 2)
     
     # !!! SOLUTION: Make array contiguous in memory !!!
-    img_chw = np.ascontiguousarray(img_chw)
+    batch_nchw = np.ascontiguousarray(batch_nchw)
     
-    # Convert to tensor with proper memory layout
-    img_tensor = torch.from_numpy(img_chw).float() / 255.0
-    img_tensor = img_tensor.unsqueeze(0).to(device)
+    # Convert to tensor with proper memory layout, matching the model's dtype (fp16/fp32)
+    # (frozen TorchScript models have no parameters left and run in fp32)
+    param = next(model.parameters(), None)
+    dtype = param.dtype if param is not None else torch.float32
+    batch_tensor = torch.from_numpy(batch_nchw).to(device).to(dtype) / 255.0
+    if channels_last:
+        batch_tensor = batch_tensor.contiguous(memory_format=torch.channels_last)
     
     # Inference
     with torch.no_grad():
-        output = model(img_tensor)
+        output = model(batch_tensor)
     
     # Convert back: [0,1] -> uint8
-    output = output.squeeze(0).cpu().clamp(0, 1)
+    output = output.float().cpu().clamp(0, 1)
     output_np = output.numpy()
     
-    # (C, H, W) -> (H, W, C)
-    output_hwc = output_np.transpose(1, 2, 0)
+    # (N, C, H, W) -> (N, H, W, C)
+    output_nhwc = output_np.transpose(0, 2, 3, 1)
     
     # Ensure contiguity for output as well
-    output_hwc = np.ascontiguousarray(output_hwc)
+    output_nhwc = np.ascontiguousarray(output_nhwc)
     
-    output_result = (output_hwc * 255).astype(np.uint8)
+    output_result = (output_nhwc * 255).astype(np.uint8)
     
-    return output_result
\ No newline at end of file
+    return list(output_result)
@@ -0,0 +1,106 @@
+"""
+Backend session shared by the files of a batch.
+
+A processor normally creates its own backend, loads the model inside
+``with backend:`` and frees it again when the file is done. When a batch
+passes a session instead, backends are created once per distinct
+configuration and stay initialized (model weights, compiled artifacts,
+blend masks) until the session closes. Only per-file state such as the
+temporal tile history and the fallback log is reset between files.
+"""
+
+import logging
+from collections import OrderedDict
+from typing import Any, Dict, Optional, Tuple
+
+from . import get_backend
+from .base import BaseBackend
+
+
+logger = logging.getLogger(__name__)
+
+# Options that change which model is loaded or how it runs; files whose
+# options agree on all of these share one backend
+SESSION_KEYS = (
+    'backend', 'model', 'scale', 'device',
+    'tile', 'tile_overlap', 'blend', 'batch_size',
+    'fp16', 'int8', 'calibration_dir', 'fuse', 'gamma',
+    'cpu_profile', 'threads', 'interop_threads', 'channels_last', 'compile_mode',
+)
+
+
+def session_key(kwargs: Dict[str, Any]) -> Tuple:
+    """Backend configuration named by processor options."""
+    return tuple(kwargs.get(name) for name in SESSION_KEYS)
+
+
+class BackendSession:
+    """Initialized backends kept warm across the files of a batch."""
+
+    def __init__(self, max_backends: Optional[int] = None):
+        """
+        Args:
+            max_backends: Most backends kept at once; creating another one
+                frees the least recently used (default: no limit)
+        """
+        if max_backends is not None and max_backends < 1:
+            raise ValueError("max_backends must be at least 1")
+        self.max_backends = max_backends
+        self._backends = OrderedDict()
+
+    def get(self, **kwargs) -> BaseBackend:
+        """Backend for these options, created on first use but not initialized.
+
+        Lets callers look at the backend (e.g. fork_shareable()) before
+        paying for loading the model.
+        """
+        key = session_key(kwargs)
+        backend = self._backends.get(key)
+        if backend is not None:
+            self._backends.move_to_end(key)
+            return backend
+
+        backend = get_backend(**kwargs)
+        # Leaving a processor's `with backend:` block must not free the model
+        backend.shared = True
+        self._backends[key] = backend
+        while self.max_backends is not None and len(self._backends) > self.max_backends:
+            _, evicted = self._backends.popitem(last=False)
+            logger.info(f"Freeing least recently used backend {evicted.__class__.__name__} ({evicted.model})")
+            self._release(evicted)
+        return backend
+
+    def acquire(self, **kwargs) -> BaseBackend:
+        """Initialized backend for these options, created on first use."""
+        backend = self.get(**kwargs)
+        if not backend._initialized:
+            backend.__enter__()
+            logger.info(f"Session backend ready: {backend.__class__.__name__} ({kwargs.get('model')})")
+
+        backend.reset_job_state()
+        return backend
+
+    def close(self) -> None:
+        """Free every backend of the session."""
+        for backend in self._backends.values():
+            self._release(backend)
+        self._backends.clear()
+
+    @staticmethod
+    def _release(backend: BaseBackend) -> None:
+        backend.shared = False
+        if not backend._initialized:
+            return
+        try:
+            backend.cleanup()
+        except Exception as e:
+            logger.warning(f"Failed to clean up {backend.__class__.__name__}: {e}")
+
+    def __len__(self) -> int:
+        return len(self._backends)
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, exc_type, exc_val, exc_tb):
+        self.close()
@@ -4,11 +4,16 @@ import numpy as np
 import cv2
 import logging
 from pathlib import Path
-from typing import Dict, Any
+from typing import Dict, Any, List, Tuple
 
 from .base import BaseBackend
+from .autotune import hardware_signature
+from .cpu_profile import resolve_cpu_profile, apply_cpu_threads, prepare_model
+from .quantization import get_quantized_model
+from .artifact_cache import load_artifact, save_artifact
+from .fusion import optimize_model
 from ..models import ModelManager
-from .realesrgan_wrapper_improved import load_realesrgan_model, upscale_image
+from .realesrgan_wrapper_improved import load_realesrgan_model, upscale_images
 
 
 logger = logging.getLogger(__name__)
@@ -27,6 +32,9 @@ class TorchBackend(BaseBackend):
         
         self.model_instance = None
         self.model_manager = ModelManager()
+        self.cpu_profile = None
+        self.channels_last = False
+        self.int8_report = None
     
     @classmethod
     def is_available(cls) -> bool:
@@ -60,71 +68,106 @@ class TorchBackend(BaseBackend):
         model_info = self.model_manager.models.get(self.model, {})
         scale = model_info.get('scale', self.scale)
         
-        # Load model using the proper wrapper
-        logger.info(f"Loading model {self.model} with scale {scale}")
-        self.model_instance = load_realesrgan_model(
-            model_path=str(model_path),
-            device=self.device,
-            scale=scale
-        )
+        int8 = self.kwargs.get('int8', False)
+        if int8 and self.device != 'cpu':
+            logger.warning("INT8 inference is CPU-only, ignoring --int8 on this device")
+            int8 = False
+        
+        if self.device != 'cuda':
+            # CPU execution profile: thread layout, memory format, compiled inference
+            self.cpu_profile = resolve_cpu_profile(
+                self.kwargs.get('cpu_profile'),
+                threads=self.kwargs.get('threads'),
+                interop_threads=self.kwargs.get('interop_threads'),
+                channels_last=self.kwargs.get('channels_last'),
+                compile_mode=self.kwargs.get('compile_mode')
+            )
         
-        # Apply fp16 if requested
-        if self.fp16 and self.device == 'cuda':
-            self.model_instance = self.model_instance.half()
-            logger.info("Applied FP16 mode")
+        # Traced artifact from an earlier run; INT8 quantization and
+        # torch.compile need the eager module instead
+        dtype = 'fp16' if self.fp16 and self.device == 'cuda' else 'fp32'
+        needs_eager = int8 or (self.cpu_profile is not None and self.cpu_profile['compile'] == 'compile')
+        # Layer fusion rewrites the module; quantization works on the original layers.
+        # On by default; only an explicit --no-fuse (False) turns it off
+        fuse = self.kwargs.get('fuse') is not False and not int8
+        variant = 'fused' if fuse else 'eager'
+        self.model_instance = None if needs_eager else load_artifact(model_path, self.device, dtype, variant)
+        
+        if self.model_instance is None:
+            # Load model using the proper wrapper
+            logger.info(f"Loading model {self.model} with scale {scale}")
+            self.model_instance = load_realesrgan_model(
+                model_path=str(model_path),
+                device=self.device,
+                scale=scale
+            )
+            
+            if fuse:
+                self.model_instance = optimize_model(self.model_instance)
+            
+            # Apply fp16 if requested
+            if dtype == 'fp16':
+                self.model_instance = self.model_instance.half()
+                logger.info("Applied FP16 mode")
+            
+            if not needs_eager:
+                save_artifact(self.model_instance, model_path, self.device, dtype, variant)
         
         # Set optimal settings for inference
         if self.device == 'cuda':
             torch.backends.cudnn.benchmark = True
             torch.backends.cuda.matmul.allow_tf32 = True
-    
-    def upscale(self, image: np.ndarray) -> np.ndarray:
-        """Upscale an image using Real-ESRGAN."""
-        if not self._initialized:
-            self.initialize()
-            self._initialized = True
-        
-        # Use auto-tiling
-        tile_size = self.auto_tile_size()
-        
-        if tile_size > 0 and (image.shape[0] > tile_size or image.shape[1] > tile_size):
-            return self._tile_image(image, tile_size, self.tile_overlap)
         else:
-            return self._upscale_tile(image)
-    
-    def _upscale_tile(self, tile: np.ndarray) -> np.ndarray:
-        """Upscale a single tile."""
-        # Log input info
-        logger.debug(f"Input tile shape: {tile.shape}, dtype: {tile.dtype}, range: [{tile.min()}, {tile.max()}]")
-        
-        # Get gamma value from kwargs (use CLI provided value)
-        gamma = self.kwargs.get('gamma', 1.0)  # Default: no gamma correction
-        
-        try:
-            # Use the wrapper's upscale_image function which handles all color correction
-            output = upscale_image(
-                model=self.model_instance,
-                img=tile,
-                device=self.device,
-                scale=self.scale,
-                gamma=gamma
-            )
-            
-            logger.debug(f"Final output shape: {output.shape}, dtype: {output.dtype}, range: [{output.min()}, {output.max()}]")
+            apply_cpu_threads(self.cpu_profile)
             
-        except Exception as e:
-            logger.error(f"Error during inference: {e}")
-            # Return a properly sized black image as fallback
-            h, w = tile.shape[:2]
-            return np.zeros((h * self.scale, w * self.scale, 3), dtype=np.uint8)
-        
-        return output
+            if int8:
+                # Quantized kernels replace the profile's memory format and compilation
+                self.model_instance, self.int8_report = get_quantized_model(
+                    self.model_instance, model_path,
+                    calibration_dir=self.kwargs.get('calibration_dir')
+                )
+                self.cpu_profile.update(channels_last=False, compile='none')
+                logger.info(f"Using INT8 model: PSNR {self.int8_report['psnr_db']} dB vs fp32, "
+                            f"{self.int8_report['speedup']}x faster")
+            else:
+                eager_model = self.model_instance
+                self.model_instance = prepare_model(eager_model, self.cpu_profile)
+                if self.model_instance is eager_model:
+                    self.cpu_profile['compile'] = 'none'
+            self.channels_last = self.cpu_profile['channels_last']
     
-    def auto_tile_size(self) -> int:
-        """Calculate optimal tile size based on GPU memory."""
-        if self.tile > 0:
-            return self.tile
-        
+    def _run_batch(self, images: List[np.ndarray]) -> List[np.ndarray]:
+        """Run same-shaped images through the model as one NCHW batch."""
+        # The wrapper handles all color correction; gamma comes from the CLI
+        return upscale_images(
+            model=self.model_instance,
+            imgs=images,
+            device=self.device,
+            scale=self.scale,
+            gamma=self.kwargs.get('gamma', 1.0),
+            channels_last=self.channels_last
+        )
+    
+    def _release_memory(self) -> None:
+        """Free cached CUDA memory after an out-of-memory error."""
+        if self.device == 'cuda' and torch.cuda.is_available():
+            torch.cuda.empty_cache()
+    
+    def fork_shareable(self) -> bool:
+        """CPU weights can be shared with forked workers; a CUDA context cannot."""
+        return self.device == 'cpu'
+    
+    def _autotune_key(self) -> Tuple[Path, Dict[str, Any]]:
+        """Tuned tile sizes depend on the device, precision and CPU profile."""
+        dtype = 'fp16' if self.fp16 and self.device == 'cuda' else 'fp32'
+        signature = dict(hardware_signature(self.device, dtype), backend='torch')
+        if self.cpu_profile is not None:
+            signature.update(channels_last=self.channels_last, compile=self.cpu_profile['compile'],
+                             int8=self.int8_report is not None)
+        return self.model_manager.get_model_path(self.model), signature
+    
+    def _heuristic_tile_size(self) -> int:
+        """Calculate a tile size based on GPU memory."""
         if self.device == 'cpu':
             return 256  # Conservative for CPU
         
@@ -8,10 +8,14 @@ import torch.nn as nn
 import numpy as np
 import cv2
 import logging
+import contextlib
+import io
 from pathlib import Path
-from typing import Dict, Any
+from typing import Dict, Any, List
 
+from . import torch_only_flags
 from .base import BaseBackend
+from .autotune import autotune_tile, hardware_signature
 from ..models import ModelManager
 
 logger = logging.getLogger(__name__)
@@ -63,6 +67,11 @@ class TorchBackendOfficial(BaseBackend):
 
         logger.info(f"Initializing Official PyTorch backend (RealESRGANer) with device: {self.device}")
         
+        ignored = torch_only_flags(self.kwargs)
+        if ignored:
+            logger.warning(f"{', '.join(ignored)} only apply to --backend torch; "
+                           f"the official backend ignores them")
+        
         # Download model if needed
         model_path = self.model_manager.get_model_path(self.model)
         if not model_path.exists():
@@ -96,23 +105,25 @@ class TorchBackendOfficial(BaseBackend):
                 scale=scale
             )
 
-        # Determine tile size
-        tile_size = self.tile if self.tile > 0 else self.auto_tile_size()
-
         # 2. Initialize RealESRGANer
-        logger.info(f"Loading model {self.model} with scale {scale} using RealESRGANer. Tile size: {tile_size}")
+        logger.info(f"Loading model {self.model} with scale {scale} using RealESRGANer")
 
         self.upscaler = RealESRGANer(
             scale=scale,
             model_path=str(model_path),
             model=net,
-            tile=tile_size,
+            tile=self.tile,
             tile_pad=self.tile_overlap,
             pre_pad=10,  # Default padding
             half=self.fp16 and self.device == 'cuda',
             device=self.device
         )
         
+        # Determine tile size (benchmarked for this model and hardware with --tile 0)
+        self.upscaler.tile_size = self.auto_tile_size()
+        self.upscaler.tile_pad = self.tile_overlap
+        logger.info(f"Tile size: {self.upscaler.tile_size}, tile padding: {self.upscaler.tile_pad}")
+        
         # Optimization settings
         if self.device == 'cuda':
             torch.backends.cudnn.benchmark = True
@@ -127,37 +138,82 @@ class TorchBackendOfficial(BaseBackend):
             self._initialized = True
         
         # Official enhance method handles everything (tiling, data conversion, etc.)
-        # Input: BGR uint8, Output: BGR uint8
+        # Input: BGR uint8, Output: BGR uint8. Out-of-memory errors are retried
+        # with smaller tiles; any other failure is raised rather than hidden.
+        output = self._run_with_backoff(image, self.upscaler.tile_size, self._enhance)
+        logger.debug(f"Upscaled from {image.shape} to {output.shape}")
+        return output
+    
+    def _enhance(self, image: np.ndarray, tile_size: int) -> np.ndarray:
+        """Run RealESRGANer.enhance with the given tile size."""
+        self.upscaler.tile_size = tile_size
+        
+        # Suppress stdout to hide "Tile X/Y" messages
+        captured = io.StringIO()
+        failure = None
         try:
-            # Temporarily suppress stdout to hide "Tile X/Y" messages
-            import sys
-            import io
-            old_stdout = sys.stdout
-            sys.stdout = io.StringIO()
-            
-            try:
+            with contextlib.redirect_stdout(captured):
                 output, _ = self.upscaler.enhance(image, outscale=self.scale)
-            finally:
-                # Restore stdout
-                sys.stdout = old_stdout
-                
-            logger.debug(f"Upscaled from {image.shape} to {output.shape}")
-            return output
         except Exception as e:
-            logger.error(f"Error during inference with RealESRGANer: {e}")
-            # Return fallback image on failure
-            h, w = image.shape[:2]
-            return np.zeros((h * self.scale, w * self.scale, 3), dtype=np.uint8)
+            failure = e
+        
+        # tile_process prints per-tile inference errors and carries on with a
+        # stale (or missing) tile, so a reported error fails the whole image
+        errors = [line for line in captured.getvalue().splitlines() if line.startswith('Error')]
+        if errors:
+            raise RuntimeError(errors[0]) from failure
+        if failure is not None:
+            raise failure
+        
+        return output
+    
+    def _release_memory(self) -> None:
+        """Free cached CUDA memory after an out-of-memory error."""
+        if self.device == 'cuda' and torch.cuda.is_available():
+            torch.cuda.empty_cache()
     
-    def _upscale_tile(self, tile: np.ndarray) -> np.ndarray:
+    def _run_batch(self, images: List[np.ndarray]) -> List[np.ndarray]:
         """Required by base class but not used in official implementation"""
-        return self.upscale(tile)
+        return [self.upscale(image) for image in images]
+    
+    def fork_shareable(self) -> bool:
+        """CPU weights can be shared with forked workers; a CUDA context cannot."""
+        return self.device == 'cpu'
     
     def auto_tile_size(self) -> int:
-        """Calculate optimal tile size based on GPU memory."""
+        """Return the tile size benchmarked for this model and hardware (--tile 0)."""
         if self.tile > 0:
             return self.tile
         
+        if self._tuned_tile is None:
+            self._tuned_tile = self._autotune_tile()
+        return self._tuned_tile
+    
+    def _autotune_tile(self) -> int:
+        """Look up or measure the fastest RealESRGANer tile size; also adopts the tuned overlap."""
+        def run(image: np.ndarray, tile_size: int, tile_pad: int) -> np.ndarray:
+            self.upscaler.tile_size = tile_size
+            self.upscaler.tile_pad = tile_pad
+            # RealESRGANer prints "Tile X/Y" for every tile
+            with contextlib.redirect_stdout(io.StringIO()):
+                output, _ = self.upscaler.enhance(image, outscale=self.scale)
+            return output
+        
+        try:
+            dtype = 'fp16' if self.fp16 and self.device == 'cuda' else 'fp32'
+            tile, overlap = autotune_tile(
+                self.model_manager.get_model_path(self.model),
+                dict(hardware_signature(self.device, dtype), backend='official'),
+                lambda image: run(image, 0, self.tile_overlap), run
+            )
+            self.tile_overlap = overlap
+            return tile
+        except Exception as e:
+            logger.warning(f"Tile autotuning failed, using memory heuristics: {e}")
+            return self._heuristic_tile_size()
+    
+    def _heuristic_tile_size(self) -> int:
+        """Calculate a tile size based on GPU memory."""
         if self.device == 'cpu':
             return 512  # CPU can use larger tiles
         
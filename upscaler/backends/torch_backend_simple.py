@@ -9,6 +9,7 @@ import numpy as np
 import cv2
 import logging
 from pathlib import Path
+from typing import List
 
 from .base import BaseBackend
 from ..models import ModelManager
@@ -68,9 +69,9 @@ class SimpleTorchBackend(BaseBackend):
         
         return np.clip(result, 0, 255).astype(np.uint8)
     
-    def _upscale_tile(self, tile: np.ndarray) -> np.ndarray:
-        """Upscale a single tile."""
-        return self.upscale(tile)
+    def _run_batch(self, images: List[np.ndarray]) -> List[np.ndarray]:
+        """Upscale tiles one by one."""
+        return [self.upscale(image) for image in images]
     
     def get_memory_info(self):
         """Get memory info"""
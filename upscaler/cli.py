@@ -5,11 +5,35 @@ from pathlib import Path
 import json
 import logging
 
-from .backends import get_backend
+from .backends import get_backend, BACKENDS
+from .backends.cpu_profile import PROFILES, COMPILE_MODES
 from .models import ModelManager
 from .utils import setup_logging, get_video_info, validate_input
 
 
+def cpu_profile_options(func):
+    """CPU 실행 프로파일 옵션 (image/video/all 등 공통, --backend torch 전용)"""
+    options = [
+        click.option('--cpu-profile', type=click.Choice(list(PROFILES)),
+                     help='CPU 실행 프로파일 (기본: UPSCALER_CPU_PROFILE 환경변수 또는 default)'),
+        click.option('--threads', type=int,
+                     help='CPU intra-op 스레드 수 (프로파일 값 덮어쓰기)'),
+        click.option('--interop-threads', type=int,
+                     help='CPU inter-op 스레드 수 (프로파일 값 덮어쓰기)'),
+        click.option('--channels-last/--no-channels-last', default=None,
+                     help='CPU 추론 시 channels_last 메모리 형식 사용'),
+        click.option('--compile', 'compile_mode', type=click.Choice(list(COMPILE_MODES)),
+                     help='CPU 추론 모델 컴파일 방식 (freeze: TorchScript, compile: torch.compile)'),
+        click.option('--int8', is_flag=True,
+                     help='CPU에서 INT8 양자화 모델 사용 (첫 실행 시 보정 후 모델 캐시에 저장)'),
+        click.option('--calibration-dir', type=click.Path(exists=True, file_okay=False),
+                     help='INT8 보정에 사용할 샘플 이미지 폴더 (기본: 합성 이미지)'),
+    ]
+    for option in reversed(options):
+        func = option(func)
+    return func
+
+
 @click.group()
 @click.option('--verbose', '-v', is_flag=True, help='상세 로그 출력 활성화')
 @click.option('--debug', is_flag=True, help='디버그 로그 활성화')
@@ -22,16 +46,18 @@ def cli(verbose, debug):
 @cli.command()
 @click.argument('input_path', type=click.Path(exists=True))
 @click.argument('output_path', type=click.Path())
-@click.option('--backend', type=click.Choice(['auto', 'torch', 'ncnn']), default='auto',
+@click.option('--backend', type=click.Choice(['auto', *BACKENDS]), default='auto',
               help='업스케일링에 사용할 백엔드')
 @click.option('--model', default='realesr-general-x4v3',
               help='업스케일링에 사용할 모델')
 @click.option('--scale', type=int, default=4,
               help='업스케일링 배율')
 @click.option('--tile', type=int, default=0,
-              help='타일 크기 (0: 자동)')
-@click.option('--tile-overlap', type=int, default=32,
+              help='타일 크기 (0: 모델/하드웨어별 벤치마크로 자동 선택, 결과 캐시)')
+@click.option('--tile-overlap', type=int, default=16,
               help='타일 겹침 크기 (픽셀)')
+@click.option('--blend', type=click.Choice(['cosine', 'linear']), default='cosine',
+              help='타일 경계 블렌딩 방식')
 @click.option('--face-enhance', is_flag=True,
               help='GFPGAN으로 얼굴 향상 활성화')
 @click.option('--face-strength', type=float, default=1.0,
@@ -44,6 +70,9 @@ def cli(verbose, debug):
               help='원본 이미지의 색상 톤 유지 (히스토그램 매칭)')
 @click.option('--fp16', is_flag=True, default=True,
               help='반정밀도(FP16) 사용 - GPU 가속 (기본: 켜짐)')
+@click.option('--fuse/--no-fuse', default=None,
+              help='추론 전 SRVGGNetCompact 레이어 융합 (--backend torch 전용: 지정하면 auto도 torch 선택, 기본: torch에서 켜짐)')
+@cpu_profile_options
 @click.option('--progress', type=click.Choice(['bar', 'json']), default='bar',
               help='진행 상황 표시 형식')
 def image(input_path, output_path, **kwargs):
@@ -57,16 +86,18 @@ def image(input_path, output_path, **kwargs):
 @cli.command()
 @click.argument('input_path', type=click.Path())
 @click.argument('output_path', type=click.Path())
-@click.option('--backend', type=click.Choice(['auto', 'torch', 'ncnn']), default='auto',
+@click.option('--backend', type=click.Choice(['auto', *BACKENDS]), default='auto',
               help='업스케일링에 사용할 백엔드')
 @click.option('--model', default='realesr-general-x4v3',
               help='업스케일링에 사용할 모델')
 @click.option('--scale', type=int, default=4,
               help='업스케일링 배율')
 @click.option('--tile', type=int, default=0,
-              help='타일 크기 (0: 자동)')
-@click.option('--tile-overlap', type=int, default=32,
+              help='타일 크기 (0: 모델/하드웨어별 벤치마크로 자동 선택, 결과 캐시)')
+@click.option('--tile-overlap', type=int, default=16,
               help='타일 겹침 크기 (픽셀)')
+@click.option('--blend', type=click.Choice(['cosine', 'linear']), default='cosine',
+              help='타일 경계 블렌딩 방식')
 @click.option('--face-enhance', is_flag=True,
               help='GFPGAN으로 얼굴 향상 활성화')
 @click.option('--face-strength', type=float, default=1.0,
@@ -79,6 +110,8 @@ def image(input_path, output_path, **kwargs):
               help='원본 이미지의 색상 톤 유지 (히스토그램 매칭)')
 @click.option('--fp16', is_flag=True, default=True,
               help='반정밀도(FP16) 사용 - GPU 가속 (기본: 켜짐)')
+@click.option('--fuse/--no-fuse', default=None,
+              help='추론 전 SRVGGNetCompact 레이어 융합 (--backend torch 전용: 지정하면 auto도 torch 선택, 기본: torch에서 켜짐)')
 @click.option('--stdin', is_flag=True,
               help='표준 입력에서 읽기 (yuv4mpeg 형식)')
 @click.option('--stdout', is_flag=True,
@@ -87,6 +120,23 @@ def image(input_path, output_path, **kwargs):
               help='입력에서 출력으로 오디오 복사')
 @click.option('--fps', type=float,
               help='출력 FPS (지정하지 않으면 자동 감지)')
+@click.option('--stream/--no-stream', default=True,
+              help='중간 Y4M 파일 없이 ffmpeg 파이프로 디코딩/인코딩 (기본: 켜짐)')
+@click.option('--queue-depth', type=int, default=4,
+              help='디코딩/변환/추론/인코딩 단계 사이 대기 프레임 수 (메모리 상한)')
+@click.option('--batch-size', type=int,
+              help='한 번에 추론할 프레임/타일 수 (기본: 1, ncnn은 바이너리 실행당 16 프레임)')
+@click.option('--dedup/--no-dedup', default=True,
+              help='이전 프레임과 동일한 프레임은 업스케일 결과 재사용 (기본: 켜짐)')
+@click.option('--tile-reuse-tolerance', type=int, default=0,
+              help='이전 프레임 대비 픽셀 차이가 이 값 이하인 타일은 결과 재사용 (0: 완전 일치만, -1: 끄기)')
+@click.option('--resume-dir', type=click.Path(file_okay=False),
+              help='재개 가능한 작업 폴더 (세그먼트 단위로 저장, 중단 후 같은 옵션으로 재실행하면 이어서 처리)')
+@click.option('--segment-frames', type=int, default=600,
+              help='--resume-dir 사용 시 세그먼트당 프레임 수')
+@click.option('--workers', type=int, default=1,
+              help='키프레임 단위 세그먼트를 병렬 처리할 워커 프로세스 수 (각 워커가 모델을 로드)')
+@cpu_profile_options
 @click.option('--progress', type=click.Choice(['bar', 'json']), default='bar',
               help='진행 상황 표시 형식')
 def video(input_path, output_path, stdin, stdout, **kwargs):
@@ -108,28 +158,67 @@ def video(input_path, output_path, stdin, stdout, **kwargs):
 @cli.command()
 @click.option('--list', 'list_models', is_flag=True,
               help='사용 가능한 모델 목록 표시')
-@click.option('--download', help='특정 모델 다운로드')
+@click.option('--download', help='특정 모델 다운로드 (중단된 다운로드는 이어서 받음)')
+@click.option('--connections', type=int, default=4, show_default=True,
+              help='다운로드에 사용할 병렬 연결 수 (HTTP Range 요청)')
 @click.option('--check', help='모델 사용 가능 여부 확인')
-def models(list_models, download, check):
+@click.option('--quantize', help='모델을 INT8로 양자화하여 캐시에 저장 (CPU)')
+@click.option('--calibration-dir', type=click.Path(exists=True, file_okay=False),
+              help='INT8 보정에 사용할 샘플 이미지 폴더 (기본: 합성 이미지)')
+@click.option('--export-onnx', help='모델을 ONNX로 내보내기 (--backend onnx 용)')
+@click.option('--onnx-output', type=click.Path(dir_okay=False),
+              help='ONNX 출력 파일 경로 (기본: 모델 캐시의 <모델>.onnx)')
+@click.option('--opset', type=int, default=17, show_default=True,
+              help='ONNX opset 버전')
+def models(list_models, download, connections, check, quantize, calibration_dir, export_onnx, onnx_output, opset):
     """업스케일링 모델 관리"""
     manager = ModelManager()
     
     if list_models:
-        models = manager.list_available_models()
+        models = manager.list_models()
         click.echo("사용 가능한 모델:")
         for model_name, info in models.items():
-            status = "✓" if manager.is_model_available(model_name) else "✗"
+            status = "✓" if info['downloaded'] else "✗"
             click.echo(f"  {status} {model_name}: {info.get('description', '설명 없음')}")
     
     if download:
         click.echo(f"모델 다운로드 중: {download}")
-        manager.download_model(download)
+        manager.download_model(download, connections=connections)
         click.echo("다운로드 완료")
     
     if check:
-        available = manager.is_model_available(check)
+        available = check in manager.models and manager.is_model_downloaded(check)
         status = "사용 가능" if available else "사용 불가"
         click.echo(f"모델 {check}: {status}")
+    
+    if quantize:
+        from .backends.quantization import get_quantized_model, quantized_model_path
+        from .backends.realesrgan_wrapper_improved import load_realesrgan_model
+        
+        model_path = manager.get_model_path(quantize)
+        if not model_path.exists():
+            manager.download_model(quantize)
+        
+        scale = manager.models.get(quantize, {}).get('scale', 4)
+        model = load_realesrgan_model(str(model_path), device='cpu', scale=scale)
+        click.echo(f"INT8 양자화 중: {quantize}")
+        _, report = get_quantized_model(model, model_path, calibration_dir=calibration_dir, force=True)
+        click.echo(f"저장 위치: {quantized_model_path(model_path)}")
+        click.echo(f"PSNR (fp32 대비): {report['psnr_db']} dB")
+        click.echo(f"속도: fp32 {report['fp32_seconds']}s → int8 {report['int8_seconds']}s "
+                   f"({report['speedup']}x)")
+    
+    if export_onnx:
+        from .backends.onnx_backend import export_onnx as export_model
+        
+        model_path = manager.get_model_path(export_onnx)
+        if not model_path.exists():
+            manager.download_model(export_onnx)
+        
+        scale = manager.models.get(export_onnx, {}).get('scale', 4)
+        click.echo(f"ONNX 내보내기 중: {export_onnx}")
+        path = export_model(model_path, onnx_output, scale=scale, opset=opset)
+        click.echo(f"저장 위치: {path}")
 
 
 @cli.command()
@@ -137,12 +226,23 @@ def models(list_models, download, check):
               help='처리할 파일 타입 (기본: all)')
 @click.option('--output', type=click.Path(), default='./output',
               help='출력 폴더 경로 (기본: ./output)')
-@click.option('--backend', type=click.Choice(['auto', 'torch', 'ncnn']), default='auto',
+@click.option('--backend', type=click.Choice(['auto', *BACKENDS]), default='auto',
               help='업스케일링에 사용할 백엔드')
 @click.option('--model', default='realesr-general-x4v3',
               help='업스케일링에 사용할 모델')
 @click.option('--scale', type=int, default=4,
               help='업스케일링 배율')
+@click.option('--tile', type=int, default=0,
+              help='타일 크기 (0: 모델/하드웨어별 벤치마크로 자동 선택, 결과 캐시)')
+@click.option('--tile-overlap', type=int, default=16,
+              help='타일 겹침 크기 (픽셀)')
+@click.option('--blend', type=click.Choice(['cosine', 'linear']), default='cosine',
+              help='타일 경계 블렌딩 방식')
+@click.option('--fp16', is_flag=True, default=True,
+              help='반정밀도(FP16) 사용 - GPU 가속 (기본: 켜짐)')
+@click.option('--fuse/--no-fuse', default=None,
+              help='추론 전 SRVGGNetCompact 레이어 융합 (--backend torch 전용: 지정하면 auto도 torch 선택, 기본: torch에서 켜짐)')
+@cpu_profile_options
 @click.option('--recursive', is_flag=True,
               help='하위 폴더도 포함하여 처리')
 @click.option('--pattern', default='*',
@@ -151,11 +251,23 @@ def models(list_models, download, check):
               help='이미 처리된 파일 건너뛰기')
 @click.option('--dry-run', is_flag=True,
               help='실제 처리하지 않고 대상 파일만 표시')
-def all(type, output, recursive, pattern, skip_existing, dry_run, **kwargs):
+@click.option('--jobs', type=int, default=1,
+              help='이미지를 병렬 처리할 워커 프로세스 수 (CPU에서는 모델 가중치를 공유)')
+@click.option('--distributed', 'lease_dir', type=click.Path(file_okay=False), default=None,
+              help='여러 호스트/프로세스가 공유하는 분배 디렉터리 (리스 파일로 파일을 나눠 처리)')
+@click.option('--lease-ttl', type=float, default=120.0,
+              help='리스 만료 시간(초): 이 시간 동안 하트비트가 없는 워커의 파일은 다른 워커가 가져감 (기본: 120)')
+@click.option('--worker-id', default=None,
+              help='분배 모드에서 이 워커의 이름 (기본: 호스트명-PID)')
+def all(type, output, recursive, pattern, skip_existing, dry_run, jobs, lease_dir, lease_ttl, worker_id, **kwargs):
     """현재 폴더의 모든 미디어 파일 업스케일링"""
     import os
+    import time
+    from contextlib import nullcontext
     from pathlib import Path
+    from .backends.session import BackendSession
     from .processors import ImageProcessor, VideoProcessor
+    from .processors.image_pool import run_image_pool
     from .utils.display_utils import create_progress, console, make_video_info_panel
     from .utils.video import get_video_info
     from rich.panel import Panel
@@ -252,6 +364,29 @@ def all(type, output, recursive, pattern, skip_existing, dry_run, **kwargs):
         console.print(f"[yellow]Logo display error: {e}[/yellow]")
     console.print(Panel(f"🚀 {len(target_files)}개 파일 업스케일링 시작!", style="bold green"))
     
+    # --distributed: 공유 디렉터리의 리스 파일로 다른 워커와 파일을 나눠 처리
+    leases = None
+    if lease_dir:
+        from .jobqueue import partial_path
+        from .leases import LeaseDir
+        
+        def remove_dead_partial(name, lease):
+            # 죽은 워커가 쓰다 만 임시 파일 삭제
+            if lease.get('pid'):
+                partial_path(output_dir / name, lease['pid']).unlink(missing_ok=True)
+        
+        leases = LeaseDir(Path(lease_dir) if Path(lease_dir).is_absolute() else current_dir / lease_dir,
+                          worker_id=worker_id, ttl=lease_ttl, on_reclaim=remove_dead_partial)
+        console.print(f"[cyan]ℹ️ 분배 모드: 워커 {leases.worker_id} ({leases.root})[/cyan]")
+        if jobs > 1:
+            # 파일 단위로 리스를 잡으므로 병렬 처리는 워커 프로세스를 여러 개 실행해서 함
+            console.print("[yellow]⚠️ 분배 모드에서는 --jobs 대신 같은 --distributed 디렉터리로 여러 프로세스를 실행하세요[/yellow]")
+            jobs = 1
+    
+    def lease_name(output_file):
+        # 호스트마다 마운트 위치가 달라도 같은 이름이 되도록 출력 폴더 기준 상대 경로 사용
+        return output_file.relative_to(output_dir).as_posix()
+    
     success_count = 0
     error_count = 0
     processed_frames = 0
@@ -266,11 +401,61 @@ def all(type, output, recursive, pattern, skip_existing, dry_run, **kwargs):
     )
     group = Group(placeholder, progress)  # 패널을 위로, Progress를 아래로
     
-    with Live(group, console=console, auto_refresh=False) as live:
+    # 모델은 배치 전체에서 한 번만 로드하고 파일 간에 재사용
+    with Live(group, console=console, auto_refresh=False) as live, BackendSession() as session, \
+            (leases if leases is not None else nullcontext()):
         # Total Progress는 전체 프레임 수로 설정
         task = progress.add_task(f"[cyan]🚀 Total Progress", total=total_frames)
         
-        for i, ((input_file, output_file, is_video), frame_count) in enumerate(zip(target_files, file_frame_counts), 1):
+        queued = list(enumerate(zip(target_files, file_frame_counts), 1))
+        
+        if leases is not None:
+            # 다른 워커가 끝낸 파일은 진행률만 채우고, 다른 워커가 잡고 있는 파일은 끝나거나 리스가 만료될 때까지 대기
+            def on_claimed_elsewhere(item):
+                nonlocal processed_frames
+                processed_frames += item[1][1]
+                progress.update(task, completed=processed_frames)
+                live.refresh()
+            
+            queued = leases.claim_each(queued, lambda item: lease_name(item[1][0][1]), on_claimed_elsewhere)
+        
+        # --jobs: 이미지는 워커 프로세스 풀에서 병렬 처리하고, 비디오는 아래에서 순서대로 처리
+        pooled = [item for item in queued if not item[1][0][2]] if jobs > 1 else []
+        if pooled:
+            queued = [item for item in queued if item[1][0][2]]
+            image_task = progress.add_task(f"🖼️ Upscaling {len(pooled)} images ({jobs} workers)", total=len(pooled))
+            finished = set()
+            
+            def on_image_done(index, error):
+                nonlocal success_count, error_count, processed_frames
+                finished.add(index)
+                if error is None:
+                    success_count += 1
+                else:
+                    error_count += 1
+                    console.print(f"[red]❌ 오류 발생: {pooled[index][1][0][0]} - {error}[/red]")
+                processed_frames += 1
+                progress.update(image_task, advance=1)
+                progress.update(task, completed=processed_frames)
+                live.refresh()
+            
+            try:
+                run_image_pool(
+                    [(str(input_file), str(output_file)) for _, ((input_file, output_file, _), _) in pooled],
+                    kwargs, jobs, session=session, on_done=on_image_done
+                )
+            except Exception as e:
+                # 워커가 비정상 종료되면 남은 이미지는 실패로 처리
+                unfinished = len(pooled) - len(finished)
+                error_count += unfinished
+                processed_frames += unfinished
+                console.print(f"[red]❌ 이미지 워커 오류: {str(e)}[/red]")
+                progress.update(task, completed=processed_frames)
+            
+            progress.update(image_task, visible=False)
+            live.refresh()
+        
+        for i, ((input_file, output_file, is_video), frame_count) in queued:
             try:
                 # 출력 파일의 디렉토리 생성
                 output_file.parent.mkdir(parents=True, exist_ok=True)
@@ -307,6 +492,7 @@ def all(type, output, recursive, pattern, skip_existing, dry_run, **kwargs):
                         total_frames=total_frames,
                         file_index=i,
                         total_files=len(target_files),
+                        session=session,
                         **kwargs
                     )
                 else:
@@ -319,15 +505,29 @@ def all(type, output, recursive, pattern, skip_existing, dry_run, **kwargs):
                         total_frames=total_frames,
                         file_index=i,
                         total_files=len(target_files),
+                        session=session,
                         **kwargs
                     )
                 
-                processor.process(str(input_file), str(output_file))
+                if leases is not None:
+                    # 다른 워커가 중간 결과를 보지 않도록 임시 파일에 쓰고 완성되면 이름 변경
+                    started = time.time()
+                    partial_file = partial_path(output_file)
+                    try:
+                        processor.process(str(input_file), str(partial_file))
+                        os.replace(partial_file, output_file)
+                    finally:
+                        partial_file.unlink(missing_ok=True)
+                    leases.complete(lease_name(output_file), frame_count, time.time() - started)
+                else:
+                    processor.process(str(input_file), str(output_file))
                 success_count += 1
                 processed_frames += frame_count
                 
             except Exception as e:
                 error_count += 1
+                if leases is not None:
+                    leases.fail(lease_name(output_file), f"{type(e).__name__}: {e}")
                 console.print(f"[red]❌ 오류 발생: {input_file} - {str(e)}[/red]")
                 # 에러 발생 시에도 프레임 수는 증가시켜 전체 진행률 유지
                 processed_frames += frame_count
@@ -345,6 +545,328 @@ def all(type, output, recursive, pattern, skip_existing, dry_run, **kwargs):
         title="🎉 배치 처리 완료!",
         style="bold green" if error_count == 0 else "bold yellow"
     ))
+    
+    if leases is not None:
+        show_worker_report(leases, console)
+
+
+def show_worker_report(leases, console):
+    """분배 모드에 참여한 워커별 처리량 표시"""
+    import time
+    from rich.table import Table
+    
+    table = Table(title="👷 워커별 처리량")
+    for column in ("Worker", "Files", "Failed", "Frames", "Busy", "FPS", "Reclaimed", "State"):
+        table.add_column(column)
+    for stats in leases.workers():
+        if stats['finished']:
+            state = "finished"
+        elif time.time() - stats['updated'] <= leases.ttl:
+            state = "running"
+        else:
+            state = "lost"
+        fps = stats['frames'] / stats['seconds'] if stats['seconds'] else 0.0
+        table.add_row(
+            stats['worker'] + (" (this)" if stats['worker'] == leases.worker_id else ""),
+            str(stats['files']), str(stats['failed']), str(stats['frames']),
+            f"{stats['seconds']:.1f}s", f"{fps:.2f}", str(stats['reclaimed']), state
+        )
+    console.print(table)
+
+
+def default_jobs_db() -> str:
+    """기본 작업 DB 경로 (원래 실행 디렉토리 기준)"""
+    from .jobqueue import DEFAULT_DB_NAME
+    return str(Path(os.environ.get('UPSCALER_ORIGINAL_DIR', '.')) / DEFAULT_DB_NAME)
+
+
+@cli.group()
+@click.option('--db', type=click.Path(dir_okay=False), default=None,
+              help='작업 큐 SQLite 파일 (기본: ./upscale-jobs.db)')
+@click.pass_context
+def jobs(ctx, db):
+    """중단 후 이어서 실행할 수 있는 영구 작업 큐"""
+    ctx.obj = {'db': db or default_jobs_db()}
+
+
+@jobs.command('submit')
+@click.argument('paths', nargs=-1, required=True, type=click.Path(exists=True))
+@click.option('--output', type=click.Path(file_okay=False), default='./output',
+              help='출력 폴더 경로 (기본: ./output)')
+@click.option('--type', 'media_type', type=click.Choice(['all', 'image', 'video']), default='all',
+              help='추가할 파일 타입 (기본: all)')
+@click.option('--recursive', is_flag=True,
+              help='하위 폴더도 포함')
+@click.option('--pattern', default='*',
+              help='폴더 안에서 찾을 파일명 패턴 (예: *.mp4, DSC*.jpg)')
+@click.option('--backend', type=click.Choice(['auto', *BACKENDS]), default='auto',
+              help='업스케일링에 사용할 백엔드')
+@click.option('--model', default='realesr-general-x4v3',
+              help='업스케일링에 사용할 모델')
+@click.option('--scale', type=int, default=4,
+              help='업스케일링 배율')
+@click.option('--tile', type=int, default=0,
+              help='타일 크기 (0: 자동)')
+@click.option('--fp16', is_flag=True, default=True,
+              help='반정밀도(FP16) 사용 - GPU 가속 (기본: 켜짐)')
+@click.option('--fuse/--no-fuse', default=None,
+              help='추론 전 SRVGGNetCompact 레이어 융합 (--backend torch 전용: 지정하면 auto도 torch 선택, 기본: torch에서 켜짐)')
+@cpu_profile_options
+@click.pass_obj
+def jobs_submit(obj, paths, output, media_type, recursive, pattern, **options):
+    """파일 또는 폴더의 미디어 파일을 작업 큐에 추가"""
+    from .jobqueue import JobQueue, IMAGE_EXTENSIONS, VIDEO_EXTENSIONS
+    
+    extensions = {'image': IMAGE_EXTENSIONS, 'video': VIDEO_EXTENSIONS}.get(media_type, IMAGE_EXTENSIONS | VIDEO_EXTENSIONS)
+    base_dir = Path(os.environ.get('UPSCALER_ORIGINAL_DIR', '.'))
+    output_dir = Path(output) if Path(output).is_absolute() else base_dir / output
+    
+    # 폴더는 패턴으로 검색, 파일은 그대로 추가 (하위 폴더 구조는 출력 폴더에 유지)
+    files = []
+    for path in paths:
+        path = Path(path) if Path(path).is_absolute() else base_dir / path
+        if path.is_dir():
+            found = path.rglob(pattern) if recursive else path.glob(pattern)
+            files.extend((file, file.parent.relative_to(path)) for file in sorted(found) if file.is_file())
+        else:
+            files.append((path, Path('.')))
+    
+    added = skipped = 0
+    with JobQueue(obj['db']) as queue:
+        for file, relative_dir in files:
+            suffix = file.suffix.lower()
+            if suffix not in extensions:
+                continue
+            output_file = output_dir / relative_dir / f"{file.stem}_upscaled{file.suffix}"
+            job_type = 'video' if suffix in VIDEO_EXTENSIONS else 'image'
+            if queue.submit(job_type, str(file), str(output_file), options):
+                added += 1
+            else:
+                skipped += 1
+    
+    click.echo(f"{added}개 작업 추가" + (f", {skipped}개는 이미 큐에 있음" if skipped else "") + f" ({obj['db']})")
+
+
+@jobs.command('run')
+@click.option('--limit', type=int, default=0,
+              help='처리할 최대 작업 수 (0: 대기 중인 작업 모두)')
+@click.pass_obj
+def jobs_run(obj, limit):
+    """대기 중인 작업을 순서대로 처리 (중단된 지점부터 이어서)"""
+    from rich.console import Console
+    from .backends.session import BackendSession
+    from .jobqueue import JobQueue, run_job
+    from .utils.display_utils import create_progress
+    
+    console = Console()
+    done = failed = 0
+    
+    with JobQueue(obj['db']) as queue:
+        recovered = queue.recover()
+        if recovered:
+            console.print(f"[yellow]중단된 작업 {recovered}개를 다시 대기열에 넣었습니다[/yellow]")
+        
+        total = queue.counts()['pending']
+        if limit:
+            total = min(total, limit)
+        if not total:
+            console.print("[cyan]대기 중인 작업이 없습니다[/cyan]")
+            return
+        
+        progress = create_progress()
+        with progress, BackendSession() as session:
+            task = progress.add_task("🚀 Jobs", total=total)
+            frames_task = progress.add_task("🎬 Frames", total=None, visible=False)
+            
+            def on_frames(frames, frame_total):
+                progress.update(frames_task, completed=frames, total=frame_total or None, visible=True)
+            
+            while done + failed < total:
+                job = queue.claim()
+                if job is None:
+                    break
+                progress.update(task, description=f"🚀 #{job['id']} {Path(job['input']).name}")
+                progress.update(frames_task, completed=0, visible=False)
+                try:
+                    result = run_job(job, session, on_frames)
+                except KeyboardInterrupt:
+                    queue.release(job['id'])
+                    progress.stop()
+                    console.print(f"[yellow]중단됨: 작업 #{job['id']}은 다음 실행에서 다시 처리됩니다[/yellow]")
+                    sys.exit(130)
+                except Exception as e:
+                    queue.fail(job['id'], f"{type(e).__name__}: {e}")
+                    failed += 1
+                    progress.console.print(f"[red]❌ 작업 #{job['id']} 실패: {job['input']} - {e}[/red]")
+                else:
+                    queue.complete(job['id'], result['output_size'], result['output_sha256'])
+                    done += 1
+                progress.advance(task)
+    
+    console.print(f"✅ 완료: {done}개 성공, {failed}개 실패")
+    if failed:
+        sys.exit(1)
+
+
+@jobs.command('status')
+@click.option('--verify', is_flag=True,
+              help='완료된 출력 파일의 체크섬을 확인하고, 없거나 달라진 파일은 다시 대기열에 넣기')
+@click.option('--all', 'show_all', is_flag=True,
+              help='모든 작업 목록 표시 (기본: 실패한 작업만)')
+@click.pass_obj
+def jobs_status(obj, verify, show_all):
+    """작업 큐 상태 표시"""
+    from rich.console import Console
+    from rich.table import Table
+    from .jobqueue import JobQueue
+    
+    console = Console()
+    if not Path(obj['db']).exists():
+        console.print(f"[yellow]작업 큐가 없습니다: {obj['db']}[/yellow]")
+        return
+    
+    with JobQueue(obj['db']) as queue:
+        if verify:
+            broken = queue.verify()
+            for job in broken:
+                console.print(f"[yellow]출력 손상 또는 없음, 다시 대기: #{job['id']} {job['output']}[/yellow]")
+            console.print(f"체크섬 확인 완료 ({len(broken)}개 다시 대기)")
+        
+        counts = queue.counts()
+        console.print(" • ".join(f"{status}: {count}" for status, count in counts.items()))
+        
+        listed = queue.jobs() if show_all else queue.jobs('failed')
+        if not listed:
+            return
+        
+        table = Table()
+        for column in ("ID", "Status", "Try", "Time", "Input", "Error"):
+            table.add_column(column)
+        for job in listed:
+            table.add_row(
+                str(job['id']), job['status'], str(job['attempts']),
+                f"{job['seconds']:.1f}s" if job['seconds'] is not None else "",
+                Path(job['input']).name, job['error'] or ""
+            )
+        console.print(table)
+
+
+@jobs.command('retry')
+@click.argument('job_ids', nargs=-1, type=int)
+@click.pass_obj
+def jobs_retry(obj, job_ids):
+    """실패한 작업(또는 지정한 작업)을 다시 대기열에 넣기"""
+    from .jobqueue import JobQueue
+    
+    with JobQueue(obj['db']) as queue:
+        count = queue.retry(list(job_ids) or None)
+    click.echo(f"{count}개 작업을 다시 대기열에 넣었습니다")
+
+
+@cli.command()
+@click.option('--host', default='127.0.0.1',
+              help='HTTP 서버 주소 (기본: 127.0.0.1, 로컬 전용)')
+@click.option('--port', type=int, default=8765,
+              help='HTTP 서버 포트')
+@click.option('--socket', 'socket_path', type=click.Path(),
+              help='TCP 대신 이 Unix 소켓에서 HTTP 요청 대기')
+@click.option('--backend', type=click.Choice(['auto', *BACKENDS]), default='auto',
+              help='업스케일링에 사용할 기본 백엔드')
+@click.option('--model', default='realesr-general-x4v3',
+              help='기본 모델 (요청마다 options로 변경 가능)')
+@click.option('--scale', type=int, default=4,
+              help='기본 업스케일링 배율')
+@click.option('--tile', type=int, default=0,
+              help='타일 크기 (0: 자동)')
+@click.option('--fp16', is_flag=True, default=True,
+              help='반정밀도(FP16) 사용 - GPU 가속 (기본: 켜짐)')
+@click.option('--fuse/--no-fuse', default=None,
+              help='추론 전 SRVGGNetCompact 레이어 융합 (--backend torch 전용: 지정하면 auto도 torch 선택, 기본: torch에서 켜짐)')
+@cpu_profile_options
+@click.option('--warm', 'warm_models', multiple=True,
+              help='시작 시 기본 모델과 함께 미리 로드할 모델 (여러 번 지정 가능)')
+@click.option('--max-backends', type=int, default=None,
+              help='동시에 메모리에 유지할 백엔드 수 (초과 시 가장 오래 쓰지 않은 것 해제, 기본: 4)')
+def serve(host, port, socket_path, warm_models, max_backends, **kwargs):
+    """모델을 메모리에 유지하는 로컬 업스케일링 서버 실행"""
+    import socket
+    from .server import DEFAULT_MAX_BACKENDS, UpscaleService, create_server
+    
+    if max_backends is not None and max_backends < 1:
+        click.echo("오류: --max-backends는 1 이상이어야 합니다", err=True)
+        sys.exit(1)
+    
+    if socket_path and not hasattr(socket, 'AF_UNIX'):
+        click.echo("오류: 이 플랫폼은 Unix 소켓을 지원하지 않습니다", err=True)
+        sys.exit(1)
+    
+    # Preloaded models must not evict each other
+    service = UpscaleService(kwargs, max(max_backends or DEFAULT_MAX_BACKENDS, 1 + len(warm_models)))
+    click.echo("모델 로드 중...")
+    for model in (kwargs['model'], *warm_models):
+        service.warm(model=model)
+    service.start()
+    
+    server = create_server(service, host, port, socket_path)
+    address = socket_path or f"http://{host}:{server.server_address[1]}"
+    click.echo(f"업스케일링 서버 대기 중: {address} (종료: Ctrl+C)")
+    try:
+        server.serve_forever()
+    except KeyboardInterrupt:
+        pass
+    finally:
+        server.server_close()
+        service.stop()
+        if socket_path and os.path.exists(socket_path):
+            os.unlink(socket_path)
+
+
+@cli.command()
+@click.option('--model', default='realesr-general-x4v3',
+              help='벤치마크할 모델')
+@click.option('--scale', type=int, default=4,
+              help='업스케일링 배율')
+@click.option('--size', type=int, default=256,
+              help='합성 입력 이미지 크기 (정사각형, 픽셀)')
+@click.option('--frames', type=int, default=10,
+              help='프로파일당 측정 프레임 수')
+@click.option('--profiles', default=','.join(PROFILES),
+              help='측정할 CPU 프로파일 목록 (쉼표로 구분)')
+def benchmark(model, scale, size, frames, profiles):
+    """CPU 실행 프로파일별 처리량 측정"""
+    from rich.console import Console
+    from rich.table import Table
+    from .backends.cpu_profile import benchmark_profiles
+    
+    names = [name.strip() for name in profiles.split(',') if name.strip()]
+    unknown = [name for name in names if name not in PROFILES]
+    if unknown:
+        click.echo(f"오류: 알 수 없는 프로파일: {', '.join(unknown)}", err=True)
+        sys.exit(1)
+    
+    console = Console()
+    with console.status(f"[cyan]{len(names)}개 프로파일 측정 중 ({size}×{size}, {frames} 프레임)..."):
+        results = benchmark_profiles(model, names, size, frames, scale)
+    
+    table = Table(title=f"CPU 프로파일 벤치마크 - {model} ({size}×{size})")
+    table.add_column("Profile", style="cyan")
+    table.add_column("FPS", justify="right")
+    table.add_column("Threads", justify="right")
+    table.add_column("Compile")
+    table.add_column("Warm-up", justify="right")
+    
+    for result in results:
+        if 'error' in result:
+            table.add_row(result['profile'], "[red]실패[/red]", "", "", result['error'])
+        else:
+            table.add_row(
+                result['profile'],
+                f"{result['fps']:.2f}",
+                f"{result['threads']}/{result['interop_threads']}",
+                result['compile'],
+                f"{result['warmup']:.2f}s"
+            )
+    console.print(table)
 
 
 @cli.command()
@@ -182,12 +182,11 @@ class SystemDiagnostics:
             from .models import ModelManager
             
             manager = ModelManager()
-            models = manager.list_available_models()
+            models = manager.list_models()
             
             model_info = {}
-            for model_name in models:
-                available = manager.is_model_available(model_name)
-                model_info[model_name] = 'Downloaded' if available else 'Not downloaded'
+            for model_name, info in models.items():
+                model_info[model_name] = 'Downloaded' if info['downloaded'] else 'Not downloaded'
             
             # Check cache directory
             cache_size = self._get_cache_size(manager.cache_dir)
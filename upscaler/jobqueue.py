@@ -0,0 +1,286 @@
+"""
+Persistent job queue for restartable batch runs.
+
+Jobs live in a local SQLite database: input, output, options, status,
+attempts, timings and the SHA-256 of the committed output. A job is only
+marked done after its output has been written to a temporary file next to
+the destination and renamed into place, so a crash or Ctrl-C never leaves
+a half-written file under the final name, and the next run picks up every
+job that did not finish.
+
+Statuses: pending -> running -> done | failed. Jobs left running by a
+process that no longer exists go back to pending when a run starts.
+"""
+
+import hashlib
+import json
+import logging
+import os
+import socket
+import sqlite3
+import time
+from contextlib import contextmanager
+from pathlib import Path
+from typing import Any, Callable, Dict, List, Optional
+
+
+logger = logging.getLogger(__name__)
+
+DEFAULT_DB_NAME = 'upscale-jobs.db'
+SCHEMA_VERSION = 1
+
+_SCHEMA = """
+CREATE TABLE IF NOT EXISTS jobs (
+    id INTEGER PRIMARY KEY AUTOINCREMENT,
+    type TEXT NOT NULL,
+    input TEXT NOT NULL,
+    output TEXT NOT NULL UNIQUE,
+    options TEXT NOT NULL,
+    status TEXT NOT NULL DEFAULT 'pending',
+    attempts INTEGER NOT NULL DEFAULT 0,
+    error TEXT,
+    worker TEXT,
+    submitted REAL NOT NULL,
+    started REAL,
+    finished REAL,
+    seconds REAL,
+    output_size INTEGER,
+    output_sha256 TEXT
+);
+CREATE INDEX IF NOT EXISTS jobs_status ON jobs (status, id);
+CREATE TABLE IF NOT EXISTS meta (key TEXT PRIMARY KEY, value TEXT NOT NULL);
+"""
+
+STATUSES = ('pending', 'running', 'done', 'failed')
+
+IMAGE_EXTENSIONS = {'.jpg', '.jpeg', '.png', '.bmp', '.webp', '.tiff', '.tif'}
+VIDEO_EXTENSIONS = {'.mp4', '.avi', '.mov', '.mkv', '.webm', '.flv', '.wmv'}
+
+
+def file_sha256(path: Path) -> str:
+    digest = hashlib.sha256()
+    with open(path, 'rb') as f:
+        for chunk in iter(lambda: f.read(1 << 20), b''):
+            digest.update(chunk)
+    return digest.hexdigest()
+
+
+def _pid_alive(pid: int) -> bool:
+    try:
+        os.kill(pid, 0)
+    except ProcessLookupError:
+        return False
+    except (PermissionError, OSError):
+        # Exists but belongs to someone else, or the platform cannot tell
+        return True
+    return True
+
+
+class JobQueue:
+    """SQLite-backed queue of upscaling jobs."""
+
+    def __init__(self, db_path: Path):
+        self.db_path = Path(db_path)
+        self.worker = f"{socket.gethostname()}:{os.getpid()}"
+        self._conn = sqlite3.connect(str(self.db_path), timeout=30, isolation_level=None)
+        self._conn.row_factory = sqlite3.Row
+        # WAL lets status queries read while a run is writing
+        self._conn.execute('PRAGMA journal_mode=WAL')
+        self._conn.executescript(_SCHEMA)
+        self._conn.execute("INSERT OR IGNORE INTO meta (key, value) VALUES ('schema_version', ?)",
+                           (str(SCHEMA_VERSION),))
+
+    def close(self) -> None:
+        self._conn.close()
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, exc_type, exc_val, exc_tb):
+        self.close()
+
+    @contextmanager
+    def _transaction(self):
+        """Write transaction that takes the lock up front, so two runners never claim the same job."""
+        self._conn.execute('BEGIN IMMEDIATE')
+        try:
+            yield self._conn
+        except BaseException:
+            self._conn.execute('ROLLBACK')
+            raise
+        self._conn.execute('COMMIT')
+
+    def submit(self, job_type: str, input_path: str, output_path: str, options: Dict[str, Any]) -> bool:
+        """Add a job; False if a job already writes output_path."""
+        with self._transaction() as conn:
+            cursor = conn.execute(
+                "INSERT OR IGNORE INTO jobs (type, input, output, options, submitted) VALUES (?, ?, ?, ?, ?)",
+                (job_type, str(Path(input_path).absolute()), str(Path(output_path).absolute()),
+                 json.dumps(options, sort_keys=True), time.time())
+            )
+            return cursor.rowcount == 1
+
+    def recover(self) -> int:
+        """Return jobs left running by dead processes on this host to pending."""
+        host = socket.gethostname()
+        recovered = 0
+        with self._transaction() as conn:
+            for row in conn.execute("SELECT id, worker, output FROM jobs WHERE status = 'running'").fetchall():
+                worker_host, _, pid = (row['worker'] or '').rpartition(':')
+                if worker_host and worker_host != host:
+                    # Another host's processes cannot be checked from here
+                    continue
+                if pid.isdigit() and _pid_alive(int(pid)):
+                    continue
+                conn.execute("UPDATE jobs SET status = 'pending', worker = NULL WHERE id = ?", (row['id'],))
+                remove_stale_partials(Path(row['output']))
+                recovered += 1
+        if recovered:
+            logger.info(f"Recovered {recovered} interrupted jobs")
+        return recovered
+
+    def claim(self) -> Optional[Dict[str, Any]]:
+        """Mark the oldest pending job running for this process and return it."""
+        with self._transaction() as conn:
+            row = conn.execute(
+                "SELECT * FROM jobs WHERE status = 'pending' ORDER BY id LIMIT 1"
+            ).fetchone()
+            if row is None:
+                return None
+            conn.execute(
+                "UPDATE jobs SET status = 'running', worker = ?, started = ?, attempts = attempts + 1, "
+                "error = NULL WHERE id = ?",
+                (self.worker, time.time(), row['id'])
+            )
+        return self.get(row['id'])
+
+    def complete(self, job_id: int, output_size: int, output_sha256: str) -> None:
+        finished = time.time()
+        self._conn.execute(
+            "UPDATE jobs SET status = 'done', finished = ?, seconds = ? - started, "
+            "output_size = ?, output_sha256 = ? WHERE id = ?",
+            (finished, finished, output_size, output_sha256, job_id)
+        )
+
+    def fail(self, job_id: int, error: str) -> None:
+        finished = time.time()
+        self._conn.execute(
+            "UPDATE jobs SET status = 'failed', finished = ?, seconds = ? - started, error = ? WHERE id = ?",
+            (finished, finished, error, job_id)
+        )
+
+    def release(self, job_id: int) -> None:
+        """Put an interrupted job back in the queue."""
+        self._conn.execute(
+            "UPDATE jobs SET status = 'pending', worker = NULL, attempts = attempts - 1 WHERE id = ?",
+            (job_id,)
+        )
+
+    def retry(self, job_ids: Optional[List[int]] = None) -> int:
+        """Queue failed jobs (or the given jobs, whatever their status) again."""
+        with self._transaction() as conn:
+            if job_ids:
+                placeholders = ','.join('?' * len(job_ids))
+                cursor = conn.execute(
+                    f"UPDATE jobs SET status = 'pending', error = NULL, worker = NULL "
+                    f"WHERE id IN ({placeholders}) AND status != 'running'",
+                    job_ids
+                )
+            else:
+                cursor = conn.execute(
+                    "UPDATE jobs SET status = 'pending', error = NULL, worker = NULL WHERE status = 'failed'"
+                )
+            return cursor.rowcount
+
+    def get(self, job_id: int) -> Optional[Dict[str, Any]]:
+        row = self._conn.execute("SELECT * FROM jobs WHERE id = ?", (job_id,)).fetchone()
+        return self._to_dict(row) if row is not None else None
+
+    def jobs(self, status: Optional[str] = None) -> List[Dict[str, Any]]:
+        if status:
+            rows = self._conn.execute("SELECT * FROM jobs WHERE status = ? ORDER BY id", (status,))
+        else:
+            rows = self._conn.execute("SELECT * FROM jobs ORDER BY id")
+        return [self._to_dict(row) for row in rows.fetchall()]
+
+    def counts(self) -> Dict[str, int]:
+        counts = dict.fromkeys(STATUSES, 0)
+        for row in self._conn.execute("SELECT status, COUNT(*) AS n FROM jobs GROUP BY status"):
+            counts[row['status']] = row['n']
+        return counts
+
+    def verify(self) -> List[Dict[str, Any]]:
+        """Done jobs whose output is missing or no longer matches its checksum; they go back to pending."""
+        broken = []
+        for job in self.jobs('done'):
+            output = Path(job['output'])
+            if not output.exists() or output.stat().st_size != job['output_size'] \
+                    or file_sha256(output) != job['output_sha256']:
+                broken.append(job)
+        if broken:
+            self.retry([job['id'] for job in broken])
+        return broken
+
+    @staticmethod
+    def _to_dict(row: sqlite3.Row) -> Dict[str, Any]:
+        job = dict(row)
+        job['options'] = json.loads(job['options'])
+        return job
+
+
+def partial_path(output_path: Path, pid: Optional[int] = None) -> Path:
+    """Temporary name the output is written under by process pid (default: this one) until it is complete.
+
+    The extension is kept because ffmpeg picks the container from it.
+    """
+    return output_path.with_name(f".{output_path.stem}.{pid or os.getpid()}.part{output_path.suffix}")
+
+
+def remove_stale_partials(output_path: Path) -> None:
+    """Delete partial files of output_path left by processes that no longer run."""
+    pattern = partial_path(output_path).name.replace(f".{os.getpid()}.", '.*.')
+    for path in output_path.parent.glob(pattern):
+        pid = path.name[len(output_path.stem) + 2:].split('.', 1)[0]
+        if pid.isdigit() and not _pid_alive(int(pid)):
+            logger.info(f"Removing partial output {path.name}")
+            path.unlink(missing_ok=True)
+
+
+def run_job(job: Dict[str, Any], session,
+            progress_callback: Optional[Callable[[int, int], None]] = None) -> Dict[str, Any]:
+    """Upscale one job into a partial file and rename it into place.
+
+    Returns the size and SHA-256 of the committed output.
+    """
+    output_path = Path(job['output'])
+    output_path.parent.mkdir(parents=True, exist_ok=True)
+    temp_path = partial_path(output_path)
+    options = dict(job['options'], progress='none')
+
+    try:
+        if job['type'] == 'video':
+            from .processors import VideoProcessor
+            processor = VideoProcessor(session=session, progress_callback=progress_callback, **options)
+            processor.upscale_file(job['input'], str(temp_path))
+        else:
+            import cv2
+            from .processors import ImageProcessor
+            image_bgr = cv2.imread(job['input'], cv2.IMREAD_COLOR)
+            if image_bgr is None:
+                raise ValueError(f"Could not load image: {job['input']}")
+            processor = ImageProcessor(**options)
+            processor.backend = session.acquire(**options)
+            processor.save_image(str(temp_path), processor.enhance(cv2.cvtColor(image_bgr, cv2.COLOR_BGR2RGB)))
+            if progress_callback is not None:
+                progress_callback(1, 1)
+
+        with open(temp_path, 'rb+') as f:
+            os.fsync(f.fileno())
+        checksum = file_sha256(temp_path)
+        size = temp_path.stat().st_size
+        os.replace(temp_path, output_path)
+    finally:
+        if temp_path.exists():
+            temp_path.unlink()
+
+    return {'output_size': size, 'output_sha256': checksum}
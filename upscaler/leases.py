@@ -0,0 +1,304 @@
+"""
+Work distribution between hosts through lease files on a shared filesystem.
+
+Several ``upscale all --distributed DIR`` runs over the same files (on one
+host or on hosts mounting the same NAS) split the batch between them. A
+worker claims a file by creating its lease file exclusively; only one
+create can succeed. While it works, a heartbeat thread keeps the lease's
+modification time fresh. A lease that has not been touched for the TTL
+belongs to a dead worker and is reclaimed by the next worker that wants the
+file. Finished and failed files get a marker so no one picks them up again.
+
+Layout of the shared directory:
+
+    leases/<key>.lease     held by a worker (JSON: worker, host, pid, file, acquired)
+    done/<key>.json        finished (worker, frames, seconds)
+    failed/<key>.json      failed (worker, error)
+    workers/<worker>.json  per-worker totals, for the throughput report
+
+Times are compared against the modification time the file server gives a
+file touched just now, so clock skew between hosts does not expire leases.
+"""
+
+import hashlib
+import json
+import logging
+import os
+import socket
+import threading
+import time
+from pathlib import Path
+from typing import Any, Callable, Dict, Iterable, Iterator, List, Optional
+
+
+logger = logging.getLogger(__name__)
+
+DEFAULT_LEASE_TTL = 120.0
+
+
+def default_worker_id() -> str:
+    return f"{socket.gethostname()}-{os.getpid()}"
+
+
+def _write_json(path: Path, payload: Dict[str, Any]) -> None:
+    """Replace path with payload so readers never see a partial file."""
+    temp_path = path.with_name(f".{path.name}.{os.getpid()}.tmp")
+    temp_path.write_text(json.dumps(payload, sort_keys=True))
+    os.replace(temp_path, path)
+
+
+def _read_json(path: Path) -> Optional[Dict[str, Any]]:
+    try:
+        return json.loads(path.read_text())
+    except (OSError, ValueError):
+        return None
+
+
+class LeaseDir:
+    """Lease files for one worker in a shared distribution directory."""
+
+    def __init__(self, root: Path, worker_id: Optional[str] = None, ttl: float = DEFAULT_LEASE_TTL,
+                 on_reclaim: Optional[Callable[[str, Dict[str, Any]], None]] = None):
+        """
+        Args:
+            root: Shared distribution directory
+            worker_id: Name of this worker (default: host-pid)
+            ttl: Seconds without heartbeat after which a lease is reclaimed
+            on_reclaim: Called as on_reclaim(name, lease) before a dead
+                worker's lease is removed, e.g. to delete its partial output
+        """
+        if ttl <= 0:
+            raise ValueError("Lease TTL must be positive")
+        self.root = Path(root)
+        self.worker_id = worker_id or default_worker_id()
+        self.ttl = ttl
+        self.heartbeat_interval = ttl / 4
+        self.poll_interval = min(ttl / 4, 5.0)
+        self.on_reclaim = on_reclaim
+
+        for sub in ('leases', 'done', 'failed', 'workers'):
+            (self.root / sub).mkdir(parents=True, exist_ok=True)
+        self._stats_path = self.root / 'workers' / f"{self.worker_id}.json"
+        self._clock_path = self.root / 'workers' / f".{self.worker_id}.clock"
+
+        self._held = {}  # key -> file name
+        self._lock = threading.Lock()
+        self._stop = threading.Event()
+        self._thread = None
+        self.stats = {
+            'worker': self.worker_id,
+            'host': socket.gethostname(),
+            'pid': os.getpid(),
+            'started': time.time(),
+            'updated': time.time(),
+            'finished': None,
+            'files': 0,
+            'failed': 0,
+            'frames': 0,
+            'seconds': 0.0,
+            'reclaimed': 0,
+        }
+
+    def start(self) -> 'LeaseDir':
+        """Publish this worker and start the heartbeat thread."""
+        self._write_stats()
+        self._thread = threading.Thread(target=self._heartbeat, name='upscaler-leases', daemon=True)
+        self._thread.start()
+        return self
+
+    def stop(self) -> None:
+        """Stop the heartbeat and give back every lease still held."""
+        self._stop.set()
+        if self._thread is not None:
+            self._thread.join()
+        for key in list(self._held):
+            self._drop(key)
+        self.stats['finished'] = time.time()
+        self._write_stats()
+        self._clock_path.unlink(missing_ok=True)
+
+    def __enter__(self):
+        return self.start()
+
+    def __exit__(self, exc_type, exc_val, exc_tb):
+        self.stop()
+
+    @staticmethod
+    def key(name: str) -> str:
+        """File name safe key for a file name relative to the batch."""
+        return hashlib.sha1(name.encode('utf-8')).hexdigest()
+
+    def state(self, name: str) -> str:
+        """'done', 'failed', 'leased' or 'free'."""
+        key = self.key(name)
+        if (self.root / 'done' / f"{key}.json").exists():
+            return 'done'
+        if (self.root / 'failed' / f"{key}.json").exists():
+            return 'failed'
+        if (self.root / 'leases' / f"{key}.lease").exists():
+            return 'leased'
+        return 'free'
+
+    def claim(self, name: str) -> bool:
+        """Take the lease for name; False if it is done, failed or leased by a live worker."""
+        key = self.key(name)
+        if self.state(name) in ('done', 'failed'):
+            return False
+
+        lease_path = self._lease_path(key)
+        for _ in range(2):
+            try:
+                fd = os.open(lease_path, os.O_WRONLY | os.O_CREAT | os.O_EXCL)
+            except FileExistsError:
+                if not self._reclaim(key, name):
+                    return False
+                continue
+            with os.fdopen(fd, 'w') as f:
+                json.dump({'worker': self.worker_id, 'host': self.stats['host'], 'pid': os.getpid(),
+                           'file': name, 'acquired': time.time()}, f)
+            # Another worker may have finished it between the state check and the create
+            if self.state(name) == 'done':
+                lease_path.unlink(missing_ok=True)
+                return False
+            with self._lock:
+                self._held[key] = name
+            return True
+        return False
+
+    def complete(self, name: str, frames: int, seconds: float) -> None:
+        key = self.key(name)
+        _write_json(self.root / 'done' / f"{key}.json",
+                    {'file': name, 'worker': self.worker_id, 'frames': frames,
+                     'seconds': round(seconds, 3), 'finished': time.time()})
+        self.stats['files'] += 1
+        self.stats['frames'] += frames
+        self.stats['seconds'] += seconds
+        self._drop(key)
+        self._write_stats()
+
+    def fail(self, name: str, error: str) -> None:
+        key = self.key(name)
+        _write_json(self.root / 'failed' / f"{key}.json",
+                    {'file': name, 'worker': self.worker_id, 'error': error, 'finished': time.time()})
+        self.stats['failed'] += 1
+        self._drop(key)
+        self._write_stats()
+
+    def release(self, name: str) -> None:
+        """Give a claimed file back without finishing it."""
+        self._drop(self.key(name))
+
+    def claim_each(self, items: Iterable[Any], name_of: Callable[[Any], str],
+                   on_skip: Optional[Callable[[Any], None]] = None) -> Iterator[Any]:
+        """Yield the items this worker claims until none is left unfinished.
+
+        Items leased by other workers are retried every poll_interval, so
+        they are taken over if their worker dies. on_skip(item) is called
+        for items finished or failed by someone else.
+        """
+        remaining = list(items)
+        while remaining:
+            waiting = []
+            for item in remaining:
+                name = name_of(item)
+                if self.claim(name):
+                    yield item
+                elif self.state(name) == 'leased':
+                    waiting.append(item)
+                elif on_skip is not None:
+                    on_skip(item)
+            remaining = waiting
+            if remaining:
+                logger.info(f"Waiting for {len(remaining)} files leased by other workers")
+                time.sleep(self.poll_interval)
+
+    def workers(self) -> List[Dict[str, Any]]:
+        """Totals of every worker that took part, oldest first."""
+        found = (_read_json(path) for path in (self.root / 'workers').glob('*.json'))
+        return sorted((stats for stats in found if stats), key=lambda stats: stats['started'])
+
+    def _lease_path(self, key: str) -> Path:
+        return self.root / 'leases' / f"{key}.lease"
+
+    def _now(self) -> float:
+        """Current time on the file server: mtime of a file touched just now."""
+        self._clock_path.touch()
+        return self._clock_path.stat().st_mtime
+
+    def _reclaim(self, key: str, name: str) -> bool:
+        """Remove the lease of key if its worker stopped heartbeating; True if removed."""
+        lease_path = self._lease_path(key)
+        try:
+            age = self._now() - lease_path.stat().st_mtime
+        except FileNotFoundError:
+            return True  # released meanwhile
+        if age <= self.ttl:
+            return False
+
+        # Only one worker may remove a stale lease, or it could remove the
+        # fresh lease a faster worker created in its place
+        guard_path = lease_path.with_suffix('.reclaim')
+        try:
+            os.close(os.open(guard_path, os.O_WRONLY | os.O_CREAT | os.O_EXCL))
+        except FileExistsError:
+            try:
+                if self._now() - guard_path.stat().st_mtime > self.ttl:
+                    guard_path.unlink(missing_ok=True)  # reclaimer died
+            except FileNotFoundError:
+                pass
+            return False
+        try:
+            try:
+                stale = self._now() - lease_path.stat().st_mtime > self.ttl
+            except FileNotFoundError:
+                return True
+            if not stale:
+                return False
+            lease = _read_json(lease_path) or {}
+            logger.warning(f"Reclaiming {name} from {lease.get('worker', 'unknown worker')} "
+                           f"(no heartbeat for {age:.0f}s)")
+            if self.on_reclaim is not None:
+                try:
+                    self.on_reclaim(name, lease)
+                except OSError as e:
+                    logger.warning(f"Cleanup after {lease.get('worker')} failed: {e}")
+            lease_path.unlink(missing_ok=True)
+            self.stats['reclaimed'] += 1
+            return True
+        finally:
+            guard_path.unlink(missing_ok=True)
+
+    def _drop(self, key: str) -> None:
+        with self._lock:
+            held = self._held.pop(key, None)
+        if held is not None and self._owns(key):
+            self._lease_path(key).unlink(missing_ok=True)
+
+    def _owns(self, key: str) -> bool:
+        lease = _read_json(self._lease_path(key))
+        return lease is not None and lease.get('worker') == self.worker_id
+
+    def _write_stats(self) -> None:
+        self.stats['updated'] = time.time()
+        _write_json(self._stats_path, self.stats)
+
+    def _heartbeat(self) -> None:
+        while not self._stop.wait(self.heartbeat_interval):
+            with self._lock:
+                held = dict(self._held)
+            for key, name in held.items():
+                if not self._owns(key):
+                    # Taken over after a stall longer than the TTL; the
+                    # other worker writes the same output, so just stop renewing
+                    logger.warning(f"Lost the lease for {name}")
+                    with self._lock:
+                        self._held.pop(key, None)
+                    continue
+                try:
+                    os.utime(self._lease_path(key))
+                except OSError as e:
+                    logger.warning(f"Lease heartbeat failed for {name}: {e}")
+            try:
+                self._write_stats()
+            except OSError as e:
+                logger.warning(f"Could not update worker stats: {e}")
@@ -0,0 +1,291 @@
+"""
+Resumable HTTP downloads over one or more range requests.
+
+The file is split into byte ranges fetched by parallel connections and
+written in place. Their progress is saved next to the partial file, so an
+interrupted download continues where each range stopped instead of starting
+over. The SHA-256 is computed while the data arrives: bytes at the front of
+the file are hashed as they are written, and bytes that other connections
+wrote further ahead are read back once the hash catches up with them, so no
+separate hashing pass follows the download.
+
+Servers that do not answer range requests get a plain single-stream
+download from the start.
+"""
+
+import hashlib
+import http.client
+import json
+import logging
+import os
+import threading
+import time
+import urllib.error
+import urllib.request
+from pathlib import Path
+from typing import Dict, List, Optional
+
+
+logger = logging.getLogger(__name__)
+
+USER_AGENT = 'Mozilla/5.0 (Windows NT 10.0; Win64; x64) AppleWebKit/537.36'
+
+_BUFFER_SIZE = 1 << 20
+_TIMEOUT = 60
+_RETRIES = 5
+_STATE_SAVE_INTERVAL = 1.0
+
+# Ranges smaller than this are not worth another connection
+_MIN_RANGE_SIZE = 4 << 20
+
+_NETWORK_ERRORS = (urllib.error.URLError, http.client.HTTPException, OSError)
+
+
+class _RangeNotSupported(Exception):
+    """The server answered a range request with the whole file; retrying will not help."""
+
+
+def state_path(dest_path: Path) -> Path:
+    """File that records range progress of a partial download."""
+    return dest_path.with_name(dest_path.name + '.ranges')
+
+
+def download_file(url: str, dest_path: Path, connections: int = 1, progress: bool = True) -> str:
+    """Download url into dest_path, resuming a partial download there.
+
+    Args:
+        url: File to download
+        dest_path: Partial file to write; kept on network errors so the
+            next call resumes it
+        connections: Parallel range requests
+        progress: Show a tqdm progress bar
+
+    Returns:
+        SHA-256 hex digest of the downloaded file
+    """
+    dest_path = Path(dest_path)
+    request = urllib.request.Request(url, headers={'User-Agent': USER_AGENT, 'Range': 'bytes=0-0'})
+    response = urllib.request.urlopen(request, timeout=_TIMEOUT)
+
+    size = _range_total(response)
+    if size is None:
+        # No range support: the probe already streams the whole file
+        logger.info("Server does not support range requests; downloading from the start")
+        state_path(dest_path).unlink(missing_ok=True)
+        with response:
+            return _download_stream(response, dest_path, progress)
+
+    final_url = response.geturl()  # skip redirects on every range request
+    response.close()
+
+    ranges = _load_ranges(dest_path, url, size)
+    if ranges is None:
+        ranges = _plan_ranges(dest_path, size, connections)
+    resumed = sum(r['done'] for r in ranges)
+    if resumed:
+        logger.info(f"Resuming download at {resumed / size:.0%} ({len(ranges)} ranges)")
+
+    download = _RangeDownload(final_url, url, dest_path, size, ranges, progress)
+    try:
+        return download.run()
+    except _RangeNotSupported as e:
+        logger.info(f"{e}; downloading from the start")
+        state_path(dest_path).unlink(missing_ok=True)
+        request = urllib.request.Request(url, headers={'User-Agent': USER_AGENT})
+        with urllib.request.urlopen(request, timeout=_TIMEOUT) as response:
+            return _download_stream(response, dest_path, progress)
+
+
+def _range_total(response) -> Optional[int]:
+    """Total size from a 206 answer to the probe, or None if ranges are unsupported."""
+    if response.status != 206:
+        return None
+    content_range = response.headers.get('Content-Range', '')
+    total = content_range.rpartition('/')[2]
+    if not content_range.startswith('bytes ') or not total.isdigit():
+        return None
+    return int(total)
+
+
+def _download_stream(response, dest_path: Path, progress: bool) -> str:
+    from tqdm import tqdm
+
+    sha256 = hashlib.sha256()
+    buffer = bytearray(_BUFFER_SIZE)
+    view = memoryview(buffer)
+    total_size = int(response.headers.get('Content-Length', 0))
+
+    with open(dest_path, 'wb') as f, \
+            tqdm(total=total_size, unit='B', unit_scale=True, desc="Downloading", disable=not progress) as pbar:
+        while True:
+            n = response.readinto(buffer)
+            if not n:
+                break
+            f.write(view[:n])
+            sha256.update(view[:n])
+            pbar.update(n)
+    return sha256.hexdigest()
+
+
+def _load_ranges(dest_path: Path, url: str, size: int) -> Optional[List[Dict[str, int]]]:
+    """Saved range progress, if it belongs to this download."""
+    try:
+        state = json.loads(state_path(dest_path).read_text())
+    except (OSError, ValueError):
+        return None
+    if state.get('url') != url or state.get('size') != size or not dest_path.exists():
+        return None
+    return state['ranges']
+
+
+def _plan_ranges(dest_path: Path, size: int, connections: int) -> List[Dict[str, int]]:
+    """Split the file into ranges, keeping the prefix of a partial file without saved state."""
+    have = dest_path.stat().st_size if dest_path.exists() else 0
+    if have >= size:
+        have = 0  # not a prefix of this file
+    ranges = [{'start': 0, 'end': have, 'done': have}] if have else []
+
+    remaining = size - have
+    count = max(1, min(connections, remaining // _MIN_RANGE_SIZE))
+    step = -(-remaining // count)
+    for start in range(have, size, step):
+        ranges.append({'start': start, 'end': min(start + step, size), 'done': 0})
+    if not ranges:
+        ranges.append({'start': 0, 'end': 0, 'done': 0})
+    return ranges
+
+
+class _RangeDownload:
+    """Parallel range fetch into one file with an in-order SHA-256."""
+
+    def __init__(self, url: str, state_url: str, dest_path: Path, size: int,
+                 ranges: List[Dict[str, int]], progress: bool):
+        self.url = url
+        self.state_url = state_url
+        self.dest_path = dest_path
+        self.size = size
+        self.ranges = ranges
+        self.progress = progress
+        self._lock = threading.Lock()
+        self._sha256 = hashlib.sha256()
+        self._hashed = 0
+        self._saved = 0.0
+        self._pbar = None
+        self._errors = []
+
+    def run(self) -> str:
+        from tqdm import tqdm
+
+        # State first: a crash after creating the file must not lose which bytes are real
+        self._save_state(force=True)
+        with open(self.dest_path, 'ab') as f:
+            f.truncate(self.size)
+
+        with open(self.dest_path, 'rb', buffering=0) as self._reader, \
+                tqdm(total=self.size, initial=sum(r['done'] for r in self.ranges), unit='B',
+                     unit_scale=True, desc="Downloading", disable=not self.progress) as self._pbar:
+            with self._lock:
+                self._catch_up()  # bytes already on disk from an earlier attempt
+
+            pending = [r for r in self.ranges if r['done'] < r['end'] - r['start']]
+            threads = [threading.Thread(target=self._fetch, args=(r,), name=f'download-{i}', daemon=True)
+                       for i, r in enumerate(pending[1:], 1)]
+            for thread in threads:
+                thread.start()
+            if pending:
+                self._fetch(pending[0])
+            for thread in threads:
+                thread.join()
+
+            self._save_state(force=True)
+            if self._errors:
+                raise self._errors[0]
+            if self._hashed != self.size:
+                raise IOError(f"Download incomplete: {self._hashed} of {self.size} bytes")
+
+        state_path(self.dest_path).unlink(missing_ok=True)
+        return self._sha256.hexdigest()
+
+    def _fetch(self, r: Dict[str, int]) -> None:
+        """Download one range, retrying from where it stopped."""
+        buffer = bytearray(_BUFFER_SIZE)
+        view = memoryview(buffer)
+        failures = 0
+
+        with open(self.dest_path, 'r+b', buffering=0) as f:
+            while r['done'] < r['end'] - r['start'] and not self._errors:
+                offset = r['start'] + r['done']
+                request = urllib.request.Request(self.url, headers={
+                    'User-Agent': USER_AGENT, 'Range': f"bytes={offset}-{r['end'] - 1}"})
+                try:
+                    with urllib.request.urlopen(request, timeout=_TIMEOUT) as response:
+                        if response.status != 206:
+                            raise _RangeNotSupported(
+                                f"Server ignored the range request (HTTP {response.status})")
+                        f.seek(offset)
+                        while r['done'] < r['end'] - r['start']:
+                            n = response.readinto(view[:min(_BUFFER_SIZE, r['end'] - r['start'] - r['done'])])
+                            if not n:
+                                raise IOError("Connection closed before the range was complete")
+                            f.write(view[:n])
+                            self._advance(r, view[:n])
+                            failures = 0
+                except _RangeNotSupported as e:
+                    with self._lock:
+                        self._errors.append(e)
+                    return
+                except _NETWORK_ERRORS as e:
+                    failures += 1
+                    if failures > _RETRIES:
+                        with self._lock:
+                            self._errors.append(e)
+                        return
+                    delay = min(2 ** failures, 30)
+                    logger.warning(f"Download interrupted at byte {r['start'] + r['done']}: {e}; "
+                                   f"retrying in {delay}s")
+                    time.sleep(delay)
+
+    def _advance(self, r: Dict[str, int], data: memoryview) -> None:
+        with self._lock:
+            offset = r['start'] + r['done']
+            r['done'] += len(data)
+            self._catch_up(offset, data)
+            self._pbar.update(len(data))
+            self._save_state()
+
+    def _catch_up(self, offset: int = -1, data: Optional[memoryview] = None) -> None:
+        """Hash the written bytes that follow the hashed prefix (lock held).
+
+        data written at offset is hashed from memory when it is next in
+        line; anything else is read back from the file.
+        """
+        for r in self.ranges:
+            if self._hashed >= r['end']:
+                continue
+            if self._hashed < r['start']:
+                break  # a gap: an earlier range is not finished
+            limit = r['start'] + r['done']
+            while self._hashed < limit:
+                if data is not None and offset == self._hashed and offset + len(data) <= limit:
+                    self._sha256.update(data)
+                    self._hashed += len(data)
+                    data = None
+                    continue
+                self._reader.seek(self._hashed)
+                chunk = self._reader.read(min(_BUFFER_SIZE, limit - self._hashed))
+                if not chunk:
+                    raise IOError(f"Partial download is shorter than expected at byte {self._hashed}")
+                self._sha256.update(chunk)
+                self._hashed += len(chunk)
+            if limit < r['end']:
+                break
+
+    def _save_state(self, force: bool = False) -> None:
+        now = time.monotonic()
+        if not force and now - self._saved < _STATE_SAVE_INTERVAL:
+            return
+        self._saved = now
+        path = state_path(self.dest_path)
+        temp_path = path.with_name(path.name + '.tmp')
+        temp_path.write_text(json.dumps({'url': self.state_url, 'size': self.size, 'ranges': self.ranges}))
+        os.replace(temp_path, path)
@@ -1,6 +1,7 @@
 """
 Model management system for Real-ESRGAN models
 """
+import contextlib
 import hashlib
 import json
 import logging
@@ -8,14 +9,23 @@ import os
 import sys
 from pathlib import Path
 from typing import Dict, Optional
-import urllib.request
-import urllib.error
 
-import gdown
-from tqdm import tqdm
+try:
+    import fcntl
+except ImportError:  # Windows
+    fcntl = None
 
 logger = logging.getLogger(__name__)
 
+# Checksums verified in the cache, keyed by file path, so unchanged models
+# are not hashed again on every check
+MANIFEST_NAME = '.verified.json'
+
+_HASH_BUFFER = 1 << 20
+
+# Parallel range requests per model download
+DEFAULT_DOWNLOAD_CONNECTIONS = 4
+
 
 class ModelManager:
     """Manages model downloads and paths."""
@@ -59,6 +69,8 @@ class ModelManager:
         
         self.cache_dir = Path(cache_dir)
         self.cache_dir.mkdir(parents=True, exist_ok=True)
+        self.manifest_path = self.cache_dir / MANIFEST_NAME
+        self._manifest = None
         logger.debug(f"Model cache directory: {self.cache_dir}")
     
     def get_model_path(self, model_name: str) -> Path:
@@ -88,7 +100,7 @@ class ModelManager:
         expected_sha256 = model_info.get('sha256')
         
         if expected_sha256:
-            actual_sha256 = self._calculate_sha256(model_path)
+            actual_sha256 = self.verified_sha256(model_path)
             if actual_sha256 != expected_sha256:
                 logger.warning(f"Model {model_name} checksum mismatch. Re-downloading...")
                 model_path.unlink()  # Remove corrupted file
@@ -96,8 +108,9 @@ class ModelManager:
         
         return True
     
-    def download_model(self, model_name: str, force: bool = False) -> Path:
-        """Download a model if not already present."""
+    def download_model(self, model_name: str, force: bool = False,
+                       connections: int = DEFAULT_DOWNLOAD_CONNECTIONS) -> Path:
+        """Download a model if not already present, resuming an interrupted download."""
         if model_name not in self.models:
             raise ValueError(f"Unknown model: {model_name}")
         
@@ -115,62 +128,125 @@ class ModelManager:
         logger.info(f"Downloading {model_name} from {url}")
         logger.info(f"This may take a while depending on your internet connection...")
         
-        # Create temporary file
+        # Create temporary file (kept on network errors so the next attempt resumes it)
         temp_path = model_path.with_suffix('.tmp')
         
+        from .download import download_file, state_path
+        
         try:
             if 'drive.google.com' in url or 'docs.google.com' in url:
                 # Use gdown for Google Drive
+                import gdown
                 gdown.download(url, str(temp_path), quiet=False)
+                actual_sha256 = self._calculate_sha256(temp_path)
             else:
-                # Use urllib for GitHub releases
-                self._download_with_progress(url, temp_path)
+                # Use urllib for GitHub releases; hashed while downloading
+                actual_sha256 = download_file(url, temp_path, connections=connections)
             
             # Verify checksum
             expected_sha256 = model_info.get('sha256')
             if expected_sha256:
-                actual_sha256 = self._calculate_sha256(temp_path)
                 if actual_sha256 != expected_sha256:
+                    # Corrupt data cannot be resumed; start over next time
                     temp_path.unlink()
+                    state_path(temp_path).unlink(missing_ok=True)
                     raise ValueError(f"Checksum mismatch for {model_name}")
                 logger.info("Checksum verified ✓")
             
             # Move to final location
-            temp_path.rename(model_path)
+            os.replace(temp_path, model_path)
+            self._record_verified(model_path, actual_sha256)
             logger.info(f"Model saved to {model_path}")
             
             return model_path
             
         except Exception as e:
-            if temp_path.exists():
-                temp_path.unlink()
+            if state_path(temp_path).exists():
+                logger.info(f"Partial download kept at {temp_path}; run again to resume")
+            else:
+                temp_path.unlink(missing_ok=True)
             raise RuntimeError(f"Failed to download {model_name}: {e}")
     
-    def _download_with_progress(self, url: str, dest_path: Path):
-        """Download a file with progress bar."""
-        headers = {'User-Agent': 'Mozilla/5.0 (Windows NT 10.0; Win64; x64) AppleWebKit/537.36'}
-        req = urllib.request.Request(url, headers=headers)
-        
-        with urllib.request.urlopen(req) as response:
-            total_size = int(response.headers.get('Content-Length', 0))
-            
-            with open(dest_path, 'wb') as f:
-                with tqdm(total=total_size, unit='B', unit_scale=True, desc="Downloading") as pbar:
-                    while True:
-                        chunk = response.read(8192)
-                        if not chunk:
-                            break
-                        f.write(chunk)
-                        pbar.update(len(chunk))
-    
     def _calculate_sha256(self, file_path: Path) -> str:
         """Calculate SHA256 checksum of a file."""
         sha256 = hashlib.sha256()
-        with open(file_path, 'rb') as f:
-            for chunk in iter(lambda: f.read(4096), b''):
-                sha256.update(chunk)
+        buffer = bytearray(_HASH_BUFFER)
+        view = memoryview(buffer)
+        with open(file_path, 'rb', buffering=0) as f:
+            while True:
+                n = f.readinto(buffer)
+                if not n:
+                    break
+                sha256.update(view[:n])
         return sha256.hexdigest()
     
+    def verified_sha256(self, file_path: Path) -> str:
+        """SHA256 of a file, from the manifest while its size, mtime and inode are unchanged."""
+        key = str(file_path.absolute())
+        entry = self._load_manifest().get(key)
+        if entry is not None and entry.get('stat') == self._stat_signature(file_path):
+            return entry['sha256']
+        
+        logger.debug(f"Hashing {file_path}")
+        sha256 = self._calculate_sha256(file_path)
+        self._record_verified(file_path, sha256)
+        return sha256
+    
+    def _record_verified(self, file_path: Path, sha256: str) -> None:
+        """Remember the checksum of file_path as it is now.
+        
+        The manifest is re-read and rewritten under a lock, so entries other
+        processes recorded since it was loaded are kept.
+        """
+        key = str(file_path.absolute())
+        entry = {'stat': self._stat_signature(file_path), 'sha256': sha256}
+        temp_path = self.manifest_path.with_name(f"{MANIFEST_NAME}.{os.getpid()}.tmp")
+        try:
+            with self._manifest_lock():
+                self._manifest = None
+                manifest = self._load_manifest()
+                manifest[key] = entry
+                # Drop entries of files that no longer exist
+                for stale in [stale for stale in manifest if not os.path.exists(stale)]:
+                    del manifest[stale]
+                
+                temp_path.write_text(json.dumps(manifest, indent=2, sort_keys=True))
+                os.replace(temp_path, self.manifest_path)
+        except OSError as e:
+            # A read-only cache only costs a re-hash next time
+            logger.debug(f"Could not write checksum manifest: {e}")
+            temp_path.unlink(missing_ok=True)
+            self._load_manifest()[key] = entry
+    
+    @contextlib.contextmanager
+    def _manifest_lock(self):
+        """Exclusive lock on the manifest between processes (no-op without fcntl)."""
+        if fcntl is None:
+            # The atomic replace still keeps the file whole; a concurrent
+            # update may only be lost, which costs a re-hash
+            yield
+            return
+        
+        with open(self.manifest_path.with_name(f"{MANIFEST_NAME}.lock"), 'a') as lock_file:
+            fcntl.flock(lock_file, fcntl.LOCK_EX)
+            try:
+                yield
+            finally:
+                fcntl.flock(lock_file, fcntl.LOCK_UN)
+    
+    def _load_manifest(self) -> Dict[str, Dict]:
+        if self._manifest is None:
+            try:
+                self._manifest = json.loads(self.manifest_path.read_text())
+            except (OSError, ValueError):
+                self._manifest = {}
+        return self._manifest
+    
+    @staticmethod
+    def _stat_signature(file_path: Path) -> list:
+        stat = file_path.stat()
+        return [stat.st_size, stat.st_mtime_ns, stat.st_ino, stat.st_dev]
+    
     def list_models(self) -> Dict[str, Dict]:
         """List all available models with their info."""
         result = {}
@@ -178,8 +254,9 @@ class ModelManager:
             model_info = info.copy()
             model_info['downloaded'] = self.is_model_downloaded(name)
             if model_info['downloaded']:
-                model_info['path'] = str(self.get_model_path(name))
-                model_info['size_mb'] = self.get_model_path(name).stat().st_size / (1024 * 1024)
+                model_path = self.get_model_path(name)
+                model_info['path'] = str(model_path)
+                model_info['size_mb'] = model_path.stat().st_size / (1024 * 1024)
             result[name] = model_info
         return result
     
@@ -189,4 +266,6 @@ class ModelManager:
         for model_file in self.cache_dir.glob("*.pth"):
             model_file.unlink()
             count += 1
+        self.manifest_path.unlink(missing_ok=True)
+        self._manifest = None
         logger.info(f"Removed {count} model files from cache")
\ No newline at end of file
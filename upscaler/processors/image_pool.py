@@ -0,0 +1,213 @@
+"""
+Multi-process image upscaling for batches of photos.
+
+The parent process decodes images into shared memory blocks and hands their
+names to a pool of worker processes, which upscale, post-process and write
+the results themselves. Where the platform forks and the backend allows it
+(torch models on the CPU), the parent loads the model once and the workers
+inherit the weights copy-on-write; otherwise every worker loads its own
+backend and the parent never loads one.
+"""
+
+import logging
+import multiprocessing
+import os
+import queue
+from multiprocessing import shared_memory
+from typing import Any, Callable, Dict, List, Optional, Tuple
+
+import cv2
+import numpy as np
+
+from ..backends import accepts_threads
+from ..backends.cpu_profile import limit_worker_threads
+
+
+logger = logging.getLogger(__name__)
+
+# Decoded images kept in shared memory per worker, so workers never wait
+# for the parent to decode while memory use stays bounded
+_IN_FLIGHT_PER_WORKER = 2
+
+
+def run_image_pool(files: List[Tuple[str, str]], kwargs: Dict[str, Any], workers: int,
+                   session=None,
+                   on_done: Optional[Callable[[int, Optional[str]], None]] = None) -> int:
+    """Upscale (input_path, output_path) pairs in worker processes.
+
+    Args:
+        files: Images to upscale and where to write them
+        kwargs: Processor options, as given to ImageProcessor
+        workers: Number of worker processes
+        session: BackendSession of the caller; its backend for kwargs is
+            loaded here and shared with the workers when it is fork-shareable
+        on_done: Called in this thread as on_done(file_index, error) for every
+            file, error being None on success
+
+    Returns:
+        Number of files that failed
+    """
+    can_fork = 'fork' in multiprocessing.get_all_start_methods()
+    ctx = multiprocessing.get_context('fork' if can_fork else 'spawn')
+    workers = max(1, min(workers, len(files)))
+    threads = max(1, (os.cpu_count() or 1) // workers)
+    threads = min(kwargs.get('threads') or threads, threads)
+
+    # Decided on the uninitialized backend, so the model is only loaded
+    # in the parent when the workers can use it
+    shared_backend = None
+    if can_fork and session is not None and session.get(**kwargs).fork_shareable():
+        shared_backend = session.acquire(**kwargs)
+    parent_threads = None
+    if shared_backend is not None:
+        import torch
+        parent_threads = torch.get_num_threads()
+        torch.set_num_threads(threads)
+        # Tune the tile size once, on one worker's share of the cores, instead of in every worker
+        shared_backend.auto_tile_size()
+        logger.info(f"Sharing {shared_backend.__class__.__name__} weights with {workers} forked workers")
+    else:
+        logger.info(f"Starting {workers} image workers, each loading its own backend")
+
+    worker_kwargs = dict(kwargs, progress='none')
+    if accepts_threads(kwargs):
+        # The worker's share of the cores overrides the CPU profile's thread
+        # count. Under --backend auto with no torch-only option this would
+        # change which backend the workers pick; limit_worker_threads covers torch
+        worker_kwargs['threads'] = threads
+    tasks = ctx.Queue()
+    events = ctx.Queue()
+
+    processes = []
+    for index in range(workers):
+        process = ctx.Process(
+            target=_image_worker,
+            args=(index, shared_backend, worker_kwargs, threads, tasks, events),
+            name=f'upscaler-image-{index}',
+            daemon=True,
+        )
+        process.start()
+        processes.append(process)
+
+    blocks = {}
+    pending = iter(enumerate(files))
+    remaining = len(files)
+    failures = 0
+
+    def finish(file_index: int, error: Optional[str]) -> None:
+        nonlocal remaining, failures
+        block = blocks.pop(file_index, None)
+        if block is not None:
+            block.close()
+            block.unlink()
+        remaining -= 1
+        failures += error is not None
+        if on_done is not None:
+            on_done(file_index, error)
+
+    try:
+        while remaining:
+            # Keep every worker supplied with decoded images
+            while len(blocks) < workers * _IN_FLIGHT_PER_WORKER:
+                item = next(pending, None)
+                if item is None:
+                    break
+                file_index, (input_path, output_path) = item
+                try:
+                    block, shape = _share_image(input_path)
+                except Exception as e:
+                    finish(file_index, f"{type(e).__name__}: {e}")
+                    continue
+                blocks[file_index] = block
+                tasks.put((file_index, output_path, block.name, shape))
+
+            if not remaining:
+                break
+
+            try:
+                kind, index, payload = events.get(timeout=0.5)
+            except queue.Empty:
+                # A worker that died without reporting (e.g. killed by the OS)
+                for index, process in enumerate(processes):
+                    if not process.is_alive():
+                        raise RuntimeError(f"Image worker {index} exited with code {process.exitcode}")
+                continue
+
+            if kind == 'done':
+                finish(index, payload)
+            else:
+                raise RuntimeError(f"Image worker {index} failed: {payload}")
+
+        for _ in processes:
+            tasks.put(None)
+        for process in processes:
+            process.join()
+    finally:
+        for process in processes:
+            if process.is_alive():
+                process.terminate()
+            process.join()
+        for block in blocks.values():
+            block.close()
+            block.unlink()
+        tasks.close()
+        events.close()
+        if parent_threads is not None:
+            import torch
+            torch.set_num_threads(parent_threads)
+
+    return failures
+
+
+def _share_image(path: str) -> Tuple[shared_memory.SharedMemory, Tuple[int, ...]]:
+    """Decode an image into a new shared memory block as RGB."""
+    image_bgr = cv2.imread(path, cv2.IMREAD_COLOR)
+    if image_bgr is None:
+        raise ValueError(f"Could not load image: {path}")
+
+    block = shared_memory.SharedMemory(create=True, size=image_bgr.nbytes)
+    image = np.ndarray(image_bgr.shape, dtype=np.uint8, buffer=block.buf)
+    cv2.cvtColor(image_bgr, cv2.COLOR_BGR2RGB, dst=image)
+    del image  # the block cannot be closed while a view exports its buffer
+    return block, image_bgr.shape
+
+
+def _image_worker(index: int, backend, kwargs: Dict[str, Any], threads: int, tasks, events) -> None:
+    """Process entry point: upscale images from tasks until told to stop."""
+    try:
+        # Before any parallel work: thread pools the parent started do not survive the fork
+        limit_worker_threads(threads)
+
+        from ..backends import get_backend
+        from .image_processor import ImageProcessor
+
+        processor = ImageProcessor(**kwargs)
+        processor.backend = backend if backend is not None else get_backend(**kwargs)
+        processor.backend.__enter__()
+        # Loading the backend may have applied a CPU profile's thread count
+        limit_worker_threads(threads)
+    except BaseException as e:
+        events.put(('error', index, f"{type(e).__name__}: {e}"))
+        return
+
+    try:
+        while True:
+            task = tasks.get()
+            if task is None:
+                break
+
+            file_index, output_path, block_name, shape = task
+            try:
+                block = shared_memory.SharedMemory(name=block_name)
+                try:
+                    image = np.ndarray(shape, dtype=np.uint8, buffer=block.buf)
+                    processor.save_image(output_path, processor.enhance(image))
+                    del image
+                finally:
+                    block.close()
+                events.put(('done', file_index, None))
+            except Exception as e:
+                events.put(('done', file_index, f"{type(e).__name__}: {e}"))
+    finally:
+        if backend is None:
+            processor.backend.cleanup()
@@ -10,7 +10,7 @@ from ..models import ModelManager
 from ..utils.display_utils import (
     display_processing_start, display_processing_complete,
     display_backend_info, print_info, print_success, print_warning,
-    console
+    console, fallback_summary_row, int8_summary_row
 )
 
 
@@ -23,6 +23,8 @@ class ImageProcessor:
     def __init__(self, global_progress=None, global_task=None, global_live=None,
                  file_frames=0, processed_frames=0, total_frames=0, 
                  file_index=0, total_files=0, **kwargs):
+        # Batch-wide BackendSession; kept out of kwargs, which are passed on to backends and workers
+        self.session = kwargs.pop('session', None)
         self.kwargs = kwargs
         self.backend = None
         self.model_manager = ModelManager()
@@ -35,6 +37,12 @@ class ImageProcessor:
         self.file_index = file_index
         self.total_files = total_files
     
+    def _get_backend(self):
+        """Backend for this file: the session's warm one in a batch, otherwise a new one."""
+        if self.session is not None:
+            return self.session.acquire(**self.kwargs)
+        return get_backend(**self.kwargs)
+    
     def process(self, input_path: str, output_path: str) -> None:
         """Process a single image."""
         start_time = time.time()
@@ -68,7 +76,7 @@ class ImageProcessor:
         image_for_processing = cv2.cvtColor(image_bgr, cv2.COLOR_BGR2RGB)
         
         # Get backend
-        self.backend = get_backend(**self.kwargs)
+        self.backend = self._get_backend()
         
         # Display backend information
         backend_info = {
@@ -110,41 +118,10 @@ class ImageProcessor:
             
             try:
                 # Upscale (returns RGB since input is RGB)
-                upscaled_rgb = self.backend.upscale(image_for_processing)
-                
-                # Optional: Match histogram to preserve original color tone
-                preserve_tone = self.kwargs.get('preserve_tone', True)
-                if preserve_tone:
-                    try:
-                        from ..utils.color_correction import match_histogram
-                        # Resize original for histogram matching
-                        h_up, w_up = upscaled_rgb.shape[:2]
-                        original_resized = cv2.resize(image_for_processing, (w_up, h_up), interpolation=cv2.INTER_LINEAR)
-                        upscaled_rgb = match_histogram(upscaled_rgb, original_resized)
-                        logger.info("Applied histogram matching to preserve color tone")
-                    except Exception as e:
-                        logger.warning(f"Could not apply histogram matching: {e}")
-                
-                # Face enhancement if requested
-                if self.kwargs.get('face_enhance', False):
-                    upscaled_rgb = self._enhance_faces(upscaled_rgb)
-                
-                # [TEST] Convert RGB back to BGR for saving
-                upscaled_bgr = cv2.cvtColor(upscaled_rgb, cv2.COLOR_RGB2BGR)
+                upscaled_rgb = self.enhance(image_for_processing)
                 
                 # Save result with high quality
-                output_file = Path(output_path)
-                output_file.parent.mkdir(parents=True, exist_ok=True)
-                
-                # Use high quality settings for PNG/JPEG
-                if str(output_file).lower().endswith('.png'):
-                    success = cv2.imwrite(str(output_file), upscaled_bgr, [cv2.IMWRITE_PNG_COMPRESSION, 0])
-                elif str(output_file).lower().endswith(('.jpg', '.jpeg')):
-                    success = cv2.imwrite(str(output_file), upscaled_bgr, [cv2.IMWRITE_JPEG_QUALITY, 100])
-                else:
-                    success = cv2.imwrite(str(output_file), upscaled_bgr)
-                if not success:
-                    raise RuntimeError(f"Failed to save image: {output_path}")
+                self.save_image(output_path, upscaled_rgb)
                 
                 if progress_format == 'bar':
                     # Mark image task as completed and hide it
@@ -174,8 +151,12 @@ class ImageProcessor:
                 end_time = time.time()
                 self.kwargs['backend_used'] = self.backend.__class__.__name__
                 if not self.global_progress:
+                    extra_rows = [row for row in (int8_summary_row(self.backend),
+                                                  fallback_summary_row(self.backend.fallbacks)) if row]
                     display_processing_complete(input_path, output_path, "IMAGE", 
-                                               start_time, end_time, **self.kwargs)
+                                               start_time, end_time,
+                                               extra_summary=extra_rows or None,
+                                               **self.kwargs)
                 
             except Exception as e:
                 if progress_format == 'bar':
@@ -183,6 +164,48 @@ class ImageProcessor:
                         local_progress.stop()
                 raise e
     
+    def enhance(self, image_rgb: np.ndarray) -> np.ndarray:
+        """Upscale an RGB image with the current backend and apply the post-processing options."""
+        upscaled_rgb = self.backend.upscale(image_rgb)
+        
+        # Optional: Match histogram to preserve original color tone
+        preserve_tone = self.kwargs.get('preserve_tone', True)
+        if preserve_tone:
+            try:
+                from ..utils.color_correction import match_histogram
+                # Resize original for histogram matching
+                h_up, w_up = upscaled_rgb.shape[:2]
+                original_resized = cv2.resize(image_rgb, (w_up, h_up), interpolation=cv2.INTER_LINEAR)
+                upscaled_rgb = match_histogram(upscaled_rgb, original_resized)
+                logger.info("Applied histogram matching to preserve color tone")
+            except Exception as e:
+                logger.warning(f"Could not apply histogram matching: {e}")
+        
+        # Face enhancement if requested
+        if self.kwargs.get('face_enhance', False):
+            upscaled_rgb = self._enhance_faces(upscaled_rgb)
+        
+        return upscaled_rgb
+    
+    @staticmethod
+    def save_image(output_path: str, image_rgb: np.ndarray) -> None:
+        """Write an RGB image losslessly (PNG) or at maximum quality (JPEG)."""
+        # [TEST] Convert RGB back to BGR for saving
+        upscaled_bgr = cv2.cvtColor(image_rgb, cv2.COLOR_RGB2BGR)
+        
+        output_file = Path(output_path)
+        output_file.parent.mkdir(parents=True, exist_ok=True)
+        
+        # Use high quality settings for PNG/JPEG
+        if str(output_file).lower().endswith('.png'):
+            success = cv2.imwrite(str(output_file), upscaled_bgr, [cv2.IMWRITE_PNG_COMPRESSION, 0])
+        elif str(output_file).lower().endswith(('.jpg', '.jpeg')):
+            success = cv2.imwrite(str(output_file), upscaled_bgr, [cv2.IMWRITE_JPEG_QUALITY, 100])
+        else:
+            success = cv2.imwrite(str(output_file), upscaled_bgr)
+        if not success:
+            raise RuntimeError(f"Failed to save image: {output_path}")
+    
     def _enhance_faces(self, image: np.ndarray) -> np.ndarray:
         """Enhance faces using GFPGAN."""
         try:
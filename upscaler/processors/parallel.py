@@ -0,0 +1,155 @@
+"""
+Segment-parallel video processing across worker processes.
+"""
+
+import logging
+import multiprocessing
+import os
+import queue
+from pathlib import Path
+from typing import Any, Callable, Dict, List, Optional, Tuple
+
+
+logger = logging.getLogger(__name__)
+
+# (start_frame, frame_count, start_time); frame_count is None for the last segment
+Segment = Tuple[int, Optional[int], float]
+
+
+def plan_segments(keyframe_times: List[float], fps: float, total_frames: int,
+                  workers: int) -> List[Segment]:
+    """Split a video into at most ``workers`` segments that each start on a keyframe.
+
+    Cut points are the keyframes nearest to an even split of the frames, so
+    every worker can seek straight to its first frame and decode independently.
+    """
+    if workers < 2 or fps <= 0 or total_frames <= 0 or not keyframe_times:
+        return [(0, None, 0.0)]
+
+    first = keyframe_times[0]
+    keyframes = {}
+    for t in keyframe_times:
+        frame = int(round((t - first) * fps))
+        if 0 < frame < total_frames:
+            keyframes.setdefault(frame, t - first)
+
+    cuts = []
+    candidates = sorted(keyframes)
+    for i in range(1, workers):
+        target = i * total_frames / workers
+        remaining = [f for f in candidates if not cuts or f > cuts[-1]]
+        if not remaining:
+            break
+        cuts.append(min(remaining, key=lambda f: abs(f - target)))
+
+    cuts = sorted(set(cuts))
+    starts = [0] + cuts
+    segments = []
+    for i, start in enumerate(starts):
+        is_last = i == len(starts) - 1
+        frame_count = None if is_last else starts[i + 1] - start
+        # Seek half a frame early so timestamp rounding cannot drop the keyframe
+        start_time = max(0.0, keyframes.get(start, 0.0) - 0.5 / fps) if start else 0.0
+        segments.append((start, frame_count, start_time))
+
+    return segments
+
+
+def run_segment_workers(input_path: str, segment_paths: List[Path], segments: List[Segment],
+                        video_info: Dict[str, Any], kwargs: Dict[str, Any], workers: int,
+                        on_frame: Optional[Callable[[int], None]] = None) -> List[Dict[str, int]]:
+    """Upscale every segment in its own process and return the per-segment stats.
+
+    Each worker loads its own backend and limits its CPU threads so the workers
+    share the machine instead of oversubscribing it.
+    """
+    ctx = multiprocessing.get_context('spawn')
+    events = ctx.Queue()
+    threads = max(1, (os.cpu_count() or 1) // workers)
+
+    processes = []
+    for index, ((_, frame_count, start_time), segment_path) in enumerate(zip(segments, segment_paths)):
+        process = ctx.Process(
+            target=_segment_worker,
+            args=(index, input_path, str(segment_path), start_time, frame_count,
+                  video_info, kwargs, threads, events),
+            name=f'upscaler-segment-{index}',
+            daemon=True,
+        )
+        process.start()
+        processes.append(process)
+
+    frames_done = [0] * len(processes)
+    stats = [None] * len(processes)
+
+    try:
+        while any(s is None for s in stats):
+            try:
+                kind, index, payload = events.get(timeout=0.5)
+            except queue.Empty:
+                # A worker that died without reporting (e.g. killed by the OS)
+                for index, process in enumerate(processes):
+                    if stats[index] is None and not process.is_alive() and process.exitcode != 0:
+                        raise RuntimeError(
+                            f"Segment worker {index} exited with code {process.exitcode}"
+                        )
+                continue
+
+            if kind == 'progress':
+                frames_done[index] = payload
+                if on_frame is not None:
+                    on_frame(sum(frames_done))
+            elif kind == 'done':
+                stats[index] = payload
+                logger.info(f"Segment {index} finished ({payload['frames']} frames)")
+            else:
+                raise RuntimeError(f"Segment worker {index} failed: {payload}")
+
+        for process in processes:
+            process.join()
+    finally:
+        for process in processes:
+            if process.is_alive():
+                process.terminate()
+            process.join()
+        events.close()
+
+    return stats
+
+
+def _segment_worker(index: int, input_path: str, segment_path: str, start_time: float,
+                    frame_count: Optional[int], video_info: Dict[str, Any],
+                    kwargs: Dict[str, Any], threads: int, events) -> None:
+    """Process entry point: upscale one segment and report progress through events."""
+    try:
+        from ..backends import accepts_threads
+        from ..backends.cpu_profile import limit_worker_threads
+        threads = min(kwargs.get('threads') or threads, threads)
+        limit_worker_threads(threads)
+
+        from .video_processor import VideoProcessor
+
+        frames_done = [0]
+
+        def progress_callback(frames: int, total: int) -> None:
+            frames_done[0] = frames
+            events.put(('progress', index, frames))
+
+        worker_kwargs = dict(kwargs, progress='none', workers=1)
+        if accepts_threads(kwargs):
+            # The worker's share of the cores overrides the CPU profile's thread
+            # count; under --backend auto it would change the backend picked
+            worker_kwargs['threads'] = threads
+        processor = VideoProcessor(progress_callback=progress_callback, **worker_kwargs)
+        processor.process_segment(input_path, segment_path, start_time, frame_count, video_info)
+
+        backend = processor.backend
+        events.put(('done', index, {
+            'frames': frames_done[0],
+            'frames_reused': processor.frames_reused,
+            'tiles_reused': getattr(backend, 'tiles_reused', 0),
+            'tiles_total': getattr(backend, 'tiles_total', 0),
+            'fallbacks': getattr(backend, 'fallbacks', []),
+        }))
+    except BaseException as e:
+        events.put(('error', index, f"{type(e).__name__}: {e}"))
@@ -10,20 +10,28 @@ from typing import Optional, Dict, Any
 # from tqdm import tqdm  # Replaced with rich.progress
 import tempfile
 import os
+import hashlib
+from contextlib import contextmanager
 
 from ..backends import get_backend
 from ..models import ModelManager
-from ..utils.video import get_video_info, get_ffmpeg_path, Y4MReader, Y4MWriter
+from ..utils.video import get_video_info, get_keyframe_times, get_ffmpeg_path, Y4MReader, Y4MWriter
+from ..utils.pipeline import FramePipeline
+from ..utils.segments import SegmentManifest, SegmentedY4MWriter, concat_segments, remove_work_dir
+from .parallel import plan_segments, run_segment_workers
 from ..utils.display_utils import (
     display_processing_start, display_video_info, 
     display_processing_complete, display_backend_info,
     print_info, print_success, print_warning,
-    create_progress, console, set_windows_terminal_progress
+    create_progress, console, set_windows_terminal_progress, fallback_summary_row, int8_summary_row
 )
 
 
 logger = logging.getLogger(__name__)
 
+# Pipeline placeholder for a frame identical to the one before it
+_DUPLICATE = object()
+
 
 class VideoProcessor:
     """Process videos for upscaling."""
@@ -31,9 +39,11 @@ class VideoProcessor:
     def __init__(self, stdin: bool = False, stdout: bool = False, 
                  global_progress=None, global_task=None, global_live=None,
                  file_frames=0, processed_frames=0, total_frames=0, 
-                 file_index=0, total_files=0, **kwargs):
+                 file_index=0, total_files=0, progress_callback=None, **kwargs):
         self.stdin = stdin
         self.stdout = stdout
+        # Batch-wide BackendSession; kept out of kwargs, which are passed on to backends and workers
+        self.session = kwargs.pop('session', None)
         self.kwargs = kwargs
         self.backend = None
         self.model_manager = ModelManager()
@@ -45,6 +55,17 @@ class VideoProcessor:
         self.total_frames = total_frames
         self.file_index = file_index
         self.total_files = total_files
+        self.progress_callback = progress_callback
+        self.frames_reused = 0
+        self.tiles_reused = 0
+        self.tiles_total = 0
+        self.fallbacks = []
+    
+    def _get_backend(self):
+        """Backend for this file: the session's warm one in a batch, otherwise a new one."""
+        if self.session is not None:
+            return self.session.acquire(**self.kwargs)
+        return get_backend(**self.kwargs)
     
     def process(self, input_path: str, output_path: str) -> None:
         """Process a video file or stream."""
@@ -69,7 +90,26 @@ class VideoProcessor:
             end_time = time.time()
             self.kwargs['backend_used'] = self.backend.__class__.__name__ if self.backend else 'unknown'
             display_processing_complete(input_path, output_path, "VIDEO", 
-                                       start_time, end_time, **self.kwargs)
+                                       start_time, end_time,
+                                       extra_summary=self._summary_rows(), **self.kwargs)
+    
+    def upscale_file(self, input_path: str, output_path: str) -> None:
+        """Upscale a video file through the streaming pipeline without any console output.
+        
+        Progress is only reported to progress_callback. For callers that own the
+        display and the backend lifecycle (the service, the library API).
+        """
+        self.kwargs['progress'] = 'none'
+        video_info = get_video_info(input_path)
+        scale = self.kwargs.get('scale', 4)
+        
+        if self.backend is None:
+            self.backend = self._get_backend()
+        with self.backend:
+            self._stream_and_process(
+                input_path, output_path, video_info,
+                video_info['width'] * scale, video_info['height'] * scale
+            )
     
     def _process_file(self, input_path: str, output_path: str) -> None:
         """Process a video file."""
@@ -96,8 +136,14 @@ class VideoProcessor:
         
         logger.info(f"Output video: {out_width}x{out_height}")
         
+        # Segment-parallel processing loads one backend per worker, not here
+        if self.kwargs.get('workers', 1) > 1 and self.kwargs.get('resume_dir'):
+            logger.warning("--workers is not supported with --resume-dir, processing in one process")
+        elif self.kwargs.get('workers', 1) > 1 and self._process_parallel(input_path, output_path, video_info):
+            return
+        
         # Get backend
-        self.backend = get_backend(**self.kwargs)
+        self.backend = self._get_backend()
         
         # Display backend information (only for single file processing)
         backend_info = {
@@ -109,22 +155,33 @@ class VideoProcessor:
             display_backend_info(self.backend.__class__.__name__, backend_info)
             print_success(f"Backend initialized: {self.backend.__class__.__name__}")
         
-        # Create temporary files for processing
-        with tempfile.TemporaryDirectory(prefix='upscaler_') as temp_dir:
-            temp_input_y4m = os.path.join(temp_dir, 'input.y4m')
-            temp_output_y4m = os.path.join(temp_dir, 'output.y4m')
-            
-            # Process video
-            with self.backend:
-                self._extract_and_process(
-                    input_path, temp_input_y4m, temp_output_y4m, 
-                    video_info, out_width, out_height
+        # Process video
+        with self.backend:
+            if self.kwargs.get('resume_dir'):
+                # Persistent, segment-checkpointed processing
+                self._process_resumable(
+                    input_path, output_path, video_info, out_width, out_height
                 )
-                
-                # Encode final video
-                self._encode_final_video(
-                    temp_output_y4m, input_path, output_path, video_info
+            elif self.kwargs.get('stream', True):
+                # Decoder -> upscaler -> encoder through pipes, no intermediate files
+                self._stream_and_process(
+                    input_path, output_path, video_info, out_width, out_height
                 )
+            else:
+                # Create temporary files for processing
+                with tempfile.TemporaryDirectory(prefix='upscaler_') as temp_dir:
+                    temp_input_y4m = os.path.join(temp_dir, 'input.y4m')
+                    temp_output_y4m = os.path.join(temp_dir, 'output.y4m')
+                    
+                    self._extract_and_process(
+                        input_path, temp_input_y4m, temp_output_y4m, 
+                        video_info, out_width, out_height
+                    )
+                    
+                    # Encode final video
+                    self._encode_final_video(
+                        temp_output_y4m, input_path, output_path, video_info
+                    )
     
     def _process_stdin_stream(self, output_path: str) -> None:
         """Process video from stdin."""
@@ -140,7 +197,7 @@ class VideoProcessor:
         out_height = header['height'] * scale
         
         # Get backend
-        self.backend = get_backend(**self.kwargs)
+        self.backend = self._get_backend()
         
         # Process stream
         with self.backend:
@@ -148,33 +205,19 @@ class VideoProcessor:
                 y4m_writer = Y4MWriter(output_file, out_width, out_height, header['fps'])
                 y4m_writer.write_header()
                 
-                frame_count = 0
-                while True:
-                    frame_data = y4m_reader.read_frame()
-                    if frame_data is None:
-                        break
-                    
-                    # Convert YUV to RGB
-                    frame_rgb = self._yuv420p_to_rgb(frame_data, header['width'], header['height'])
-                    
-                    # Upscale
-                    upscaled_rgb = self.backend.upscale(frame_rgb)
-                    
-                    # Convert back to YUV
-                    upscaled_yuv = self._rgb_to_yuv420p(upscaled_rgb)
-                    
-                    # Write frame
-                    y4m_writer.write_frame(upscaled_yuv)
-                    
-                    frame_count += 1
+                def on_frame(frame_count: int) -> None:
                     if frame_count % 10 == 0:
                         logger.info(f"Processed {frame_count} frames")
                 
+                pipeline = self._build_pipeline(y4m_reader, y4m_writer, header)
+                self._enable_temporal_reuse()
+                frame_count = pipeline.run(on_frame=on_frame)
+                
                 # Clear Windows Terminal progress indicator only if not part of batch and not using Live
                 if not self.global_progress and self.global_live is None:
                     set_windows_terminal_progress(0, state=0)  # Hide progress
                 
-                logger.info(f"Stream processing completed: {frame_count} frames")
+                logger.info(f"Stream processing completed: {frame_count} frames ({self.frames_reused} duplicates reused)")
     
     def _process_stdout_stream(self, input_path: str) -> None:
         """Process video to stdout."""
@@ -187,7 +230,7 @@ class VideoProcessor:
         out_height = video_info['height'] * scale
         
         # Get backend
-        self.backend = get_backend(**self.kwargs)
+        self.backend = self._get_backend()
         
         # Process and output to stdout
         with self.backend:
@@ -202,13 +245,7 @@ class VideoProcessor:
         """Extract frames, process them, and create output Y4M."""
         
         # Extract to Y4M
-        ffmpeg_cmd = [
-            get_ffmpeg_path(),
-            '-i', input_path,
-            '-f', 'yuv4mpegpipe',
-            '-pix_fmt', 'yuv420p',
-            '-y', temp_input
-        ]
+        ffmpeg_cmd = self._build_decode_cmd(input_path, temp_input)
         
         logger.info("Extracting video to Y4M format...")
         subprocess.run(ffmpeg_cmd, check=True, capture_output=True)
@@ -222,130 +259,416 @@ class VideoProcessor:
                 y4m_writer = Y4MWriter(output_file, out_width, out_height, header['fps'])
                 y4m_writer.write_header()
                 
-                # Setup progress tracking
-                total_frames = video_info.get('nb_frames', 0) or self.file_frames or 0
-                progress_format = self.kwargs.get('progress', 'bar')
-                frame_count = 0
-                start_time = time.time()
+                self._process_frames(y4m_reader, y4m_writer, header, video_info)
+    
+    def _stream_and_process(self, input_path: str, output_path: str, video_info: Dict[str, Any],
+                            out_width: int, out_height: int) -> None:
+        """Decode, upscale and encode through pipes without intermediate Y4M files.
+        
+        The decoder ffmpeg feeds Y4MReader over a pipe and Y4MWriter feeds the
+        encoder ffmpeg, which also muxes the audio, so encoding overlaps with
+        inference and disk usage stays bounded by the final output.
+        """
+        logger.info("Starting streaming decode -> upscale -> encode pipeline...")
+        self._pipe_through(
+            self._build_decode_cmd(input_path, '-'),
+            self._build_encode_cmd('-', input_path, output_path),
+            video_info, out_width, out_height
+        )
+        
+        logger.info(f"Video encoding completed: {output_path}")
+        
+        # Final progress update
+        if self.kwargs.get('progress') == 'json':
+            print(f'{{"status": "completed", "progress": 1.0, "message": "Video processing completed"}}')
+    
+    def _pipe_through(self, decode_cmd: list, encode_cmd: list, video_info: Dict[str, Any],
+                      out_width: int, out_height: int) -> None:
+        """Upscale the Y4M stream of decode_cmd into the stdin of encode_cmd."""
+        decoder_log = tempfile.TemporaryFile()
+        encoder_log = tempfile.TemporaryFile()
+        decoder = None
+        encoder = None
+        
+        try:
+            decoder = subprocess.Popen(decode_cmd, stdout=subprocess.PIPE, stderr=decoder_log)
+            
+            y4m_reader = Y4MReader(decoder.stdout)
+            try:
+                header = y4m_reader.read_header()
+            except ValueError:
+                decoder.wait()
+                raise RuntimeError(f"Video decoding failed: {self._read_log(decoder_log)}")
+            
+            encoder = subprocess.Popen(
+                encode_cmd, stdin=subprocess.PIPE, stdout=subprocess.DEVNULL, stderr=encoder_log
+            )
+            
+            y4m_writer = Y4MWriter(encoder.stdin, out_width, out_height, header['fps'])
+            try:
+                y4m_writer.write_header()
+                self._process_frames(y4m_reader, y4m_writer, header, video_info)
+                encoder.stdin.close()
+            except BrokenPipeError:
+                encoder.wait()
+                raise RuntimeError(f"Video encoding failed: {self._read_log(encoder_log)}")
+            
+            encoder.wait()
+            decoder.wait()
+            
+            if decoder.returncode != 0:
+                raise RuntimeError(f"Video decoding failed: {self._read_log(decoder_log)}")
+            if encoder.returncode != 0:
+                logger.error(f"Video encoding failed: {self._read_log(encoder_log)}")
+                raise RuntimeError(f"Video encoding failed with exit code {encoder.returncode}")
+        finally:
+            # Make sure no ffmpeg process outlives a failed or interrupted run
+            for proc in (decoder, encoder):
+                if proc is not None and proc.poll() is None:
+                    proc.kill()
+                    proc.wait()
+            decoder_log.close()
+            encoder_log.close()
+    
+    def process_segment(self, input_path: str, segment_path: str, start_time: float,
+                        frame_count: int, video_info: Dict[str, Any]) -> None:
+        """Upscale frame_count frames from start_time of input_path into a video-only segment."""
+        scale = self.kwargs.get('scale', 4)
+        segment_info = dict(video_info, nb_frames=frame_count or 0)
+        
+        self.backend = self._get_backend()
+        with self.backend:
+            self._pipe_through(
+                self._build_decode_cmd(input_path, '-', start_time=start_time, frame_count=frame_count),
+                self._build_segment_encode_cmd(segment_path),
+                segment_info, video_info['width'] * scale, video_info['height'] * scale
+            )
+    
+    def _process_parallel(self, input_path: str, output_path: str, video_info: Dict[str, Any]) -> bool:
+        """Upscale keyframe-aligned segments in worker processes and stitch them.
+        
+        Returns False, without doing any work, when the video cannot be split
+        into more than one segment so the caller can fall back to a single run.
+        """
+        workers = self.kwargs.get('workers', 1)
+        fps = video_info.get('fps', 0)
+        total_frames = video_info.get('nb_frames', 0)
+        
+        try:
+            keyframe_times = get_keyframe_times(input_path)
+        except RuntimeError as e:
+            logger.warning(f"Keyframe probe failed, processing without workers: {e}")
+            return False
+        
+        segments = plan_segments(keyframe_times, fps, total_frames, workers)
+        if len(segments) < 2:
+            logger.info("Video has too few keyframes to split, processing without workers")
+            return False
+        
+        logger.info(f"Processing {len(segments)} segments with {workers} workers")
+        with tempfile.TemporaryDirectory(prefix='upscaler_parallel_') as temp_dir:
+            segment_paths = [Path(temp_dir) / f"segment_{i:05d}.mp4" for i in range(len(segments))]
+            
+            with self._frame_progress(total_frames) as on_frame:
+                stats = run_segment_workers(
+                    input_path, segment_paths, segments, video_info,
+                    self.kwargs, workers, on_frame
+                )
+            
+            self.frames_reused = sum(s.get('frames_reused', 0) for s in stats)
+            self.tiles_reused = sum(s.get('tiles_reused', 0) for s in stats)
+            self.tiles_total = sum(s.get('tiles_total', 0) for s in stats)
+            self.fallbacks = [f for s in stats for f in s.get('fallbacks', [])]
+            
+            audio_source = input_path if self.kwargs.get('copy_audio', True) else None
+            concat_segments(segment_paths, output_path, Path(temp_dir), audio_source=audio_source)
+        
+        logger.info(f"Video encoding completed: {output_path}")
+        
+        if self.kwargs.get('progress') == 'json':
+            print(f'{{"status": "completed", "progress": 1.0, "message": "Video processing completed"}}')
+        return True
+    
+    def _process_resumable(self, input_path: str, output_path: str, video_info: Dict[str, Any],
+                           out_width: int, out_height: int) -> None:
+        """Upscale into checkpointed segments under --resume-dir, skipping committed ones.
+        
+        Output is encoded in fixed-length segments recorded in a manifest. A
+        restart with the same input and options skips the frames already covered
+        and the segments are concatenated (with audio) once every frame is done.
+        """
+        # Inputs with the same name in different folders get separate checkpoints
+        path_hash = hashlib.sha1(str(Path(input_path).absolute()).encode('utf-8')).hexdigest()[:8]
+        work_dir = Path(self.kwargs['resume_dir']) / f"{Path(input_path).stem}-{path_hash}"
+        manifest = SegmentManifest(work_dir, self._job_key(input_path))
+        
+        if not manifest.is_complete:
+            completed = manifest.completed_frames()
+            decoder_log = tempfile.TemporaryFile()
+            decoder = subprocess.Popen(
+                self._build_decode_cmd(input_path, '-'),
+                stdout=subprocess.PIPE, stderr=decoder_log
+            )
+            segment_writer = None
+            
+            try:
+                y4m_reader = Y4MReader(decoder.stdout)
+                try:
+                    header = y4m_reader.read_header()
+                except ValueError:
+                    decoder.wait()
+                    raise RuntimeError(f"Video decoding failed: {self._read_log(decoder_log)}")
+                
+                # Skip frames that are already encoded in committed segments
+                if completed:
+                    logger.info(f"Skipping {completed} frames from completed segments")
+                for _ in range(completed):
+                    if y4m_reader.read_frame() is None:
+                        break
                 
-                if progress_format == 'bar' and total_frames > 0:
-                    # Use global progress if available, otherwise create new one
-                    if self.global_progress:
-                        progress = self.global_progress
-                        # Add sub-task for this video with file index
-                        task = progress.add_task(f"🎬 [{self.file_index}/{self.total_files}] Upscaling frames", total=total_frames)
-                        use_context_manager = False
+                segment_writer = SegmentedY4MWriter(
+                    manifest, out_width, out_height, header['fps'],
+                    segment_frames=self.kwargs.get('segment_frames', 600),
+                    start_frame=completed,
+                    build_encode_cmd=self._build_segment_encode_cmd
+                )
+                
+                remaining_info = dict(video_info)
+                if video_info.get('nb_frames'):
+                    remaining_info['nb_frames'] = max(0, video_info['nb_frames'] - completed)
+                self.processed_frames += completed
+                
+                self._process_frames(y4m_reader, segment_writer, header, remaining_info)
+                segment_writer.close()
+                manifest.mark_complete(segment_writer.next_frame)
+            except BaseException:
+                if segment_writer is not None:
+                    segment_writer.abort()
+                raise
+            finally:
+                if decoder.poll() is None:
+                    decoder.kill()
+                decoder.wait()
+                decoder_log.close()
+        else:
+            logger.info("All segments already encoded, concatenating")
+        
+        logger.info(f"Concatenating {len(manifest.segments)} segments...")
+        concat_segments(
+            manifest.segment_paths(), output_path, work_dir,
+            audio_source=input_path if self.kwargs.get('copy_audio', True) else None
+        )
+        remove_work_dir(work_dir)
+        logger.info(f"Video encoding completed: {output_path}")
+    
+    def _job_key(self, input_path: str) -> str:
+        """Fingerprint of the input file and every option that changes the output."""
+        stat = os.stat(input_path)
+        fields = {
+            'input': str(Path(input_path).absolute()),
+            'size': stat.st_size,
+            'mtime': stat.st_mtime,
+        }
+        for option in ('backend', 'model', 'scale', 'tile', 'tile_overlap', 'blend', 'int8', 'fuse', 'gamma', 'fp16',
+                       'face_enhance', 'face_strength', 'denoise', 'tile_reuse_tolerance',
+                       'segment_frames'):
+            fields[option] = self.kwargs.get(option)
+        return hashlib.sha256(json.dumps(fields, sort_keys=True).encode('utf-8')).hexdigest()
+    
+    def _build_pipeline(self, y4m_reader: Y4MReader, y4m_writer: Y4MWriter,
+                        header: Dict[str, Any]) -> FramePipeline:
+        """Wire the Y4M reader, color conversion, backend and writer into a FramePipeline.
+        
+        With deduplication enabled, each raw frame is hashed on the reader thread.
+        A frame identical to its predecessor skips conversion and inference and the
+        writer repeats the previous upscaled YUV bytes instead.
+        """
+        width, height = header['width'], header['height']
+        face_enhance = self.kwargs.get('face_enhance', False)
+        dedup = self.kwargs.get('dedup', True)
+        last_digest = [None]
+        last_written = [None]
+        
+        def read():
+            frame_data = y4m_reader.read_frame()
+            if frame_data is None or not dedup:
+                return frame_data
+            
+            digest = hashlib.blake2b(frame_data, digest_size=16).digest()
+            if digest == last_digest[0]:
+                self.frames_reused += 1
+                return _DUPLICATE
+            last_digest[0] = digest
+            return frame_data
+        
+        def convert(frame_data):
+            if frame_data is _DUPLICATE:
+                return _DUPLICATE
+            return self._yuv420p_to_rgb(frame_data, width, height)
+        
+        def infer(frames_rgb: list) -> list:
+            unique = [frame for frame in frames_rgb if frame is not _DUPLICATE]
+            
+            # Upscale (batched when --batch-size > 1)
+            upscaled_frames = self.backend.upscale_batch(unique) if unique else []
+            
+            # Face enhancement if requested
+            if face_enhance:
+                upscaled_frames = [self._enhance_faces(frame) for frame in upscaled_frames]
+            
+            upscaled = iter(upscaled_frames)
+            return [_DUPLICATE if frame is _DUPLICATE else next(upscaled) for frame in frames_rgb]
+        
+        def encode(upscaled_rgb):
+            if upscaled_rgb is _DUPLICATE:
+                return _DUPLICATE
+            return self._rgb_to_yuv420p(upscaled_rgb)
+        
+        def write(upscaled_yuv) -> None:
+            if upscaled_yuv is _DUPLICATE:
+                upscaled_yuv = last_written[0]
+            y4m_writer.write_frame(upscaled_yuv)
+            last_written[0] = upscaled_yuv
+        
+        return FramePipeline(
+            read_fn=read,
+            convert_fn=convert,
+            infer_fn=infer,
+            encode_fn=encode,
+            write_fn=write,
+            queue_depth=self.kwargs.get('queue_depth', 4),
+            batch_size=self.kwargs.get('batch_size') or self.backend.batch_size
+        )
+    
+    def _process_frames(self, y4m_reader: Y4MReader, y4m_writer: Y4MWriter,
+                        header: Dict[str, Any], video_info: Dict[str, Any]) -> None:
+        """Upscale every frame from y4m_reader into y4m_writer with progress reporting."""
+        
+        pipeline = self._build_pipeline(y4m_reader, y4m_writer, header)
+        self._enable_temporal_reuse()
+        
+        total_frames = video_info.get('nb_frames', 0) or self.file_frames or 0
+        with self._frame_progress(total_frames) as on_frame:
+            frame_count = pipeline.run(on_frame=on_frame)
+        
+        logger.info(f"Processed {frame_count} frames ({self.frames_reused} duplicates reused)")
+        if getattr(self.backend, 'tiles_total', 0):
+            logger.info(f"Temporal tile reuse: {self.backend.tiles_reused}/{self.backend.tiles_total} tiles")
+    
+    @contextmanager
+    def _frame_progress(self, total_frames: int):
+        """Yield an on_frame(frame_count) callback driving the configured progress display."""
+        
+        # Setup progress tracking
+        progress_format = self.kwargs.get('progress', 'bar')
+        start_time = time.time()
+        
+        if progress_format == 'bar' and total_frames > 0:
+            # Use global progress if available, otherwise create new one
+            if self.global_progress:
+                progress = self.global_progress
+                # Add sub-task for this video with file index
+                task = progress.add_task(f"🎬 [{self.file_index}/{self.total_files}] Upscaling frames", total=total_frames)
+                use_context_manager = False
+            else:
+                progress_context = create_progress()
+                progress = progress_context.__enter__()
+                task = progress.add_task("🎬 Upscaling frames", total=total_frames)
+                use_context_manager = True
+            
+            # Time-based refresh control (80ms intervals)
+            next_refresh_time = [0.0]
+            REFRESH_INTERVAL = 0.08  # 80ms for smooth updates without flicker
+            
+            def on_frame(frame_count: int) -> None:
+                # Calculate speed
+                elapsed = time.time() - start_time
+                speed = frame_count / elapsed if elapsed > 0 else 0
+                
+                # Update progress internally (no refresh)
+                progress.update(task, completed=frame_count, speed=speed)
+                
+                # Update global progress if available
+                if (self.global_progress is not None) and (self.global_task is not None):
+                    # Update total progress based on actual frames processed
+                    current_total_frames = self.processed_frames + frame_count
+                    self.global_progress.update(self.global_task, completed=current_total_frames)
+                
+                # Time-based screen refresh
+                current_time = time.perf_counter()
+                if current_time >= next_refresh_time[0] or frame_count == total_frames:
+                    # Live가 화면을 소유한다면 Live를, 아니면 Progress를 새로고침
+                    if self.global_live is not None:
+                        self.global_live.refresh()
                     else:
-                        progress_context = create_progress()
-                        progress = progress_context.__enter__()
-                        task = progress.add_task("🎬 Upscaling frames", total=total_frames)
-                        use_context_manager = True
+                        progress.refresh()
+                    next_refresh_time[0] = current_time + REFRESH_INTERVAL
                     
+                    # Update Windows Terminal progress indicator (only if not using Live)
+                    if self.global_live is None:
+                        percent = (frame_count / total_frames) * 100 if total_frames else 0
+                        set_windows_terminal_progress(percent)
+                
+                if self.progress_callback is not None:
+                    self.progress_callback(frame_count, total_frames)
+            
+            try:
+                yield on_frame
+            finally:
+                # Mark sub-task as completed (100%)
+                if self.global_progress is not None:
+                    progress.update(task, completed=total_frames)
+                    # Stop task instead of removing to prevent screen refresh
                     try:
-                        # Time-based refresh control (80ms intervals)
-                        next_refresh_time = 0.0
-                        REFRESH_INTERVAL = 0.08  # 80ms for smooth updates without flicker
-                        
-                        while True:
-                            frame_data = y4m_reader.read_frame()
-                            if frame_data is None:
-                                break
-                            
-                            # Convert YUV to RGB
-                            frame_rgb = self._yuv420p_to_rgb(frame_data, header['width'], header['height'])
-                            
-                            # Upscale
-                            upscaled_rgb = self.backend.upscale(frame_rgb)
-                            
-                            # Face enhancement if requested
-                            if self.kwargs.get('face_enhance', False):
-                                upscaled_rgb = self._enhance_faces(upscaled_rgb)
-                            
-                            # Convert back to YUV
-                            upscaled_yuv = self._rgb_to_yuv420p(upscaled_rgb)
-                            
-                            # Write frame
-                            y4m_writer.write_frame(upscaled_yuv)
-                            
-                            frame_count += 1
-                            
-                            # Calculate speed
-                            elapsed = time.time() - start_time
-                            speed = frame_count / elapsed if elapsed > 0 else 0
-                            
-                            # Update progress internally (no refresh)
-                            progress.update(task, advance=1, speed=speed)
-                            
-                            # Update global progress if available
-                            if (self.global_progress is not None) and (self.global_task is not None):
-                                # Update total progress based on actual frames processed
-                                current_total_frames = self.processed_frames + frame_count
-                                self.global_progress.update(self.global_task, completed=current_total_frames)
-                            
-                            # Time-based screen refresh
-                            current_time = time.perf_counter()
-                            if current_time >= next_refresh_time or frame_count == total_frames:
-                                # Live가 화면을 소유한다면 Live를, 아니면 Progress를 새로고침
-                                if self.global_live is not None:
-                                    self.global_live.refresh()
-                                else:
-                                    progress.refresh()
-                                next_refresh_time = current_time + REFRESH_INTERVAL
-                                
-                                # Update Windows Terminal progress indicator (only if not using Live)
-                                if self.global_live is None:
-                                    percent = (frame_count / total_frames) * 100 if total_frames else 0
-                                    set_windows_terminal_progress(percent)
-                    finally:
-                        # Mark sub-task as completed (100%)
-                        if (self.global_progress is not None) and ('task' in locals()):
-                            progress.update(task, completed=total_frames)
-                            # Stop task instead of removing to prevent screen refresh
-                            try:
-                                # Rich 13+ supports visible=False
-                                progress.update(task, visible=False)
-                            except TypeError:
-                                # Fallback for older versions
-                                progress.stop_task(task)
-                        
-                        # Clean up context manager if we created one
-                        if use_context_manager and 'progress_context' in locals():
-                            progress_context.__exit__(None, None, None)
-                else:
-                    # No progress bar mode
-                    while True:
-                        frame_data = y4m_reader.read_frame()
-                        if frame_data is None:
-                            break
-                        
-                        # Convert YUV to RGB
-                        frame_rgb = self._yuv420p_to_rgb(frame_data, header['width'], header['height'])
-                        
-                        # Upscale
-                        upscaled_rgb = self.backend.upscale(frame_rgb)
-                        
-                        # Face enhancement if requested
-                        if self.kwargs.get('face_enhance', False):
-                            upscaled_rgb = self._enhance_faces(upscaled_rgb)
-                        
-                        # Convert back to YUV
-                        upscaled_yuv = self._rgb_to_yuv420p(upscaled_rgb)
-                        
-                        # Write frame
-                        y4m_writer.write_frame(upscaled_yuv)
-                        
-                        frame_count += 1
-                        
-                        # JSON progress update
-                        if progress_format == 'json':
-                            json_progress = frame_count / total_frames if total_frames > 0 else 0
-                            print(f'{{"status": "processing", "progress": {json_progress:.3f}, "frame": {frame_count}}}')
+                        # Rich 13+ supports visible=False
+                        progress.update(task, visible=False)
+                    except TypeError:
+                        # Fallback for older versions
+                        progress.stop_task(task)
                 
-                logger.info(f"Processed {frame_count} frames")
+                # Clean up context manager if we created one
+                if use_context_manager:
+                    progress_context.__exit__(None, None, None)
+        else:
+            # No progress bar mode
+            def on_frame(frame_count: int) -> None:
+                # JSON progress update
+                if progress_format == 'json':
+                    json_progress = frame_count / total_frames if total_frames > 0 else 0
+                    print(f'{{"status": "processing", "progress": {json_progress:.3f}, "frame": {frame_count}}}')
                 
-                # Clear Windows Terminal progress indicator only if not part of batch and not using Live
-                if not self.global_progress and self.global_live is None:
-                    set_windows_terminal_progress(0, state=0)  # Hide progress
+                if self.progress_callback is not None:
+                    self.progress_callback(frame_count, total_frames)
+            
+            yield on_frame
+        
+        # Clear Windows Terminal progress indicator only if not part of batch and not using Live
+        if not self.global_progress and self.global_live is None and progress_format != 'none':
+            set_windows_terminal_progress(0, state=0)  # Hide progress
+    
+    def _enable_temporal_reuse(self) -> None:
+        """Let the backend reuse unchanged tiles from the previous frame of this video."""
+        tolerance = self.kwargs.get('tile_reuse_tolerance', 0)
+        self.backend.enable_temporal_reuse(tolerance if tolerance is not None and tolerance >= 0 else None)
+    
+    def _summary_rows(self) -> list:
+        """Extra rows for the completion summary panel."""
+        rows = []
+        if self.kwargs.get('dedup', True):
+            rows.append(("♻  Reused", f"{self.frames_reused:,} duplicate frames"))
+        # Segment-parallel runs have no backend here, only the workers' totals
+        source = self.backend if self.backend is not None else self
+        tiles_total = getattr(source, 'tiles_total', 0)
+        if tiles_total:
+            tiles_reused = source.tiles_reused
+            rows.append(("🧩 Tiles", f"{tiles_reused:,}/{tiles_total:,} reused ({tiles_reused / tiles_total:.0%})"))
+        int8_row = int8_summary_row(self.backend)
+        if int8_row:
+            rows.append(int8_row)
+        fallback_row = fallback_summary_row(getattr(source, 'fallbacks', []))
+        if fallback_row:
+            rows.append(fallback_row)
+        return rows
     
     def _extract_and_stream(self, input_path: str, y4m_writer: Y4MWriter, video_info: Dict[str, Any]) -> None:
         """Extract and stream frames to stdout."""
@@ -390,25 +713,70 @@ class VideoProcessor:
         
         logger.info("Encoding final video...")
         
-        # Build ffmpeg command
-        ffmpeg_cmd = [
-            get_ffmpeg_path(),
-            '-i', temp_y4m,  # Upscaled video
+        ffmpeg_cmd = self._build_encode_cmd(temp_y4m, original_input, output_path)
+        
+        try:
+            result = subprocess.run(ffmpeg_cmd, check=True, capture_output=True, text=True)
+            logger.info(f"Video encoding completed: {output_path}")
+            
+            # Final progress update
+            if self.kwargs.get('progress') == 'json':
+                print(f'{{"status": "completed", "progress": 1.0, "message": "Video processing completed"}}')
+                
+        except subprocess.CalledProcessError as e:
+            logger.error(f"Video encoding failed: {e.stderr}")
+            raise RuntimeError(f"Video encoding failed: {e}")
+    
+    def _build_decode_cmd(self, input_path: str, destination: str,
+                          start_time: Optional[float] = None,
+                          frame_count: Optional[int] = None) -> list:
+        """Build the ffmpeg command that decodes input_path to Y4M at destination ('-' for a pipe).
+        
+        start_time (seconds from the start of the file) and frame_count restrict
+        the decode to one segment of the input.
+        """
+        ffmpeg_cmd = [get_ffmpeg_path()]
+        
+        if start_time:
+            ffmpeg_cmd.extend(['-ss', f"{start_time:.6f}"])
+        
+        ffmpeg_cmd.extend(['-i', input_path])
+        
+        if start_time:
+            # Keep decoded frames as-is; CFR output would pad the gap before the
+            # first frame after the seek with duplicates
+            ffmpeg_cmd.extend(['-fps_mode', 'passthrough'])
+        
+        if frame_count is not None:
+            ffmpeg_cmd.extend(['-frames:v', str(frame_count)])
+        
+        ffmpeg_cmd.extend([
+            '-f', 'yuv4mpegpipe',
+            '-pix_fmt', 'yuv420p',
+            '-y', destination
+        ])
+        
+        return ffmpeg_cmd
+    
+    def _build_encode_cmd(self, video_source: str, original_input: str, output_path: str) -> list:
+        """Build the ffmpeg command that encodes Y4M from video_source ('-' for a pipe) with audio."""
+        ffmpeg_cmd = [get_ffmpeg_path()]
+        
+        if video_source == '-':
+            ffmpeg_cmd.extend(['-f', 'yuv4mpegpipe'])
+        
+        ffmpeg_cmd.extend([
+            '-i', video_source,  # Upscaled video
             '-i', original_input,  # Original for audio
             '-map', '0:v',  # Video from first input
-        ]
+        ])
         
         # Add audio mapping if copy_audio is enabled
         if self.kwargs.get('copy_audio', True):
             ffmpeg_cmd.extend(['-map', '1:a?'])  # Audio from second input (optional)
         
         # Video encoding settings
-        ffmpeg_cmd.extend([
-            '-c:v', 'libx264',
-            '-crf', '18',
-            '-preset', 'medium',
-            '-pix_fmt', 'yuv420p'
-        ])
+        ffmpeg_cmd.extend(self._video_codec_args())
         
         # Audio settings
         if self.kwargs.get('copy_audio', True):
@@ -417,17 +785,32 @@ class VideoProcessor:
         # Output
         ffmpeg_cmd.extend(['-y', output_path])
         
-        try:
-            result = subprocess.run(ffmpeg_cmd, check=True, capture_output=True, text=True)
-            logger.info(f"Video encoding completed: {output_path}")
-            
-            # Final progress update
-            if self.kwargs.get('progress') == 'json':
-                print(f'{{"status": "completed", "progress": 1.0, "message": "Video processing completed"}}')
-                
-        except subprocess.CalledProcessError as e:
-            logger.error(f"Video encoding failed: {e.stderr}")
-            raise RuntimeError(f"Video encoding failed: {e}")
+        return ffmpeg_cmd
+    
+    def _build_segment_encode_cmd(self, segment_path: str) -> list:
+        """Build the ffmpeg command that encodes piped Y4M into a video-only segment."""
+        return [
+            get_ffmpeg_path(),
+            '-f', 'yuv4mpegpipe',
+            '-i', '-',
+            '-an',
+        ] + self._video_codec_args() + ['-y', segment_path]
+    
+    @staticmethod
+    def _video_codec_args() -> list:
+        """Video encoder settings shared by full-file and segment encodes."""
+        return [
+            '-c:v', 'libx264',
+            '-crf', '18',
+            '-preset', 'medium',
+            '-pix_fmt', 'yuv420p'
+        ]
+    
+    @staticmethod
+    def _read_log(log_file) -> str:
+        """Read back an ffmpeg stderr capture file."""
+        log_file.seek(0)
+        return log_file.read().decode('utf-8', errors='replace').strip()
     
     def _yuv420p_to_rgb(self, yuv_data: bytes, width: int, height: int) -> np.ndarray:
         """Convert YUV420P frame data to RGB numpy array."""
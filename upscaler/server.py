@@ -0,0 +1,354 @@
+"""
+Local upscaling service that keeps backends warm between requests.
+
+``upscale serve`` runs one worker thread over a job queue. Backends come
+from a BackendSession, so a model is loaded once and reused by every job
+with the same configuration; processors are used without their console
+output and report progress into the job record instead.
+
+HTTP API (TCP, or HTTP over a Unix socket with --socket):
+
+    GET  /health                 service status
+    GET  /jobs                   all jobs
+    POST /jobs                   JSON {"type": "image"|"video", "input": path,
+                                 "output": path, "options": {...}}
+    POST /jobs/image             raw image bytes; options in the query string,
+                                 ?output=path writes the result to a file
+    GET  /jobs/<id>[?wait=sec]   job status; wait blocks until it finishes
+    GET  /jobs/<id>/result       upscaled PNG of an image uploaded as bytes
+
+Paths are read and written by the service process, so it only listens on
+localhost (or a Unix socket) by default.
+"""
+
+import json
+import logging
+import os
+import queue
+import socketserver
+import threading
+import time
+import uuid
+from collections import OrderedDict
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from typing import Any, Dict, Optional
+from urllib.parse import parse_qsl, urlsplit
+
+from .backends.session import BackendSession
+
+
+logger = logging.getLogger(__name__)
+
+JOB_TYPES = ('image', 'video')
+
+# Finished jobs (and their result bytes) kept for clients to collect
+MAX_FINISHED_JOBS = 200
+
+# Largest image upload accepted by POST /jobs/image
+MAX_UPLOAD_BYTES = 256 * 1024 * 1024
+
+# Longest ?wait= a client may block on a job
+MAX_WAIT_SECONDS = 300
+
+# Warm backends kept at once; options naming another configuration free
+# the least recently used one, so varied client options cannot grow memory
+DEFAULT_MAX_BACKENDS = 4
+
+
+class UpscaleService:
+    """Job queue processed in order by one worker thread with warm backends."""
+
+    def __init__(self, defaults: Dict[str, Any], max_backends: int = DEFAULT_MAX_BACKENDS):
+        self.defaults = defaults
+        self.session = BackendSession(max_backends=max_backends)
+        self._jobs = OrderedDict()
+        self._results = {}
+        self._finished_events = {}
+        self._lock = threading.Lock()
+        self._queue = queue.Queue()
+        self._thread = threading.Thread(target=self._run, name='upscaler-jobs', daemon=True)
+        self.started = time.time()
+
+    def start(self) -> None:
+        self._thread.start()
+
+    def stop(self) -> None:
+        """Finish the running job, drop the queued ones and free the backends."""
+        try:
+            while True:
+                self._queue.get_nowait()
+        except queue.Empty:
+            pass
+        self._queue.put(None)
+        self._thread.join()
+        self.session.close()
+
+    def warm(self, **options) -> None:
+        """Load the backend for these options now instead of on the first job."""
+        backend = self.session.acquire(**self._job_options(options))
+        logger.info(f"Warm backend: {backend.__class__.__name__} ({options.get('model') or self.defaults.get('model')})")
+
+    def submit(self, job_type: str, input_path: Optional[str] = None, output_path: Optional[str] = None,
+               data: Optional[bytes] = None, options: Optional[Dict[str, Any]] = None) -> Dict[str, Any]:
+        """Queue a job and return its record."""
+        if job_type not in JOB_TYPES:
+            raise ValueError(f"Unknown job type: {job_type}")
+        if data is None and not input_path:
+            raise ValueError("A job needs an input path or image data")
+        if job_type == 'video' and not output_path:
+            raise ValueError("Video jobs need an output path")
+        if input_path and not os.path.isfile(input_path):
+            raise ValueError(f"Input file not found: {input_path}")
+
+        job = {
+            'id': uuid.uuid4().hex,
+            'type': job_type,
+            'status': 'queued',
+            'input': input_path,
+            'output': output_path,
+            'options': options or {},
+            'progress': 0.0,
+            'frames': 0,
+            'total_frames': 0,
+            'error': None,
+            'created': time.time(),
+            'started': None,
+            'finished': None,
+        }
+        with self._lock:
+            self._jobs[job['id']] = job
+            self._finished_events[job['id']] = threading.Event()
+        self._queue.put((job['id'], data))
+        return dict(job)
+
+    def get(self, job_id: str, wait: float = 0) -> Optional[Dict[str, Any]]:
+        """Job record, optionally waiting up to `wait` seconds for it to finish."""
+        with self._lock:
+            finished = self._finished_events.get(job_id)
+        if finished is None:
+            return None
+        if wait > 0:
+            finished.wait(min(wait, MAX_WAIT_SECONDS))
+        with self._lock:
+            job = self._jobs.get(job_id)
+            return dict(job) if job is not None else None
+
+    def jobs(self) -> list:
+        with self._lock:
+            return [dict(job) for job in self._jobs.values()]
+
+    def result(self, job_id: str) -> Optional[bytes]:
+        """PNG bytes of a finished job whose image was uploaded as bytes."""
+        with self._lock:
+            return self._results.get(job_id)
+
+    def status(self) -> Dict[str, Any]:
+        with self._lock:
+            counts = {}
+            for job in self._jobs.values():
+                counts[job['status']] = counts.get(job['status'], 0) + 1
+        return {
+            'status': 'ok',
+            'uptime': round(time.time() - self.started, 1),
+            'warm_backends': len(self.session),
+            'max_backends': self.session.max_backends,
+            'jobs': counts,
+        }
+
+    def _job_options(self, options: Dict[str, Any]) -> Dict[str, Any]:
+        merged = dict(self.defaults)
+        merged.update({key: value for key, value in options.items() if value is not None})
+        merged.pop('session', None)
+        merged['progress'] = 'none'
+        return merged
+
+    def _update(self, job_id: str, **fields) -> None:
+        with self._lock:
+            self._jobs[job_id].update(fields)
+
+    def _run(self) -> None:
+        while True:
+            item = self._queue.get()
+            if item is None:
+                break
+
+            job_id, data = item
+            with self._lock:
+                job = dict(self._jobs[job_id])
+            self._update(job_id, status='running', started=time.time())
+
+            try:
+                if job['type'] == 'image':
+                    result = self._run_image(job, data)
+                    if result is not None:
+                        with self._lock:
+                            self._results[job_id] = result
+                else:
+                    self._run_video(job)
+                self._update(job_id, status='done', progress=1.0, finished=time.time())
+            except Exception as e:
+                logger.exception(f"Job {job_id} failed")
+                self._update(job_id, status='failed', error=f"{type(e).__name__}: {e}", finished=time.time())
+
+            with self._lock:
+                self._finished_events[job_id].set()
+                self._prune()
+
+    def _run_image(self, job: Dict[str, Any], data: Optional[bytes]) -> Optional[bytes]:
+        """Upscale one image; returns PNG bytes when no output path was given."""
+        import cv2
+        import numpy as np
+        from .processors import ImageProcessor
+
+        options = self._job_options(job['options'])
+        processor = ImageProcessor(**options)
+        processor.backend = self.session.acquire(**options)
+
+        if data is not None:
+            image_bgr = cv2.imdecode(np.frombuffer(data, dtype=np.uint8), cv2.IMREAD_COLOR)
+        else:
+            image_bgr = cv2.imread(job['input'], cv2.IMREAD_COLOR)
+        if image_bgr is None:
+            raise ValueError("Could not decode image")
+
+        upscaled_rgb = processor.enhance(cv2.cvtColor(image_bgr, cv2.COLOR_BGR2RGB))
+        if job['output']:
+            processor.save_image(job['output'], upscaled_rgb)
+            return None
+
+        ok, encoded = cv2.imencode('.png', cv2.cvtColor(upscaled_rgb, cv2.COLOR_RGB2BGR),
+                                   [cv2.IMWRITE_PNG_COMPRESSION, 1])
+        if not ok:
+            raise RuntimeError("Failed to encode the result as PNG")
+        return encoded.tobytes()
+
+    def _run_video(self, job: Dict[str, Any]) -> None:
+        from .processors import VideoProcessor
+
+        def on_progress(frames: int, total: int) -> None:
+            self._update(job['id'], frames=frames, total_frames=total,
+                         progress=round(frames / total, 4) if total else 0.0)
+
+        processor = VideoProcessor(session=self.session, progress_callback=on_progress,
+                                   **self._job_options(job['options']))
+        processor.upscale_file(job['input'], job['output'])
+
+    def _prune(self) -> None:
+        """Forget the oldest finished jobs beyond MAX_FINISHED_JOBS (lock held)."""
+        finished = [job_id for job_id, job in self._jobs.items() if job['status'] in ('done', 'failed')]
+        for job_id in finished[:max(0, len(finished) - MAX_FINISHED_JOBS)]:
+            del self._jobs[job_id]
+            self._results.pop(job_id, None)
+            self._finished_events.pop(job_id, None)
+
+
+def _parse_value(text: str) -> Any:
+    """Query string value as bool, int, float or str."""
+    lowered = text.lower()
+    if lowered in ('true', 'false'):
+        return lowered == 'true'
+    for convert in (int, float):
+        try:
+            return convert(text)
+        except ValueError:
+            pass
+    return text
+
+
+def make_handler(service: UpscaleService):
+    """HTTP request handler class bound to service."""
+
+    class Handler(BaseHTTPRequestHandler):
+        server_version = 'upscaler'
+
+        def do_GET(self):
+            url = urlsplit(self.path)
+            parts = [part for part in url.path.split('/') if part]
+            query = dict(parse_qsl(url.query))
+
+            if parts == ['health']:
+                return self._send_json(200, service.status())
+            if parts == ['jobs']:
+                return self._send_json(200, {'jobs': service.jobs()})
+            if len(parts) == 2 and parts[0] == 'jobs':
+                try:
+                    wait = float(query.get('wait', 0))
+                except ValueError:
+                    return self._send_json(400, {'error': 'wait must be a number of seconds'})
+                job = service.get(parts[1], wait=wait)
+                if job is None:
+                    return self._send_json(404, {'error': 'job not found'})
+                return self._send_json(200, job)
+            if len(parts) == 3 and parts[0] == 'jobs' and parts[2] == 'result':
+                job = service.get(parts[1])
+                if job is None:
+                    return self._send_json(404, {'error': 'job not found'})
+                if job['status'] != 'done':
+                    return self._send_json(409, {'error': f"job is {job['status']}"})
+                data = service.result(parts[1])
+                if data is None:
+                    return self._send_json(404, {'error': f"result was written to {job['output']}"})
+                return self._send(200, 'image/png', data)
+            return self._send_json(404, {'error': 'not found'})
+
+        def do_POST(self):
+            url = urlsplit(self.path)
+            parts = [part for part in url.path.split('/') if part]
+            length = int(self.headers.get('Content-Length') or 0)
+            if length > MAX_UPLOAD_BYTES:
+                return self._send_json(413, {'error': 'upload too large'})
+            body = self.rfile.read(length) if length else b''
+
+            try:
+                if parts == ['jobs']:
+                    request = json.loads(body or b'{}')
+                    job = service.submit(request.get('type', 'image'), request.get('input'),
+                                         request.get('output'), options=request.get('options'))
+                elif parts == ['jobs', 'image']:
+                    if not body:
+                        return self._send_json(400, {'error': 'empty image upload'})
+                    options = {key: _parse_value(value) for key, value in parse_qsl(url.query)}
+                    output_path = options.pop('output', None)
+                    job = service.submit('image', output_path=output_path, data=body, options=options)
+                else:
+                    return self._send_json(404, {'error': 'not found'})
+            except (ValueError, json.JSONDecodeError) as e:
+                return self._send_json(400, {'error': str(e)})
+
+            return self._send_json(202, job)
+
+        def _send_json(self, status: int, payload: Dict[str, Any]) -> None:
+            self._send(status, 'application/json', json.dumps(payload).encode())
+
+        def _send(self, status: int, content_type: str, data: bytes) -> None:
+            self.send_response(status)
+            self.send_header('Content-Type', content_type)
+            self.send_header('Content-Length', str(len(data)))
+            self.end_headers()
+            self.wfile.write(data)
+
+        def address_string(self) -> str:
+            # Unix socket peers have no address
+            return self.client_address[0] if self.client_address else 'unix'
+
+        def log_message(self, format, *args):
+            logger.info(f"{self.address_string()} {format % args}")
+
+    return Handler
+
+
+class UnixHTTPServer(socketserver.ThreadingMixIn, socketserver.UnixStreamServer):
+    """HTTP over a Unix socket, one thread per connection."""
+
+    daemon_threads = True
+
+
+def create_server(service: UpscaleService, host: str = '127.0.0.1', port: int = 8765,
+                  socket_path: Optional[str] = None):
+    """HTTP server for service on host:port, or on socket_path if given."""
+    handler = make_handler(service)
+    if socket_path:
+        if os.path.exists(socket_path):
+            os.unlink(socket_path)
+        return UnixHTTPServer(socket_path, handler)
+    return ThreadingHTTPServer((host, port), handler)
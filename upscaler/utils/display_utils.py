@@ -512,6 +512,9 @@ def display_processing_complete(input_path: str, output_path: str, mode: str,
         ("⚙  Backend", kwargs.get('backend_used', 'Unknown')),  # Removed modifier, added space
     ]
     
+    # Processor-specific statistics (e.g. reused duplicate frames)
+    summary_data.extend(kwargs.get('extra_summary') or [])
+    
     results_panel = create_two_column_panel(
         comparison_data, summary_data,
         "File Comparison", "Processing Summary"
@@ -540,6 +543,27 @@ def display_processing_complete(input_path: str, output_path: str, mode: str,
     console.print(success_text)
     console.print("")
 
+def fallback_summary_row(fallbacks: List[str]) -> Optional[tuple]:
+    """Summary row listing backend failure recoveries, grouped by kind; None if there were none."""
+    if not fallbacks:
+        return None
+    
+    counts = {}
+    for description in fallbacks:
+        counts[description] = counts.get(description, 0) + 1
+    parts = [f"{description} ×{count}" if count > 1 else description
+             for description, count in counts.items()]
+    return ("⚠  Fallbacks", "; ".join(parts))
+
+
+def int8_summary_row(backend) -> Optional[tuple]:
+    """Summary row with the INT8 model's accuracy and speedup; None without --int8."""
+    report = getattr(backend, 'int8_report', None)
+    if not report:
+        return None
+    return ("🔢 INT8", f"PSNR {report['psnr_db']} dB vs fp32, {report['speedup']}x faster")
+
+
 def display_backend_info(backend_name: str, backend_info: Dict[str, Any]):
     """Display backend information."""
     backend_data = [
@@ -0,0 +1,178 @@
+"""
+Threaded frame pipeline for overlapping I/O, color conversion and inference.
+"""
+
+import logging
+import queue
+import threading
+from typing import Any, Callable, List, Optional
+
+
+logger = logging.getLogger(__name__)
+
+# Marks the end of the frame stream between stages
+_END = object()
+
+
+class FramePipeline:
+    """Run read -> convert -> infer -> encode -> write as a pipeline of threads.
+
+    Reading, input conversion and output conversion/writing each run on their
+    own thread and are connected by bounded queues, so at most ``queue_depth``
+    frames wait between any two stages. Inference runs on the calling thread,
+    which keeps the model and any progress display on the thread that owns them.
+
+    ``infer_fn`` receives a list of up to ``batch_size`` converted frames and
+    must return one result per frame, in order.
+    """
+
+    def __init__(self, read_fn: Callable[[], Optional[Any]],
+                 convert_fn: Callable[[Any], Any],
+                 infer_fn: Callable[[List[Any]], List[Any]],
+                 encode_fn: Callable[[Any], Any],
+                 write_fn: Callable[[Any], None],
+                 queue_depth: int = 4,
+                 batch_size: int = 1):
+        self.read_fn = read_fn
+        self.convert_fn = convert_fn
+        self.infer_fn = infer_fn
+        self.encode_fn = encode_fn
+        self.write_fn = write_fn
+        self.batch_size = max(1, batch_size)
+        # The inference queue must be able to hold a full batch
+        self.queue_depth = max(1, queue_depth, self.batch_size)
+
+        self._stop = threading.Event()
+        self._error = None
+
+    def run(self, on_frame: Optional[Callable[[int], None]] = None) -> int:
+        """Process the whole stream and return the number of frames written.
+
+        Args:
+            on_frame: Called on the calling thread with the running frame count
+                after each frame leaves the inference stage
+        """
+        read_queue = queue.Queue(maxsize=self.queue_depth)
+        infer_queue = queue.Queue(maxsize=self.queue_depth)
+        write_queue = queue.Queue(maxsize=self.queue_depth)
+        written = [0]
+
+        threads = [
+            threading.Thread(target=self._reader, args=(read_queue,),
+                             name='upscaler-reader', daemon=True),
+            threading.Thread(target=self._converter, args=(read_queue, infer_queue),
+                             name='upscaler-converter', daemon=True),
+            threading.Thread(target=self._writer, args=(write_queue, written),
+                             name='upscaler-writer', daemon=True),
+        ]
+        for thread in threads:
+            thread.start()
+
+        frame_count = 0
+        try:
+            finished = False
+            while not finished:
+                item = self._get(infer_queue)
+                if item is _END:
+                    break
+
+                # Fill the batch with whatever is already converted, without waiting
+                batch = [item]
+                while len(batch) < self.batch_size:
+                    try:
+                        item = infer_queue.get_nowait()
+                    except queue.Empty:
+                        break
+                    if item is _END:
+                        finished = True
+                        break
+                    batch.append(item)
+
+                for result in self.infer_fn(batch):
+                    self._put(write_queue, result)
+                    frame_count += 1
+
+                    if on_frame is not None:
+                        on_frame(frame_count)
+
+            self._put(write_queue, _END)
+        except _Stopped:
+            # Another stage failed; its error is re-raised below
+            pass
+        except BaseException as e:
+            self._fail(e)
+            raise
+        finally:
+            # Let the writer drain, then make sure no stage is left blocked
+            threads[2].join(timeout=5.0 if self._stop.is_set() else None)
+            self._stop.set()
+            for thread in threads[:2]:
+                thread.join(timeout=1.0)
+
+        if self._error is not None:
+            raise self._error
+
+        return written[0]
+
+    def _reader(self, out_queue: queue.Queue) -> None:
+        try:
+            while not self._stop.is_set():
+                item = self.read_fn()
+                if item is None:
+                    break
+                self._put(out_queue, item)
+            self._put(out_queue, _END)
+        except BaseException as e:
+            self._fail(e)
+
+    def _converter(self, in_queue: queue.Queue, out_queue: queue.Queue) -> None:
+        try:
+            while True:
+                item = self._get(in_queue)
+                if item is _END:
+                    break
+                self._put(out_queue, self.convert_fn(item))
+            self._put(out_queue, _END)
+        except BaseException as e:
+            self._fail(e)
+
+    def _writer(self, in_queue: queue.Queue, written: list) -> None:
+        try:
+            while True:
+                item = self._get(in_queue)
+                if item is _END:
+                    break
+                self.write_fn(self.encode_fn(item))
+                written[0] += 1
+        except BaseException as e:
+            self._fail(e)
+
+    def _fail(self, error: BaseException) -> None:
+        """Record the first error and tell every stage to stop."""
+        if self._error is None and not isinstance(error, _Stopped):
+            self._error = error
+            logger.debug(f"Pipeline stage failed: {error!r}")
+        self._stop.set()
+
+    def _put(self, q: queue.Queue, item: Any) -> None:
+        while True:
+            if self._stop.is_set():
+                raise _Stopped()
+            try:
+                q.put(item, timeout=0.1)
+                return
+            except queue.Full:
+                continue
+
+    def _get(self, q: queue.Queue) -> Any:
+        while True:
+            if self._stop.is_set():
+                raise _Stopped()
+            try:
+                return q.get(timeout=0.1)
+            except queue.Empty:
+                continue
+
+
+class _Stopped(Exception):
+    """Raised inside a stage when another stage has failed."""
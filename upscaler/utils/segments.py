@@ -0,0 +1,236 @@
+"""
+Segment checkpoints for resumable video jobs.
+"""
+
+import json
+import logging
+import os
+import shutil
+import subprocess
+import tempfile
+from pathlib import Path
+from typing import Any, Callable, Dict, List, Optional
+
+from .video import Y4MWriter, get_ffmpeg_path
+
+
+logger = logging.getLogger(__name__)
+
+
+class SegmentManifest:
+    """JSON manifest of the encoded segments committed in a work directory.
+
+    The manifest records the job key (input fingerprint plus every option that
+    affects the output) and, per segment, its file name and frame range. A work
+    directory whose manifest has a different job key is wiped and started over.
+    """
+
+    FILENAME = 'manifest.json'
+    SCHEMA_VERSION = '1.0'
+
+    def __init__(self, work_dir: Path, job_key: str):
+        self.work_dir = Path(work_dir)
+        self.job_key = job_key
+        self.path = self.work_dir / self.FILENAME
+        self.data = self._load()
+
+    def _load(self) -> Dict[str, Any]:
+        self.work_dir.mkdir(parents=True, exist_ok=True)
+
+        if self.path.exists():
+            try:
+                with open(self.path, 'r') as f:
+                    data = json.load(f)
+                if data.get('job_key') == self.job_key:
+                    logger.info(f"Resuming job from {self.work_dir} "
+                                f"({len(data.get('segments', []))} segments done)")
+                    return data
+                logger.warning("Input or options changed since the last run, starting over")
+            except Exception as e:
+                logger.warning(f"Failed to load segment manifest, starting over: {e}")
+
+            # Stale or unreadable state: drop every segment of the previous job
+            for entry in self.work_dir.iterdir():
+                if entry.is_file():
+                    entry.unlink()
+
+        return {
+            'job_key': self.job_key,
+            'segments': [],
+            'total_frames': None,
+            'schema_version': self.SCHEMA_VERSION,
+        }
+
+    def _save(self) -> None:
+        """Write the manifest atomically so a crash never leaves it half-written."""
+        fd, temp_path = tempfile.mkstemp(dir=self.work_dir, prefix='.manifest_', suffix='.tmp')
+        with os.fdopen(fd, 'w') as f:
+            json.dump(self.data, f, indent=2)
+            f.flush()
+            os.fsync(f.fileno())
+        os.replace(temp_path, self.path)
+
+    @property
+    def segments(self) -> List[Dict[str, Any]]:
+        return self.data['segments']
+
+    @property
+    def is_complete(self) -> bool:
+        """True once every frame of the input is covered by committed segments."""
+        total = self.data.get('total_frames')
+        return total is not None and self.completed_frames() >= total
+
+    def completed_frames(self) -> int:
+        """Number of leading frames covered by committed segments."""
+        end = 0
+        for segment in sorted(self.segments, key=lambda s: s['start_frame']):
+            if segment['start_frame'] != end:
+                break
+            end = segment['end_frame']
+        return end
+
+    def add_segment(self, filename: str, start_frame: int, end_frame: int) -> None:
+        """Record a finished segment covering frames [start_frame, end_frame)."""
+        self.segments.append({
+            'file': filename,
+            'start_frame': start_frame,
+            'end_frame': end_frame,
+        })
+        self._save()
+
+    def mark_complete(self, total_frames: int) -> None:
+        self.data['total_frames'] = total_frames
+        self._save()
+
+    def segment_paths(self) -> List[Path]:
+        """Committed segment files in frame order."""
+        ordered = sorted(self.segments, key=lambda s: s['start_frame'])
+        return [self.work_dir / segment['file'] for segment in ordered]
+
+
+class SegmentedY4MWriter:
+    """Y4MWriter stand-in that encodes frames into fixed-length segment files.
+
+    Each segment is piped to its own encoder ffmpeg as Y4M. When the segment is
+    full the encoder is closed, the file is renamed into place and the segment
+    is committed to the manifest, so at most one segment of work can be lost.
+    """
+
+    def __init__(self, manifest: SegmentManifest, width: int, height: int, fps: float,
+                 segment_frames: int, start_frame: int,
+                 build_encode_cmd: Callable[[str], List[str]]):
+        self.manifest = manifest
+        self.width = width
+        self.height = height
+        self.fps = fps
+        self.segment_frames = max(1, segment_frames)
+        self.next_frame = start_frame
+        self.build_encode_cmd = build_encode_cmd
+
+        self._encoder = None
+        self._encoder_log = None
+        self._writer = None
+        self._segment_start = start_frame
+        self._part_path = None
+        self._final_name = None
+
+    def write_header(self) -> None:
+        """Headers are written per segment."""
+        pass
+
+    def write_frame(self, frame_data: bytes) -> None:
+        if self._encoder is None:
+            self._open_segment()
+
+        self._writer.write_frame(frame_data)
+        self.next_frame += 1
+
+        if self.next_frame - self._segment_start >= self.segment_frames:
+            self._commit_segment()
+
+    def close(self) -> None:
+        """Commit the final, possibly shorter, segment."""
+        if self._encoder is not None:
+            self._commit_segment()
+
+    def abort(self) -> None:
+        """Drop the segment in progress."""
+        if self._encoder is not None:
+            if self._encoder.poll() is None:
+                self._encoder.kill()
+            self._encoder.wait()
+            self._encoder_log.close()
+            self._encoder = None
+        if self._part_path is not None and self._part_path.exists():
+            self._part_path.unlink()
+
+    def _open_segment(self) -> None:
+        self._segment_start = self.next_frame
+        index = len(self.manifest.segments)
+        self._final_name = f"segment_{index:05d}_{self._segment_start:08d}.mp4"
+        self._part_path = self.manifest.work_dir / f"{self._final_name}.part.mp4"
+
+        self._encoder_log = tempfile.TemporaryFile()
+        self._encoder = subprocess.Popen(
+            self.build_encode_cmd(str(self._part_path)),
+            stdin=subprocess.PIPE, stdout=subprocess.DEVNULL, stderr=self._encoder_log
+        )
+        self._writer = Y4MWriter(self._encoder.stdin, self.width, self.height, self.fps)
+        self._writer.write_header()
+
+    def _commit_segment(self) -> None:
+        try:
+            self._encoder.stdin.close()
+        except BrokenPipeError:
+            pass
+        self._encoder.wait()
+
+        if self._encoder.returncode != 0:
+            self._encoder_log.seek(0)
+            log = self._encoder_log.read().decode('utf-8', errors='replace').strip()
+            self._encoder_log.close()
+            self._encoder = None
+            raise RuntimeError(f"Segment encoding failed: {log}")
+
+        self._encoder_log.close()
+        self._encoder = None
+
+        os.replace(self._part_path, self.manifest.work_dir / self._final_name)
+        self.manifest.add_segment(self._final_name, self._segment_start, self.next_frame)
+        logger.info(f"Committed segment {self._final_name} "
+                    f"(frames {self._segment_start}-{self.next_frame - 1})")
+
+
+def concat_segments(segment_paths: List[Path], output_path: str, work_dir: Path,
+                    audio_source: Optional[str] = None) -> None:
+    """Join encoded segments with ffmpeg's concat demuxer, optionally muxing audio once."""
+    list_path = Path(work_dir) / 'concat.txt'
+    with open(list_path, 'w', encoding='utf-8') as f:
+        for path in segment_paths:
+            escaped = str(Path(path).absolute()).replace("'", "'\\''")
+            f.write(f"file '{escaped}'\n")
+
+    ffmpeg_cmd = [
+        get_ffmpeg_path(),
+        '-f', 'concat',
+        '-safe', '0',
+        '-i', str(list_path),
+    ]
+
+    if audio_source:
+        ffmpeg_cmd.extend(['-i', audio_source, '-map', '0:v', '-map', '1:a?', '-c:a', 'copy'])
+
+    ffmpeg_cmd.extend(['-c:v', 'copy', '-y', output_path])
+
+    try:
+        subprocess.run(ffmpeg_cmd, check=True, capture_output=True, text=True)
+    except subprocess.CalledProcessError as e:
+        logger.error(f"Segment concatenation failed: {e.stderr}")
+        raise RuntimeError(f"Segment concatenation failed: {e}")
+    finally:
+        list_path.unlink()
+
+
+def remove_work_dir(work_dir: Path) -> None:
+    """Delete a finished job's work directory."""
+    shutil.rmtree(work_dir, ignore_errors=True)
@@ -2,7 +2,7 @@ import subprocess
 import json
 import logging
 from pathlib import Path
-from typing import Dict, Any, Optional, Union
+from typing import Dict, Any, List, Optional, Union
 import shutil
 
 
@@ -60,6 +60,32 @@ def get_video_info(video_path: Union[str, Path]) -> Dict[str, Any]:
         raise RuntimeError(f"Failed to parse video info: {e}")
 
 
+def get_keyframe_times(video_path: Union[str, Path]) -> List[float]:
+    """Get the presentation times (seconds) of the video keyframes using ffprobe."""
+    
+    cmd = [
+        get_ffprobe_path(),
+        '-v', 'error',
+        '-select_streams', 'v:0',
+        '-skip_frame', 'nokey',
+        '-show_entries', 'frame=pts_time',
+        '-of', 'csv=p=0',
+        str(video_path)
+    ]
+    
+    try:
+        result = subprocess.run(cmd, capture_output=True, text=True, check=True)
+    except subprocess.CalledProcessError as e:
+        raise RuntimeError(f"Failed to probe keyframes: {e.stderr}")
+    
+    times = []
+    for line in result.stdout.splitlines():
+        value = line.strip().rstrip(',')
+        if value and value != 'N/A':
+            times.append(float(value))
+    return sorted(times)
+
+
 def validate_input(input_path: Union[str, Path]) -> bool:
     """Validate input file or stream."""
     